@@ -4,7 +4,29 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
 import base64
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from distributions import dist_registry
+from distributions.cache import DistributionCache, normalize_params
+from distributions.comparison import DIVERGENCES, member_label
+from distributions.grid import lattice_bins
+from distributions.datasets import FILE_TYPES, ColumnSource, SampleSource, file_columns
+from distributions.fitting import CRITERIA as FIT_CRITERIA, fit_dataset, rank_fits
+from distributions.goodness import MODES as GOF_MODES, results_table as gof_table, run_tests
+from distributions.montecarlo import STATISTICS as MC_STATISTICS, run_monte_carlo, theoretical_sampling_distribution
+from distributions.tables import LatticeTables
+from distributions.streaming import summarize_samples
+from distributions.sketches import KLLSketch, ecdf_points, ks_distance, qq_points
+from distributions.histogram import BIN_RULES
+from distributions.timing import WINDOW as TIMING_WINDOW, stage, timer
+from config import CACHE_CONFIG, TABLES_CONFIG, TIMING_CONFIG
+from ui import SectionGraph, get_params, snap_to_slider
+from export import EXPORT_FORMATS, curve_table, export_table, samples_table
+from export.images import IMAGE_FORMATS, ImageRenderer
+from ui.figures import (COMPARISON_COLORS, build_distribution_figure, build_ecdf_figure, build_fit_figure,
+                        build_qq_figure, comparison_trace, figure_size_bytes, line_trace, quantile_trace)
 
 # Page configuration
 st.set_page_config(
@@ -14,6 +36,15 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Stage timing for the developer panel; the checkbox lives at the bottom of the sidebar
+rerun_start = time.perf_counter()
+timer.enable(st.session_state.get("perf_panel", timer.default_enabled))
+timer.begin_run()
+
+# Sections recompute only when their declared inputs change; fragments rerun on their own
+sections = SectionGraph.attach(st.session_state)
+sections.begin_run()
+
 # Custom CSS for better styling
 st.markdown("""
 <style>
@@ -39,16 +70,421 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Shared across sessions so reruns from every analyst hit the same cache
+@st.cache_resource
+def get_distribution_cache():
+    tables = None
+    if os.path.isdir(TABLES_CONFIG["directory"]):
+        tables = LatticeTables(TABLES_CONFIG["directory"])
+    return DistributionCache(dist_registry, max_bytes=CACHE_CONFIG["max_bytes"], tables=tables)
+
+dist_cache = get_distribution_cache()
+
+# Warm worker processes reused by every simulation
+@st.cache_resource
+def get_process_pool():
+    return ProcessPoolExecutor()
+
+# One warm renderer per server; identical figures are rendered once
+@st.cache_resource
+def get_image_renderer():
+    return ImageRenderer()
+
+# The fitting workers read the data from disk, so each upload is written out once
+def save_upload(uploaded):
+    extension = os.path.splitext(uploaded.name)[1].lower()
+    path = os.path.join(tempfile.gettempdir(), f"distviz_upload_{uploaded.file_id}{extension}")
+    if not os.path.exists(path):
+        with open(path, "wb") as fh:
+            fh.write(uploaded.getbuffer())
+    return path
+
+# Button callback: runs before the rerun, so the selectbox and sliders are created with the fitted values
+def load_fit(fit):
+    fit_obj = dist_registry[fit["dist_name"]]
+    st.session_state["dist_name"] = fit["dist_name"]
+    clipped = []
+    for name, spec in fit_obj.param_specs.items():
+        value, was_clipped = snap_to_slider(spec, fit["params"][name])
+        st.session_state[f"main_{fit['dist_name']}_{name}"] = value
+        if was_clipped:
+            clipped.append(f"{spec['label']} = {fit['params'][name]:g}")
+    st.session_state["fit_clipped"] = clipped
+
+
+def show_gof_report(report):
+    st.dataframe(pd.DataFrame(gof_table(report)), hide_index=True, use_container_width=True)
+    st.caption(f"{report['n']:,} values tested in {report['seconds']:.2f} s ({report['mode']} mode). "
+               "p-values assume the parameters were not estimated from the same data.")
+
+# Unseeded samples get a seed too, kept until New Samples, so the display, the tests and the export share one draw
+def samples_seed(use_seed, sample_seed):
+    if use_seed:
+        return int(sample_seed)
+    if "sample_entropy" not in st.session_state:
+        st.session_state["sample_entropy"] = np.random.SeedSequence().entropy
+    return st.session_state["sample_entropy"]
+
+# Sample histogram, statistics and sketch summaries; kept by the section graph until an input changes
+def draw_samples(dist_name, params, sample_size, bin_rule, seed, with_sketch, curve):
+    dist_obj = dist_registry[dist_name]
+    x, y_pdf, y_cdf, dist_type = curve
+    sample_rng = np.random.default_rng(seed)
+    # A few thousand values stand in for all the samples in the ECDF, QQ plot and KS distance
+    sample_sketch = KLLSketch(seed=seed) if with_sketch else None
+    # Drawn in chunks and binned here; only the bin counts go to the browser
+    sample_stats, sample_hist = summarize_samples(dist_obj, params, sample_size, bins=30,
+                                                  rule=bin_rule, rng=sample_rng, sketch=sample_sketch)
+    
+    # Create sample histogram
+    fig_samples = go.Figure()
+    fig_samples.add_trace(go.Bar(x=sample_hist.centers, y=sample_hist.counts, width=sample_hist.bin_width,
+                                 name="Sample Histogram", marker_color='#1f77b4', opacity=0.7))
+    
+    # Add theoretical PDF/PMF overlay
+    if dist_type == "PMF":
+        # y_pdf is the probability per integer; bins hold several integers past grid.DISCRETE_BUDGET
+        fig_samples.add_trace(go.Bar(x=x, y=y_pdf * sample_size * sample_hist.bin_width, name="Theoretical PMF",
+                                   marker_color='#ff7f0e', opacity=0.8))
+    else:
+        # Scale PDF to expected counts per bin
+        fig_samples.add_trace(line_trace(x, y_pdf * sample_size * sample_hist.bin_width, 
+                                         name="Theoretical PDF",
+                                         line=dict(color='#ff7f0e', width=2)))
+    
+    fig_samples.update_layout(
+        title=f"Sample Data vs Theoretical {dist_name} Distribution",
+        xaxis_title="Value",
+        yaxis_title="Frequency",
+        template="plotly_white",
+        height=400
+    )
+    
+    summary = {"stats": sample_stats, "figure": fig_samples, "outside": sample_hist.underflow + sample_hist.overflow}
+    if sample_sketch is not None:
+        ecdf_x, ecdf_y = ecdf_points(sample_sketch)
+        qq_theoretical, qq_sample = qq_points(sample_sketch, dist_cache, dist_name, params)
+        summary.update(
+            ecdf_figure=build_ecdf_figure(ecdf_x, ecdf_y, x, y_cdf, dist_name),
+            qq_figure=build_qq_figure(qq_theoretical, qq_sample, dist_name),
+            ks=ks_distance(sample_sketch, dist_obj, params),
+            retained=sample_sketch.retained,
+        )
+    return summary
+
+# Each fragment below reruns on its own when one of its widgets changes; sidebar changes rerun the page,
+# and the section graph hands back whatever the change didn't touch
+@st.fragment
+def divergence_section(comparison, labels):
+    st.subheader("📐 Divergences")
+    divergence = st.selectbox("Metric", DIVERGENCES,
+                              help="Row i, column j is the divergence of model i from model j, over the plotted range")
+    st.dataframe(pd.DataFrame(comparison["divergences"][divergence], index=labels,
+                              columns=labels), use_container_width=True)
+    st.caption("A discrete and a continuous model have no density in common: their KL divergence is ∞ "
+               "and their total variation and Hellinger distance are 1.")
+
+@st.fragment
+def sample_section(dist_name, params, curve, compared, sample_size, bin_rule, use_seed, sample_seed, show_ecdf,
+                   run_gof, gof_mode):
+    st.subheader("📊 Sample Data")
+    
+    # Unseeded samples are kept across reruns until an input changes or they are redrawn
+    if not use_seed and st.button("🎲 New Samples", help="Draw a fresh set of samples"):
+        st.session_state["sample_entropy"] = np.random.SeedSequence().entropy
+    seed = samples_seed(use_seed, sample_seed)
+    
+    try:
+        with stage("app.samples"):
+            summary = sections.run(
+                "samples",
+                {"dist_name": dist_name, "params": params, "sample_size": sample_size, "bin_rule": bin_rule,
+                 "seed": seed, "show_ecdf": show_ecdf},
+                lambda: draw_samples(dist_name, params, sample_size, bin_rule, seed, show_ecdf, curve),
+                after=("curve",)
+            )
+        
+        st.plotly_chart(summary["figure"], use_container_width=True)
+        
+        if summary["outside"]:
+            st.caption(f"{summary['outside']:,} samples fell outside the plotted range and are not shown in the histogram.")
+        
+        # Sample statistics, accumulated in the same pass as the histogram
+        sample_stats = summary["stats"]
+        col1, col2, col3, col4, col5, col6 = st.columns(6)
+        with col1:
+            st.metric("Sample Mean", f"{sample_stats.mean:.3f}")
+        with col2:
+            st.metric("Sample Std", f"{sample_stats.std:.3f}")
+        with col3:
+            st.metric("Sample Min", f"{sample_stats.min:.3f}")
+        with col4:
+            st.metric("Sample Max", f"{sample_stats.max:.3f}")
+        with col5:
+            st.metric("Sample Skewness", f"{sample_stats.skewness:.3f}")
+        with col6:
+            st.metric("Sample Kurtosis", f"{sample_stats.kurtosis:.3f}")
+        
+        if "ks" in summary:
+            col_ecdf, col_qq = st.columns(2)
+            with col_ecdf:
+                st.plotly_chart(summary["ecdf_figure"], use_container_width=True)
+            with col_qq:
+                st.plotly_chart(summary["qq_figure"], use_container_width=True)
+            ks = summary["ks"]
+            st.metric("KS Distance", f"{ks['statistic']:.4f} ± {ks['error_bound']:.4f}",
+                      help="Largest gap between the empirical and theoretical CDF, from a quantile sketch "
+                           f"of {summary['retained']:,} values; the exact distance lies within the ± bound "
+                           "(99% confidence for all points of the CDF at once, 0 while every sample is kept)")
+        
+        if run_gof:
+            st.subheader("🧪 Goodness of Fit")
+            gof_candidates = [(dist_name, params)] + compared
+            gof_key = (tuple((name, normalize_params(p)) for name, p in gof_candidates), sample_size, seed, gof_mode)
+            if st.button("▶️ Run Tests"):
+                progress_bar = st.progress(0.0, text="Testing...")
+                with stage("app.goodness"):
+                    gof_report = run_tests(
+                        SampleSource(dist_name, params, sample_size, seed=seed), gof_candidates, gof_mode,
+                        executor=get_process_pool(),
+                        progress=lambda done, total: progress_bar.progress(done / total, text=f"Testing... {done}/{total} jobs")
+                    )
+                st.session_state["goodness"] = (gof_key, gof_report)
+                progress_bar.empty()
+            
+            gof_result = st.session_state.get("goodness")
+            if gof_result is not None and gof_result[0] == gof_key:
+                show_gof_report(gof_result[1])
+                st.caption(f"Tested the {sample_size:,} samples shown above"
+                           + (f" (seed {seed})." if use_seed else "; New Samples draws a fresh set to test."))
+            else:
+                st.info(f"Press **Run Tests** to test {sample_size:,} draws from {dist_name} against it"
+                        + (" and the compared models." if compared else "."))
+            
+    except Exception as e:
+        st.error(f"Error generating samples: {str(e)}")
+
+@st.fragment
+def monte_carlo_section(dist_name, params, mc_statistic, mc_sample_size, mc_replicates, mc_seed):
+    dist_obj = dist_registry[dist_name]
+    st.subheader(f"🎲 Sampling Distribution of the {mc_statistic}")
+    
+    mc_key = (dist_name, normalize_params(params), mc_statistic, mc_sample_size, mc_replicates, int(mc_seed))
+    if st.button("▶️ Run Simulation"):
+        progress_bar = st.progress(0.0, text="Simulating...")
+        try:
+            with stage("app.monte_carlo"):
+                mc_values = run_monte_carlo(
+                    dist_name, params, mc_sample_size, mc_replicates, mc_statistic, seed=int(mc_seed),
+                    executor=get_process_pool(),
+                    progress=lambda done, total: progress_bar.progress(done / total, text=f"Simulating... {done}/{total} blocks")
+                )
+            st.session_state["monte_carlo"] = (mc_key, mc_values)
+        except ValueError as e:
+            st.error(f"Error running simulation: {str(e)}")
+        progress_bar.empty()
+    
+    mc_result = st.session_state.get("monte_carlo")
+    if mc_result is not None and mc_result[0] == mc_key:
+        mc_values = mc_result[1]
+        finite_values = mc_values[np.isfinite(mc_values)]
+        discrete_max = dist_obj.dist_type == "PMF" and mc_statistic == "Max"
+        # An integer-valued Max gets bins of whole integers, so each bar holds the same number of values
+        bins = lattice_bins(finite_values.min(), finite_values.max(), 50)[0] if discrete_max else 50
+        counts, edges = np.histogram(finite_values, bins=bins, density=True)
+        centers = 0.5 * (edges[:-1] + edges[1:])
+        
+        fig_mc = go.Figure()
+        fig_mc.add_trace(go.Bar(x=centers, y=counts, width=edges[1] - edges[0], name=f"Simulated {mc_statistic}",
+                                marker_color='#1f77b4', opacity=0.7))
+        
+        reference_x = centers if discrete_max else np.linspace(edges[0], edges[-1], 200)
+        reference_y = theoretical_sampling_distribution(dist_obj, params, mc_sample_size, mc_statistic, reference_x,
+                                                        bin_width=edges[1] - edges[0])
+        if reference_y is not None:
+            fig_mc.add_trace(go.Scatter(x=reference_x, y=reference_y, mode="lines", name="Theoretical",
+                                        line=dict(color='#ff7f0e', width=2)))
+        
+        fig_mc.update_layout(
+            title=f"{mc_statistic} of {mc_replicates:,} samples of size {mc_sample_size} from {dist_name}",
+            xaxis_title=mc_statistic,
+            yaxis_title="Density",
+            template="plotly_white",
+            height=400
+        )
+        st.plotly_chart(fig_mc, use_container_width=True)
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric(f"Mean of {mc_statistic}", f"{np.mean(finite_values):.4f}")
+        with col2:
+            st.metric(f"Std of {mc_statistic}", f"{np.std(finite_values):.4f}")
+        with col3:
+            st.metric("Replicates", f"{len(mc_values):,}")
+    else:
+        st.info("Adjust the settings in the sidebar and press **Run Simulation**.")
+
+@st.fragment
+def fitting_section(data_path, fit_column, fit_criterion):
+    st.subheader("📂 Fitted Distributions")
+    
+    if data_path is None:
+        st.info("Upload a CSV or NPY file in the sidebar to fit the distributions to it.")
+    else:
+        fit_key = (data_path, fit_column)
+        if st.button("▶️ Fit Distributions"):
+            progress_bar = st.progress(0.0, text="Fitting...")
+            try:
+                with stage("app.fitting"):
+                    fit_report = fit_dataset(
+                        ColumnSource(data_path, column=fit_column), executor=get_process_pool(),
+                        progress=lambda label, done, total: progress_bar.progress(done / total, text=f"{label}... {done}/{total} slices")
+                    )
+                st.session_state["fitting"] = (fit_key, fit_report)
+            except (OSError, ValueError) as e:
+                st.error(f"Error fitting distributions: {str(e)}")
+            progress_bar.empty()
+        
+        fit_result = st.session_state.get("fitting")
+        if fit_result is not None and fit_result[0] == fit_key:
+            fit_report = fit_result[1]
+            fits = rank_fits(fit_report["fits"], fit_criterion)
+            
+            col_a, col_b, col_c, col_d = st.columns(4)
+            with col_a:
+                st.metric("Rows", f"{fit_report['rows']:,}")
+            with col_b:
+                st.metric("Skipped", f"{fit_report['stats'].skipped:,}", help="Missing or non-numeric entries")
+            with col_c:
+                st.metric("Data Passes", fit_report["passes"])
+            with col_d:
+                st.metric("Time", f"{fit_report['seconds']:.2f} s")
+            
+            if fits:
+                st.dataframe(pd.DataFrame([
+                    {"Distribution": member_label(fit["dist_name"], fit["params"], dist_registry[fit["dist_name"]]),
+                     "Log-Likelihood": fit["log_likelihood"], "AIC": fit["aic"], "BIC": fit["bic"],
+                     "Method": fit["method"]}
+                    for fit in fits
+                ], index=pd.RangeIndex(1, len(fits) + 1, name="Rank")), use_container_width=True)
+                st.plotly_chart(build_fit_figure(fit_report["histogram"], fits, dist_registry, fit_report["rows"]),
+                                use_container_width=True)
+                
+                if st.button(f"📥 Load Best Fit ({fits[0]['dist_name']})", on_click=load_fit, args=(fits[0],),
+                             help="Show the best fit in the main plot; values are rounded to the slider steps"):
+                    # The click only reran this fragment; the selectbox and sliders need the whole page
+                    st.rerun(scope="app")
+                clipped = st.session_state.pop("fit_clipped", None)
+                if clipped:
+                    st.warning("Outside the slider range, so clipped: " + ", ".join(clipped))
+            
+                if st.button("🧪 Test Top Fits", help="Goodness-of-fit tests of the data against the three best fits"):
+                    progress_bar = st.progress(0.0, text="Testing...")
+                    try:
+                        with stage("app.goodness"):
+                            fit_gof = run_tests(
+                                ColumnSource(data_path, column=fit_column), [(fit["dist_name"], fit["params"]) for fit in fits[:3]],
+                                executor=get_process_pool(),
+                                progress=lambda done, total: progress_bar.progress(done / total, text=f"Testing... {done}/{total} jobs")
+                            )
+                        st.session_state["fit_goodness"] = (fit_key, fit_gof)
+                    except (OSError, ValueError) as e:
+                        st.error(f"Error testing fits: {str(e)}")
+                    progress_bar.empty()
+                fit_gof = st.session_state.get("fit_goodness")
+                if fit_gof is not None and fit_gof[0] == fit_key:
+                    show_gof_report(fit_gof[1])
+            
+            if fit_report["not_fitted"]:
+                st.caption("Not fitted: " + "; ".join(f"{name} ({reason})" for name, reason in fit_report["not_fitted"].items()))
+        else:
+            st.info("Choose a column and press **Fit Distributions**.")
+
+@st.fragment
+def export_section(dist_name, params, curve, show_samples, sample_size, use_seed, sample_seed):
+    st.subheader("🔧 Export Options")
+    
+    image_format = st.selectbox("Image Format", list(IMAGE_FORMATS), format_func=str.upper)
+    
+    if st.button(f"📊 Export Plot as {image_format.upper()}"):
+        try:
+            with stage("app.export"):
+                img_bytes = get_image_renderer().render(sections.value("plot"), image_format)
+            st.download_button(
+                label=f"Download {image_format.upper()}",
+                data=img_bytes,
+                file_name=f"{dist_name}_distribution.{image_format}",
+                mime=IMAGE_FORMATS[image_format]
+            )
+        except Exception as e:
+            st.error("Error exporting plot. Please install kaleido: `pip install kaleido`")
+    
+    export_format = st.selectbox("Data Format", list(EXPORT_FORMATS), help="CSV for spreadsheets; Parquet, Arrow or NPY for numeric tools")
+    export_sources = ["Distribution Curve"] + (["Samples"] if show_samples else [])
+    export_source = st.selectbox("Data to Export", export_sources)
+    
+    if st.button(f"📄 Export Data as {export_format}"):
+        try:
+            if export_source == "Samples":
+                # The displayed samples, seeded or not
+                table = samples_table(dist_registry[dist_name], params, sample_size,
+                                      seed=samples_seed(use_seed, sample_seed))
+                file_stub = f"{dist_name}_samples"
+            else:
+                table = curve_table(*curve[:3])
+                file_stub = f"{dist_name}_distribution_data"
+            
+            extension, mime = EXPORT_FORMATS[export_format]
+            # Written chunk by chunk to disk rather than built up as one string
+            with tempfile.TemporaryDirectory() as export_dir:
+                with stage("app.export"):
+                    export_path = export_table(table, export_format, os.path.join(export_dir, file_stub + extension))
+                with open(export_path, "rb") as fh:
+                    st.download_button(
+                        label=f"Download {export_format}",
+                        data=fh,
+                        file_name=file_stub + extension,
+                        mime=mime
+                    )
+        except Exception as e:
+            st.error(f"Error exporting data: {str(e)}")
+
+@st.fragment
+def quick_actions():
+    st.subheader("🎯 Quick Actions")
+    
+    if st.button("🔄 Reset to Defaults"):
+        st.rerun()
+    
+    if st.button("📚 Show Help"):
+        st.info("""
+        **How to use this app:**
+        1. Select a distribution from the sidebar
+        2. Adjust parameters using the sliders
+        3. Toggle CDF, quantiles, or samples for better visualization and interpretation
+        4. Use statistics and info sections to understand key properties
+        5. Enable comparison mode to overlay distributions
+        6. Export plots and data as needed
+        
+        **Interpretation Tips:**
+        - Look at mean/variance for central tendency and spread
+        - Skewness >0 means right-skewed (tail to right)
+        - Kurtosis >3 means heavier tails than normal
+        - Quantiles show data thresholds (e.g., 95% below 97.5% quantile)
+        - Check 'Parameter Effects' in info for how sliders change the distribution
+        """)
+
 # Main header
 st.markdown('<h1 class="main-header">📊 Distribution Visualizer</h1>', unsafe_allow_html=True)
 
 # Sidebar configuration
-with st.sidebar:
+with stage("app.widgets"), st.sidebar:
     st.header("🎛️ Configuration")
     
     dist_list = list(dist_registry.keys())
     
-    dist_name = st.selectbox("Choose a distribution:", dist_list, help="Select the statistical distribution to visualize")
+    dist_name = st.selectbox("Choose a distribution:", dist_list, key="dist_name",
+                             help="Select the statistical distribution to visualize")
     
     # Display options
     st.subheader("📈 Display Options")
@@ -58,14 +494,61 @@ with st.sidebar:
     show_quantiles = st.checkbox("Show Quantiles", value=False, help="Display common quantiles on the plot for better interpretation")
     
     if show_samples:
-        sample_size = st.slider("Sample Size", 10, 1000, 100, help="Number of random samples to generate")
+        sample_size = st.select_slider("Sample Size", options=[10, 100, 1000, 10_000, 100_000, 1_000_000, 10_000_000],
+                                       value=100, help="Number of random samples to generate")
+        bin_rule = st.selectbox("Histogram Bins", BIN_RULES, help="Fixed uses 30 bins; Freedman–Diaconis and Scott adapt the bin width to the sample")
+        use_seed = st.checkbox("Reproducible Samples", value=False, help="Draw samples from a fixed random seed")
+        sample_seed = st.number_input("Random Seed", min_value=0, value=42, step=1, disabled=not use_seed)
+        show_ecdf = st.checkbox("Empirical CDF & QQ Plot", value=False,
+                                help="Summarize the samples in a quantile sketch and compare them with the distribution")
+        run_gof = st.checkbox("Goodness-of-Fit Tests", value=False,
+                              help="KS, Anderson-Darling, Cramér-von Mises and chi-square tests of the samples against the distribution and any compared models")
+        gof_mode = st.selectbox("Test Mode", GOF_MODES, disabled=not run_gof,
+                                help="Chunked bins the data in memory (KS to within ±1e-6); Sorted Runs is exact and spills sorted runs to disk")
+    
+    # Monte Carlo simulation
+    st.subheader("🎲 Sampling Distributions")
+    enable_monte_carlo = st.checkbox("Simulate a Statistic", value=False, help="Draw many samples and plot the distribution of a statistic")
+    
+    if enable_monte_carlo:
+        mc_statistic = st.selectbox("Statistic:", list(MC_STATISTICS), help="Statistic computed on each simulated sample")
+        mc_sample_size = st.slider("Sample Size per Replicate (n)", 2, 1000, 30, help="Size of each simulated sample")
+        mc_replicates = st.select_slider("Replicates (R)", options=[1000, 10000, 100000], value=10000, help="Number of simulated samples")
+        mc_seed = st.number_input("Simulation Seed", min_value=0, value=42, step=1, help="Seed for reproducible simulations")
     
     # Comparison mode
     st.subheader("🔄 Comparison Mode")
     enable_comparison = st.checkbox("Compare Distributions", value=False, help="Compare multiple distributions")
     
+    compared = []
     if enable_comparison:
-        comparison_dist = st.selectbox("Compare with:", dist_list, index=1, help="Select a second distribution for comparison")
+        n_compared = st.number_input("Models to Compare", min_value=1, max_value=10, value=1, step=1,
+                                     help="Each model has its own distribution and parameters")
+        for i in range(int(n_compared)):
+            with st.expander(f"Model {i + 1}", expanded=True):
+                comp_name = st.selectbox("Distribution:", dist_list, index=(i + 1) % len(dist_list), key=f"comp_dist_{i}")
+                comp_obj = dist_registry[comp_name]
+                comp_params = get_params(st, comp_obj, key=f"comp_{i}_{comp_name}",
+                                         defaults=comp_obj.get_default_comp_params())
+                compared.append((comp_name, comp_params))
+    
+    # Fitting uploaded data
+    st.subheader("📂 Fit Data")
+    enable_fitting = st.checkbox("Fit a Dataset", value=False, help="Fit every distribution to a column of your data by maximum likelihood")
+    
+    data_path = fit_column = fit_criterion = None
+    if enable_fitting:
+        uploaded = st.file_uploader("Data File", type=[kind.lstrip(".") for kind in FILE_TYPES],
+                                    help="CSV with a header row, or a 1-D or 2-D NPY array")
+        if uploaded is not None:
+            try:
+                data_path = save_upload(uploaded)
+                data_columns = file_columns(data_path)
+                fit_column = st.selectbox("Column", data_columns) if data_columns else None
+            except (OSError, ValueError) as e:
+                st.error(f"❌ Could not read {uploaded.name}: {e}")
+                data_path = None
+            fit_criterion = st.selectbox("Rank Fits By", FIT_CRITERIA, help="AIC and BIC penalize extra parameters; lower is better")
 
 # Main content area
 col1, col2 = st.columns([2, 1])
@@ -77,128 +560,76 @@ with col1:
     dist_obj = dist_registry[dist_name]
     
     # Parameter input
-    params = dist_obj.get_params(st)
+    with stage("app.params"):
+        params = get_params(st, dist_obj, key=f"main_{dist_name}")
 
 # Generate main distribution data
-x, y_pdf, y_cdf, dist_type = dist_obj.generate_data(params)
+with stage("app.evaluate"):
+    curve = sections.run("curve", {"dist_name": dist_name, "params": params},
+                         lambda: dist_cache.generate_data(dist_name, params))
+x, y_pdf, y_cdf, dist_type = curve
 
 if x is not None:
-    # Create the main plot
-    fig = go.Figure()
+    # Every model, the selected one included, on one shared grid
+    comparison = None
+    if enable_comparison:
+        with stage("app.comparison"):
+            comparison = sections.run("comparison", {"members": [(dist_name, params)] + compared},
+                                      lambda: dist_cache.compare([(dist_name, params)] + compared))
+        comparison_labels = [f"{i}. {member['label']}" for i, member in enumerate(comparison["members"])]
     
-    # Add PDF/PMF trace
-    if dist_type == "PMF":
-        fig.add_trace(go.Bar(x=x, y=y_pdf, name=f"{dist_name} {dist_type}", 
-                            marker_color='#1f77b4', opacity=0.7))
-    else:
-        fig.add_trace(go.Scatter(x=x, y=y_pdf, mode="lines", name=f"{dist_name} {dist_type}", 
-                                line=dict(color='#1f77b4', width=3)))
-    
-    # Add CDF if requested
-    if show_cdf and y_cdf is not None:
-        fig.add_trace(go.Scatter(x=x, y=y_cdf, mode="lines", name=f"{dist_name} CDF", 
-                                line=dict(color='#ff7f0e', width=2, dash='dash')))
-    
-    # Add quantiles for better interpretation if requested
-    if show_quantiles:
-        q_dist = dist_obj.get_quantile_dist(params)
-        if q_dist:
+    def build_plot():
+        fig = build_distribution_figure(dist_name, x, y_pdf, y_cdf, dist_type, show_cdf=show_cdf)
+        
+        # Add quantiles for better interpretation if requested
+        if show_quantiles:
             quantiles = [0.025, 0.25, 0.5, 0.75, 0.975]
-            q_values = q_dist.ppf(quantiles)
-            for q, q_val in zip(quantiles, q_values):
-                fig.add_trace(go.Scatter(x=[q_val, q_val], y=[0, max(y_pdf)], mode="lines", 
-                                         line=dict(color="red", dash="dot", width=1),
-                                         name=f"{int(q*100)}% Quantile", showlegend=False))
-                fig.add_annotation(x=q_val, y=max(y_pdf)*0.9, text=f"{int(q*100)}%", showarrow=False, 
-                                   font=dict(color="red"))
-    
-    # Add comparison if enabled
-    if enable_comparison and comparison_dist != dist_name:
-        comp_dist_obj = dist_registry[comparison_dist]
-        comp_params = comp_dist_obj.get_default_comp_params()
-        comp_x, comp_y_pdf, comp_y_cdf, comp_dist_type = comp_dist_obj.generate_data(comp_params, x)
+            q_values = dist_cache.get_quantiles(dist_name, params, quantiles)
+            if q_values is not None:
+                fig.add_trace(quantile_trace(quantiles, q_values, y_top=np.max(y_pdf[np.isfinite(y_pdf)])))
         
-        if comp_x is not None:
-            if comp_dist_type == "PMF":
-                fig.add_trace(go.Bar(x=comp_x, y=comp_y_pdf, name=f"{comparison_dist} {comp_dist_type}", 
-                                    marker_color='#2ca02c', opacity=0.5))
-            else:
-                fig.add_trace(go.Scatter(x=comp_x, y=comp_y_pdf, mode="lines", name=f"{comparison_dist} {comp_dist_type}", 
-                                        line=dict(color='#2ca02c', width=2, dash='dot')))
-    
-    # Update layout
-    fig.update_layout(
-        title=f"{dist_name} Distribution Visualization",
-        xaxis_title="x",
-        yaxis_title=f"{dist_type} / CDF",
-        template="plotly_white",
-        height=500,
-        showlegend=True,
-        legend=dict(
-            orientation="h",
-            yanchor="bottom",
-            y=1.02,
-            xanchor="right",
-            x=1
-        )
-    )
+        # Overlay the compared models
+        if comparison is not None:
+            for i, member in enumerate(comparison["members"][1:], start=1):
+                fig.add_trace(comparison_trace(member, COMPARISON_COLORS[(i - 1) % len(COMPARISON_COLORS)],
+                                               name=f"{comparison_labels[i]} {member['dist_type']}"))
+        return fig
+    
+    # Create the main plot
+    with stage("app.figure"):
+        fig = sections.run("plot", {"show_cdf": show_cdf, "show_quantiles": show_quantiles}, build_plot,
+                           after=("curve", "comparison"))
     
     # Display the plot
-    st.plotly_chart(fig, use_container_width=True)
+    with stage("app.serialize"):
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"Figure payload: {figure_size_bytes(fig) / 1024:.1f} KB")
+    
+    # Pairwise divergences between the compared models
+    if comparison is not None:
+        divergence_section(comparison, comparison_labels)
     
     # Generate sample data if requested
     if show_samples:
-        st.subheader("📊 Sample Data")
-        
-        try:
-            samples = dist_obj.generate_samples(params, sample_size)
-            
-            # Create sample histogram
-            fig_samples = go.Figure()
-            fig_samples.add_trace(go.Histogram(x=samples, nbinsx=30, name="Sample Histogram", 
-                                             marker_color='#1f77b4', opacity=0.7))
-            
-            # Add theoretical PDF/PMF overlay
-            if dist_type == "PMF":
-                fig_samples.add_trace(go.Bar(x=x, y=y_pdf * sample_size / len(x), name="Theoretical PMF",
-                                           marker_color='#ff7f0e', opacity=0.8))
-            else:
-                # Scale PDF to match histogram
-                bin_width = (samples.max() - samples.min()) / 30 if len(samples) > 1 and samples.max() > samples.min() else 1
-                fig_samples.add_trace(go.Scatter(x=x, y=y_pdf * sample_size * bin_width, 
-                                               mode="lines", name="Theoretical PDF",
-                                               line=dict(color='#ff7f0e', width=2)))
-            
-            fig_samples.update_layout(
-                title=f"Sample Data vs Theoretical {dist_name} Distribution",
-                xaxis_title="Value",
-                yaxis_title="Frequency",
-                template="plotly_white",
-                height=400
-            )
-            
-            st.plotly_chart(fig_samples, use_container_width=True)
-            
-            # Sample statistics
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.metric("Sample Mean", f"{np.mean(samples):.3f}")
-            with col2:
-                st.metric("Sample Std", f"{np.std(samples):.3f}")
-            with col3:
-                st.metric("Sample Min", f"{np.min(samples):.3f}")
-            with col4:
-                st.metric("Sample Max", f"{np.max(samples):.3f}")
-                
-        except Exception as e:
-            st.error(f"Error generating samples: {str(e)}")
+        sample_section(dist_name, params, curve, compared, sample_size, bin_rule, use_seed, sample_seed,
+                       show_ecdf, run_gof, gof_mode)
+    
+    # Monte Carlo sampling distribution if requested
+    if enable_monte_carlo:
+        monte_carlo_section(dist_name, params, mc_statistic, mc_sample_size, mc_replicates, mc_seed)
+    
+    # Maximum-likelihood fits to an uploaded dataset
+    if enable_fitting:
+        fitting_section(data_path, fit_column, fit_criterion)
 
 # Statistics display
 if show_stats and x is not None:
     with col2:
         st.subheader("📈 Statistics")
         
-        stats = dist_obj.calculate_stats(params)
+        with stage("app.stats"):
+            stats = sections.run("stats", {"dist_name": dist_name, "params": params},
+                                 lambda: dist_cache.calculate_stats(dist_name, params))
         
         if stats:
             for stat_name, stat_value in stats.items():
@@ -217,60 +648,48 @@ with col1:
     st.info(dist_obj.get_info())
 
 with col2:
-    st.subheader("🔧 Export Options")
-    
-    if st.button("📊 Export Plot as PNG"):
-        try:
-            img_bytes = fig.to_image(format="png")
-            st.download_button(
-                label="Download PNG",
-                data=img_bytes,
-                file_name=f"{dist_name}_distribution.png",
-                mime="image/png"
-            )
-        except Exception as e:
-            st.error("Error exporting plot. Please install kaleido: `pip install kaleido`")
-    
-    if st.button("📄 Export Data as CSV"):
-        try:
-            df = pd.DataFrame({
-                'x': x,
-                'pdf_pmf': y_pdf,
-                'cdf': y_cdf if y_cdf is not None else [None] * len(x)
-            })
-            csv = df.to_csv(index=False)
-            st.download_button(
-                label="Download CSV",
-                data=csv,
-                file_name=f"{dist_name}_distribution_data.csv",
-                mime="text/csv"
-            )
-        except Exception as e:
-            st.error(f"Error exporting data: {str(e)}")
+    if x is not None:
+        export_section(dist_name, params, curve, show_samples, sample_size if show_samples else None,
+                       show_samples and use_seed, sample_seed if show_samples else None)
 
 with col3:
-    st.subheader("🎯 Quick Actions")
-    
-    if st.button("🔄 Reset to Defaults"):
-        st.rerun()
+    quick_actions()
+
+# Developer performance panel
+with st.sidebar:
+    st.subheader("🛠️ Developer")
+    perf_panel = st.checkbox("Performance Panel", value=timer.default_enabled, key="perf_panel",
+                             help="Time each stage of the rerun; dist.* stages are nested inside the app.* stage that called them")
     
-    if st.button("📚 Show Help"):
-        st.info("""
-        **How to use this app:**
-        1. Select a distribution from the sidebar
-        2. Adjust parameters using the sliders
-        3. Toggle CDF, quantiles, or samples for better visualization and interpretation
-        4. Use statistics and info sections to understand key properties
-        5. Enable comparison mode to overlay distributions
-        6. Export plots and data as needed
+    if perf_panel:
+        timer.record("app.total", time.perf_counter() - rerun_start)
+        last_run = timer.last_run()
+        st.caption("This rerun")
+        st.dataframe(pd.DataFrame({"Stage": list(last_run), "ms": [seconds * 1000 for seconds in last_run.values()]}),
+                     hide_index=True, use_container_width=True)
         
-        **Interpretation Tips:**
-        - Look at mean/variance for central tendency and spread
-        - Skewness >0 means right-skewed (tail to right)
-        - Kurtosis >3 means heavier tails than normal
-        - Quantiles show data thresholds (e.g., 95% below 97.5% quantile)
-        - Check 'Parameter Effects' in info for how sliders change the distribution
-        """)
+        st.caption(f"Rolling percentiles over the last {TIMING_WINDOW} calls per stage")
+        st.dataframe(pd.DataFrame([
+            {"Stage": name, "Calls": entry["count"], "p50 ms": entry["p50_s"] * 1000,
+             "p90 ms": entry["p90_s"] * 1000, "p99 ms": entry["p99_s"] * 1000}
+            for name, entry in timer.summary().items()
+        ]), hide_index=True, use_container_width=True)
+        
+        metrics_text = timer.prometheus_text()
+        st.download_button("Download Metrics", metrics_text, file_name="distviz_metrics.prom", mime="text/plain")
+        if TIMING_CONFIG["metrics_file"]:
+            timer.write_metrics(TIMING_CONFIG["metrics_file"])
+    
+    show_changes = st.checkbox("Change Log", value=False,
+                               help="Which sections recomputed on recent reruns, and which of their inputs changed")
+    
+    if show_changes:
+        st.caption(f"Reused this rerun: {', '.join(sections.reused) or 'none'}. "
+                   "Fragment reruns are logged under the page run they follow and show here on the next one.")
+        st.dataframe(pd.DataFrame([
+            {"Run": entry["run"], "Section": entry["section"], "Reason": entry["reason"], "ms": entry["ms"]}
+            for entry in sections.entries()
+        ], columns=["Run", "Section", "Reason", "ms"]), hide_index=True, use_container_width=True)
 
 # Footer
 st.markdown("---")
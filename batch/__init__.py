@@ -0,0 +1 @@
+from .jobs import JobError, Manifest, load_jobs, run_batch, run_job
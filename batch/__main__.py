@@ -0,0 +1,46 @@
+import argparse
+import sys
+import time
+
+from export import EXPORT_FORMATS
+
+from .jobs import Manifest, load_jobs, run_batch
+
+
+def _format_name(value):
+    # Let "--format parquet" match the "Parquet" key
+    return {name.lower(): name for name in EXPORT_FORMATS}.get(value.lower(), value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a JSON/CSV file of distribution jobs in parallel")
+    parser.add_argument("jobs", help="Job file (.json list of objects or .csv with a header row)")
+    parser.add_argument("--format", default="CSV", type=_format_name, choices=list(EXPORT_FORMATS), help="Output format")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--manifest", help="Resume manifest (default: <jobs>.manifest.jsonl)")
+    parser.add_argument("--no-resume", action="store_true", help="Recompute jobs the manifest records as done")
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = load_jobs(args.jobs)
+    except (OSError, ValueError) as e:
+        print(f"Cannot load {args.jobs}: {e}", file=sys.stderr)
+        return 2
+    manifest = Manifest(args.manifest or args.jobs + ".manifest.jsonl")
+    if args.no_resume:
+        manifest.completed.clear()
+
+    def progress(finished, total, job, status, seconds):
+        timing = f" in {seconds:.2f}s" if seconds is not None else ""
+        print(f"[{finished}/{total}] {status:<6} {job['dist']} -> {job['output']}{timing}", file=sys.stderr)
+
+    start = time.perf_counter()
+    counts = run_batch(jobs, args.format, args.workers, manifest, progress)
+    print(f"{counts['done']} computed, {counts['duplicates']} duplicates copied, "
+          f"{counts['skipped']} already done, {counts['failed']} failed "
+          f"in {time.perf_counter() - start:.1f}s")
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
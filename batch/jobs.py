@@ -0,0 +1,244 @@
+"""Job files for the batch CLI.
+
+A job file is JSON (a list of objects) or CSV with a header row. Fields:
+    dist     registry name, e.g. "Normal"                       (required)
+    params   object (JSON) or JSON-encoded string (CSV); missing
+             parameters take the distribution's defaults, unknown
+             names are rejected
+    grid     {"start", "stop", "num"} (JSON) or "start:stop:num" (CSV);
+             omit for the distribution's own adaptive grid. Continuous
+             distributions only: discrete ones always cover the window
+             holding all but 1e-12 of their mass
+    samples  number of samples to draw as well (default 0)
+    seed     sampling seed; derived from the job itself when omitted
+    output   output path without extension                       (required)
+"""
+import csv
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from distributions import dist_registry
+from distributions.cache import normalize_params
+from export import EXPORT_FORMATS, curve_table, export_table, samples_table
+
+
+class JobError(ValueError):
+    pass
+
+
+def _parse_grid(value):
+    if value in (None, ""):
+        return None
+    if isinstance(value, str):
+        try:
+            start, stop, num = value.split(":")
+            value = {"start": start, "stop": stop, "num": num}
+        except ValueError:
+            raise JobError(f"Grid '{value}' must look like start:stop:num") from None
+    try:
+        grid = {"start": float(value["start"]), "stop": float(value["stop"]), "num": int(value["num"])}
+    except (KeyError, TypeError, ValueError):
+        raise JobError(f"Grid {value!r} needs numeric start, stop and num") from None
+    if grid["num"] < 2 or not grid["stop"] > grid["start"]:
+        raise JobError(f"Grid {value!r} needs num >= 2 and stop > start")
+    return grid
+
+
+def normalize_job(raw, line):
+    dist_name = raw.get("dist")
+    if dist_name not in dist_registry:
+        raise JobError(f"Job {line}: unknown distribution '{dist_name}'")
+    if not raw.get("output"):
+        raise JobError(f"Job {line}: missing 'output'")
+    dist_obj = dist_registry[dist_name]
+
+    params = raw.get("params") or {}
+    if isinstance(params, str):
+        try:
+            params = json.loads(params)
+        except json.JSONDecodeError:
+            raise JobError(f"Job {line}: 'params' is not valid JSON") from None
+    if not isinstance(params, dict):
+        raise JobError(f"Job {line}: 'params' must be an object")
+    merged = dist_obj.default_params()
+    unknown = set(params) - set(merged)
+    if unknown:
+        raise JobError(f"Job {line}: unknown parameters for {dist_name}: {', '.join(sorted(unknown))}")
+    merged.update(params)
+    try:
+        dist_obj.validate_params(merged)
+        grid = _parse_grid(raw.get("grid"))
+        if grid is not None and dist_obj.dist_type == "PMF":
+            raise JobError(f"'grid' applies to continuous distributions only; {dist_name} is discrete")
+        samples = int(raw.get("samples") or 0)
+        seed = raw.get("seed")
+        seed = int(seed) if seed not in (None, "") else None
+    except (JobError, ValueError) as e:
+        raise JobError(f"Job {line}: {e}") from None
+
+    job = {"dist": dist_name, "params": merged, "grid": grid, "samples": samples, "seed": seed,
+           "output": raw["output"], "line": line}
+    job["key"] = job_key(job)
+    if job["seed"] is None:
+        # Derived from the job content, so a resumed or duplicated job draws the same samples
+        job["seed"] = int(job["key"][:16], 16)
+    return job
+
+
+def job_key(job):
+    # Everything that determines the numbers; the output path does not
+    identity = [job["dist"], normalize_params(job["params"]), job["grid"], job["samples"], job["seed"]]
+    return hashlib.sha256(json.dumps(identity, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def load_jobs(path):
+    if path.lower().endswith(".csv"):
+        with open(path, newline="") as fh:
+            rows = list(csv.DictReader(fh))
+        start = 2  # line numbers as seen in the file, after the header
+    else:
+        with open(path) as fh:
+            rows = json.load(fh)
+        if not isinstance(rows, list):
+            raise JobError("A JSON job file must contain a list of jobs")
+        start = 1
+    return [normalize_job(row, i) for i, row in enumerate(rows, start)]
+
+
+def job_outputs(job, fmt):
+    extension = EXPORT_FORMATS[fmt][0]
+    outputs = [job["output"] + extension]
+    if job["samples"]:
+        outputs.append(job["output"] + "_samples" + extension)
+    return outputs
+
+
+def run_job(job, fmt):
+    """Compute one job and write its files; returns the written paths."""
+    dist_obj = dist_registry[job["dist"]]
+    outputs = job_outputs(job, fmt)
+    directory = os.path.dirname(job["output"])
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    grid = job["grid"]
+    x_range = None if grid is None else np.linspace(grid["start"], grid["stop"], grid["num"])
+    with np.errstate(all="ignore"):
+        x, y_pdf, y_cdf, _ = dist_obj.generate_data(job["params"], x_range)
+    export_table(curve_table(x, y_pdf, y_cdf), fmt, outputs[0])
+    if job["samples"]:
+        export_table(samples_table(dist_obj, job["params"], job["samples"], seed=job["seed"]), fmt, outputs[1])
+    return outputs
+
+
+def copy_outputs(source_outputs, job, fmt):
+    """Serve a duplicate job from the files its identical twin already wrote."""
+    outputs = job_outputs(job, fmt)
+    for source, target in zip(source_outputs, outputs):
+        if os.path.abspath(source) != os.path.abspath(target):
+            directory = os.path.dirname(target)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            shutil.copyfile(source, target)
+    return outputs
+
+
+class Manifest:
+    """Append-only JSON-lines record of finished jobs, used to resume after a failure."""
+
+    def __init__(self, path):
+        self.path = path
+        self.completed = {}
+        if os.path.exists(path):
+            with open(path) as fh:
+                for line in fh:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from an interrupted run
+                        continue
+                    if entry.get("status") == "done":
+                        self.completed[(entry["key"], entry["output"], entry["format"])] = entry["files"]
+                    else:
+                        self.completed.pop((entry["key"], entry["output"], entry["format"]), None)
+
+    def is_done(self, job, fmt):
+        files = self.completed.get((job["key"], job["output"], fmt))
+        return files is not None and all(os.path.exists(path) for path in files)
+
+    def record(self, job, fmt, status, files=None, error=None, seconds=None):
+        entry = {"key": job["key"], "output": job["output"], "format": fmt, "status": status,
+                 "files": files or [], "error": error, "seconds": seconds}
+        with open(self.path, "a") as fh:
+            fh.write(json.dumps(entry) + "\n")
+            fh.flush()
+        if status == "done":
+            self.completed[(job["key"], job["output"], fmt)] = files
+
+
+def run_batch(jobs, fmt="CSV", workers=None, manifest=None, progress=None):
+    """Run jobs across a process pool; returns {"done", "skipped", "duplicates", "failed"} counts.
+
+    Jobs already recorded as done in the manifest (with their files still
+    on disk) are skipped. Jobs with identical content are computed once
+    and the remaining outputs are copied from the first result.
+    progress(finished, total, job, status, seconds) is called per job.
+    """
+    counts = {"done": 0, "skipped": 0, "duplicates": 0, "failed": 0}
+    groups = {}
+    for job in jobs:
+        if manifest is not None and manifest.is_done(job, fmt):
+            counts["skipped"] += 1
+            continue
+        groups.setdefault(job["key"], []).append(job)
+
+    total = sum(len(group) for group in groups.values())
+    finished = 0
+
+    def report(job, status, seconds, files=None, error=None):
+        nonlocal finished
+        finished += 1
+        counts[status if status != "copied" else "duplicates"] += 1
+        if manifest is not None:
+            manifest.record(job, fmt, "failed" if status == "failed" else "done", files, error, seconds)
+        if progress:
+            progress(finished, total, job, status, seconds)
+
+    if not groups:
+        return counts
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = {pool.submit(_timed_run, group[0], fmt): key for key, group in groups.items()}
+        for future in as_completed(futures):
+            first, *duplicates = groups[futures[future]]
+            try:
+                files, seconds = future.result()
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                for job in [first] + duplicates:
+                    report(job, "failed", None, error=error)
+                continue
+            report(first, "done", seconds, files)
+            for job in duplicates:
+                start = time.perf_counter()
+                try:
+                    copied = copy_outputs(files, job, fmt)
+                except OSError as e:
+                    report(job, "failed", None, error=f"{type(e).__name__}: {e}")
+                    continue
+                report(job, "copied", time.perf_counter() - start, copied)
+    return counts
+
+
+def _timed_run(job, fmt):
+    start = time.perf_counter()
+    files = run_job(job, fmt)
+    return files, time.perf_counter() - start
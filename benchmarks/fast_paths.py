@@ -0,0 +1,144 @@
+"""Agreement and speed of the closed-form fast paths against scipy.stats.
+
+Usage: python -m benchmarks.fast_paths [--points 50] [--grid 200] [--only Normal Beta]
+
+For each distribution, random points of the slider lattice are evaluated
+both ways. pdf, cdf, sf and ppf must agree to --rtol, and logpdf, logcdf
+and logsf must agree wherever scipy's value is above -700 (below that the
+plain function has underflowed on one side or the other). Exit status 1
+on any disagreement.
+"""
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from .suite import time_call
+
+DEFAULT_RTOL = 1e-9
+DEFAULT_ATOL = 1e-14
+LOG_FLOOR = -700.0
+
+
+def _inputs(dist_obj, params, n):
+    if dist_obj.dist_type == "PMF":
+        x = np.arange(-2, int(dist_obj.ppf(1 - 1e-12, params)) + 3, dtype=float)
+    else:
+        lo, hi = dist_obj.grid_bounds(params)
+        pad = 0.1 * (hi - lo)
+        x = np.linspace(lo - pad, hi + pad, n)
+    q = np.concatenate([[0.0, 1e-12], np.linspace(0, 1, n)[1:-1], [1 - 1e-12, 1.0]])
+    return x, q
+
+
+def _evaluate(dist_obj, params, x, q):
+    with np.errstate(all="ignore"):
+        return {
+            "pdf": np.asarray(dist_obj.pdf(x, params), dtype=float),
+            "cdf": np.asarray(dist_obj.cdf(x, params), dtype=float),
+            "sf": np.asarray(dist_obj.sf(x, params), dtype=float),
+            "ppf": np.asarray(dist_obj.ppf(q, params), dtype=float),
+            "logpdf": np.asarray(dist_obj.logpdf(x, params), dtype=float),
+            "logcdf": np.asarray(dist_obj.logcdf(x, params), dtype=float),
+            "logsf": np.asarray(dist_obj.logsf(x, params), dtype=float),
+        }
+
+
+def check_agreement(dist_name, points=50, grid=200, rtol=DEFAULT_RTOL, atol=DEFAULT_ATOL, seed=0):
+    """Return a list of disagreement descriptions (empty when the paths agree)."""
+    from distributions import dist_registry
+    from distributions.closed_form import set_fast_paths
+    from distributions.tables import lattice_axes, lattice_params
+
+    dist_obj = dist_registry[dist_name]
+    axes = lattice_axes(dist_obj)
+    n_rows = int(np.prod([len(values) for values in axes.values()])) if axes else 1
+    rows = np.random.default_rng(seed).choice(n_rows, size=min(points, n_rows), replace=False)
+    failures = []
+    previous = set_fast_paths(True)
+    try:
+        for row in sorted(set(rows.tolist()) | {0, n_rows - 1}):
+            params = lattice_params(dist_obj, axes, row)
+            try:
+                dist_obj.validate_params(params)
+            except ValueError:
+                continue
+            x, q = _inputs(dist_obj, params, grid)
+            set_fast_paths(True)
+            fast = _evaluate(dist_obj, params, x, q)
+            set_fast_paths(False)
+            reference = _evaluate(dist_obj, params, x, q)
+            for name, expected in reference.items():
+                actual = fast[name]
+                close = np.isclose(actual, expected, rtol=rtol, atol=atol, equal_nan=True)
+                if name.startswith("log"):
+                    close |= expected < LOG_FLOOR
+                elif name == "ppf" and dist_obj.dist_type == "PMF":
+                    # q sitting exactly on a CDF step may round to either neighbour
+                    close |= np.isclose(dist_obj.cdf(np.fmin(actual, expected), params), q, rtol=1e-12)
+                if not close.all():
+                    bad = np.flatnonzero(~close)[0]
+                    at = q[bad] if name == "ppf" else x[bad]
+                    failures.append(f"{dist_name} {params} {name}({at:.6g}): "
+                                    f"fast {actual[bad]:.17g} vs scipy {expected[bad]:.17g}")
+    finally:
+        set_fast_paths(previous)
+    return failures
+
+
+def time_paths(dist_name, grid=200, min_time=0.1):
+    from distributions import dist_registry
+    from distributions.closed_form import set_fast_paths
+
+    dist_obj = dist_registry[dist_name]
+    params = dist_obj.default_params()
+    x, q = _inputs(dist_obj, params, grid)
+    results = {}
+    previous = set_fast_paths(False)
+    try:
+        for fast_paths in (False, True):
+            set_fast_paths(fast_paths)
+            label = "fast" if fast_paths else "scipy"
+            with np.errstate(all="ignore"):
+                for method, values in (("pdf", x), ("cdf", x), ("sf", x), ("logsf", x), ("ppf", q)):
+                    results[f"{method}/{label}"] = time_call(
+                        lambda: getattr(dist_obj, method)(values, params), min_time)["median_s"]
+                results[f"generate_data/{label}"] = time_call(
+                    lambda: dist_obj.generate_data(params), min_time)["median_s"]
+    finally:
+        set_fast_paths(previous)
+    return results
+
+
+def main(argv=None):
+    from distributions import dist_registry
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--points", type=int, default=50, help="Lattice points checked per distribution")
+    parser.add_argument("--grid", type=int, default=200, help="Evaluation points per check and per timing")
+    parser.add_argument("--rtol", type=float, default=DEFAULT_RTOL)
+    parser.add_argument("--min-time", type=float, default=0.1, help="Seconds spent timing each method")
+    parser.add_argument("--only", nargs="+", choices=list(dist_registry), help="Restrict to these distributions")
+    args = parser.parse_args(argv)
+
+    report = {}
+    failures = []
+    for dist_name in args.only or list(dist_registry):
+        problems = check_agreement(dist_name, args.points, args.grid, args.rtol)
+        failures.extend(problems)
+        timings = time_paths(dist_name, args.grid, args.min_time)
+        report[dist_name] = {
+            "agrees": not problems,
+            "timings_us": {key: value * 1e6 for key, value in timings.items()},
+            "speedup": {method: timings[f"{method}/scipy"] / timings[f"{method}/fast"]
+                        for method in ("pdf", "cdf", "sf", "logsf", "ppf", "generate_data")},
+        }
+    print(json.dumps(report, indent=2))
+    for problem in failures:
+        print(f"MISMATCH {problem}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Cold-import budget for the headless compute core.
+
+Usage: python -m benchmarks.import_budget [--budget SECONDS] [--runs N]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Worker processes and CLI jobs must never drag these in
+FORBIDDEN_MODULES = ["streamlit", "plotly", "pandas", "altair", "tornado"]
+
+DEFAULT_BUDGET_SECONDS = 2.0
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+from distributions import dist_registry
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def measure_cold_import(runs=5):
+    timings = []
+    modules = set()
+    for _ in range(runs):
+        # A fresh interpreter each time so nothing is already in sys.modules
+        out = subprocess.run([sys.executable, "-c", _PROBE], cwd=REPO_ROOT,
+                             capture_output=True, text=True, check=True)
+        result = json.loads(out.stdout)
+        timings.append(result["seconds"])
+        modules.update(result["modules"])
+    leaked = sorted(m for m in modules if m.split(".")[0] in FORBIDDEN_MODULES)
+    return {
+        "median_seconds": statistics.median(timings),
+        "max_seconds": max(timings),
+        "runs": runs,
+        "leaked_modules": leaked,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_SECONDS,
+                        help="Maximum median cold-import time in seconds")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    report = measure_cold_import(args.runs)
+    report["budget_seconds"] = args.budget
+    report["ok"] = report["median_seconds"] <= args.budget and not report["leaked_modules"]
+    print(json.dumps(report, indent=2))
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""Timing suite for every registry distribution and for full app reruns.
+
+Usage:
+    python -m benchmarks.suite --out results.json
+    python -m benchmarks.suite --baseline results.json --threshold 0.25
+
+With --baseline, every timing that got slower than the baseline by more
+than the threshold (a fraction, 0.25 = 25%) is reported as a regression
+and the exit status is 1.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_SIZES = [1_000, 100_000, 1_000_000]
+QUANTILE_LEVELS = [0.025, 0.25, 0.5, 0.75, 0.975]
+DEFAULT_MIN_TIME = 0.2
+DEFAULT_THRESHOLD = 0.25
+APP_RERUNS = 5
+
+# Sidebar checkboxes ticked in each app scenario, by label
+APP_SCENARIOS = {
+    "default": [],
+    "cdf+quantiles": ["Show CDF", "Show Quantiles"],
+    "samples": ["Generate Sample Data"],
+    "comparison": ["Compare Distributions"],
+    "monte_carlo": ["Simulate a Statistic"],
+    "everything": ["Show CDF", "Show Statistics", "Show Quantiles", "Generate Sample Data",
+                   "Simulate a Statistic", "Compare Distributions"],
+}
+# Flipped after the warm reruns; only the sections it feeds should recompute
+SINGLE_TOGGLE = "Show Statistics"
+
+
+def time_call(func, min_time=DEFAULT_MIN_TIME, min_calls=3, max_calls=10_000):
+    """Per-call wall times of func after one warm-up call: {median_s, min_s, calls}."""
+    func()
+    timings = []
+    total = 0.0
+    while (total < min_time or len(timings) < min_calls) and len(timings) < max_calls:
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+        total += elapsed
+    return {"median_s": statistics.median(timings), "min_s": min(timings), "calls": len(timings)}
+
+
+def bench_distributions(names=None, min_time=DEFAULT_MIN_TIME):
+    from distributions import dist_registry
+
+    results = {}
+    levels = np.array(QUANTILE_LEVELS)
+    for dist_name in names or list(dist_registry):
+        dist_obj = dist_registry[dist_name]
+        params = dist_obj.default_params()
+        with np.errstate(all="ignore"):
+            results[f"{dist_name}/generate_data"] = time_call(lambda: dist_obj.generate_data(params), min_time)
+            results[f"{dist_name}/calculate_stats"] = time_call(lambda: dist_obj.calculate_stats(params), min_time)
+            for size in SAMPLE_SIZES:
+                rng = np.random.default_rng(0)
+                results[f"{dist_name}/generate_samples[{size}]"] = time_call(
+                    lambda: dist_obj.generate_samples(params, size, rng=rng), min_time)
+            if dist_obj.get_quantile_dist(params) is not None:
+                results[f"{dist_name}/quantiles"] = time_call(
+                    lambda: dist_obj.get_quantile_dist(params).ppf(levels), min_time)
+            else:
+                results[f"{dist_name}/quantiles"] = time_call(lambda: dist_obj.ppf(levels, params), min_time)
+    return results
+
+
+def bench_app(scenarios=None, reruns=APP_RERUNS):
+    """Headless app.py timings per scenario: the first run after the toggles change, warm reruns, then one SINGLE_TOGGLE flip."""
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    for name in scenarios or list(APP_SCENARIOS):
+        labels = APP_SCENARIOS[name]
+        at = AppTest.from_file(os.path.join(REPO_ROOT, "app.py"), default_timeout=120)
+        start = time.perf_counter()
+        at.run()
+        cold = time.perf_counter() - start
+        for checkbox in at.sidebar.checkbox:
+            checkbox.set_value(checkbox.label in labels)
+        start = time.perf_counter()
+        at.run()
+        toggled = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"App scenario '{name}' raised: {at.exception[0].value}")
+        timings = []
+        for _ in range(reruns):
+            start = time.perf_counter()
+            at.run()
+            timings.append(time.perf_counter() - start)
+        checkbox = next(checkbox for checkbox in at.sidebar.checkbox if checkbox.label == SINGLE_TOGGLE)
+        checkbox.set_value(not checkbox.value)
+        start = time.perf_counter()
+        at.run()
+        single = time.perf_counter() - start
+        results[f"app/{name}/first_run"] = {"median_s": cold, "min_s": cold, "calls": 1}
+        results[f"app/{name}/toggle"] = {"median_s": toggled, "min_s": toggled, "calls": 1}
+        results[f"app/{name}/rerun"] = {"median_s": statistics.median(timings), "min_s": min(timings),
+                                        "calls": len(timings)}
+        results[f"app/{name}/single_toggle"] = {"median_s": single, "min_s": single, "calls": 1}
+    return results
+
+
+def environment():
+    import scipy
+
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Return {key: {"baseline_s", "current_s", "ratio"}} for timings slower than baseline * (1 + threshold)."""
+    regressions = {}
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None or previous["median_s"] <= 0:
+            continue
+        ratio = current["median_s"] / previous["median_s"]
+        if ratio > 1 + threshold:
+            regressions[key] = {"baseline_s": previous["median_s"], "current_s": current["median_s"], "ratio": ratio}
+    return regressions
+
+
+def main(argv=None):
+    from distributions import dist_registry
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", help="Write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="Results JSON from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown before a timing counts as a regression (0.25 = 25%%)")
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME,
+                        help="Seconds spent timing each method")
+    parser.add_argument("--only", nargs="+", choices=list(dist_registry), help="Restrict to these distributions")
+    parser.add_argument("--app", nargs="*", choices=list(APP_SCENARIOS),
+                        help="App scenarios to time (default: all; pass --no-app to skip)")
+    parser.add_argument("--no-app", action="store_true", help="Skip the app rerun timings")
+    args = parser.parse_args(argv)
+
+    results = bench_distributions(args.only, args.min_time)
+    if not args.no_app:
+        results.update(bench_app(args.app or None))
+    report = {"environment": environment(), "results": results}
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)["results"]
+        report["baseline"] = args.baseline
+        report["threshold"] = args.threshold
+        report["regressions"] = compare(results, baseline, args.threshold)
+        for key, entry in sorted(report["regressions"].items()):
+            print(f"REGRESSION {key}: {entry['baseline_s'] * 1000:.3f} ms -> "
+                  f"{entry['current_s'] * 1000:.3f} ms ({entry['ratio']:.2f}x)", file=sys.stderr)
+        status = 1 if report["regressions"] else 0
+
+    if args.out:
+        with open(args.out, "w") as fh:
+            json.dump(report, fh, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,6 @@
 # Configuration file for Distribution Visualizer Pro
+import os
+
 
 # App Configuration
 APP_CONFIG = {
@@ -121,3 +123,19 @@ UI_CONFIG = {
     "info_box_bg": "#e8f4fd",
     "info_box_border": "#bee5eb"
 }
+
+# Computation Cache Settings
+CACHE_CONFIG = {
+    "max_bytes": 64 * 1024 * 1024
+}
+
+# Precomputed Lattice Tables (build with `python -m distributions.tables build`)
+TABLES_CONFIG = {
+    "directory": os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+}
+
+# Stage Timing (developer panel). DISTVIZ_TIMING=1 turns timing on for every session;
+# with DISTVIZ_METRICS_FILE set, the panel rewrites that file in Prometheus text format each rerun.
+TIMING_CONFIG = {
+    "metrics_file": os.environ.get("DISTVIZ_METRICS_FILE")
+}
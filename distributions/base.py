@@ -1,29 +1,207 @@
 from abc import ABC, abstractmethod
-import streamlit as st
+import numpy as np
+
+from .closed_form import fast_paths_enabled
+from .moments import display_value, moment_summary
+from .timing import timed
+
+# Parameter domains, by the kind named in a class's param_domains: (test, description)
+DOMAIN_KINDS = {
+    "real": (lambda v: np.isfinite(v), "a finite number"),
+    "positive": (lambda v: np.isfinite(v) & (v > 0), "positive"),
+    "nonnegative": (lambda v: np.isfinite(v) & (v >= 0), "non-negative"),
+    "probability": (lambda v: (v >= 0) & (v <= 1), "between 0 and 1"),
+    "count": (lambda v: np.isfinite(v) & (v >= 0) & (v == np.floor(v)), "a non-negative integer"),
+}
+
+
+def _prefer_closed_form(name, scipy_method):
+    def method(self, x, params):
+        if fast_paths_enabled():
+            values = getattr(self.closed_form, name)(x, params)
+            inside = self.domain_mask(params)
+            # scipy.stats answers nan for parameters outside the domain; so do the fast paths
+            return values if inside.all() else np.where(inside, values, np.nan)
+        return scipy_method(self, x, params)
+    method.__name__ = method.__qualname__ = name
+    method.__doc__ = scipy_method.__doc__
+    return method
 
 class BaseDistribution(ABC):
+    # "PDF" for continuous distributions, "PMF" for discrete ones
+    dist_type = "PDF"
+    # Slider domain of each parameter: label, min, max, default, step, help.
+    # Kept as plain data so the math stays importable without any UI toolkit.
+    param_specs = {}
+    # Parameters that are not user-adjustable but are still passed to the methods below
+    fixed_params = {}
+    # Where the distribution is defined: parameter name -> a DOMAIN_KINDS key. Outside it
+    # validate_params raises and the closed-form fast paths return nan, as scipy.stats does
+    param_domains = {}
+    # Entry points reported as "dist.<name>" stages when distributions.timing is enabled
+    timed_methods = ("generate_data", "calculate_stats", "generate_samples", "get_quantile_dist")
+    # A closed_form.ClosedForm subclass; while fast paths are enabled, pdf/cdf/ppf and
+    # the log/survival variants use it instead of the scipy.stats methods defined below
+    closed_form = None
+    closed_form_methods = ("pdf", "cdf", "ppf", "logpdf", "logcdf", "sf", "logsf")
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for name in cls.timed_methods:
+            if name in cls.__dict__:
+                setattr(cls, name, timed(f"dist.{name}")(cls.__dict__[name]))
+        if cls.closed_form is not None:
+            for name in cls.closed_form_methods:
+                scipy_method = getattr(cls, name)
+                # Methods inherited from a registry parent were already wrapped there
+                if name in cls.__dict__ or scipy_method is BaseDistribution.__dict__.get(name):
+                    setattr(cls, name, _prefer_closed_form(name, scipy_method))
+
+    def default_params(self):
+        params = dict(self.fixed_params)
+        params.update({name: spec["default"] for name, spec in self.param_specs.items()})
+        return params
+
+    def domain_mask(self, params):
+        """True where the parameters (scalars or broadcasting arrays) are inside the domain."""
+        inside = True
+        with np.errstate(invalid="ignore"):
+            for name, kind in self.param_domains.items():
+                inside = inside & DOMAIN_KINDS[kind][0](np.asarray(params[name], dtype=float))
+        return np.asarray(inside, dtype=bool)
+
+    def validate_params(self, params):
+        for name, kind in self.param_domains.items():
+            test, description = DOMAIN_KINDS[kind]
+            with np.errstate(invalid="ignore"):
+                if not np.all(test(np.asarray(params[name], dtype=float))):
+                    label = self.param_specs.get(name, {}).get("label", name)
+                    raise ValueError(f"{label} must be {description}, got {params[name]}")
+
+    # pdf/cdf must broadcast: params may hold arrays as well as scalars
     @abstractmethod
-    def get_params(self, st):
+    def pdf(self, x, params):
         pass
 
     @abstractmethod
-    def generate_data(self, params, x_range=None):
+    def cdf(self, x, params):
         pass
 
     @abstractmethod
-    def calculate_stats(self, params):
+    def ppf(self, q, params):
+        pass
+
+    # (scipy.stats distribution, keyword arguments for params), or None. The log and survival
+    # functions below call its own methods, which keep the tail precision that log(pdf),
+    # log(cdf) and 1 - cdf lose
+    def scipy_args(self, params):
+        return None
+
+    def _scipy(self, name, x, params):
+        rv, kwargs = self.scipy_args(params)
+        return getattr(rv, name)(x, **kwargs)
+
+    def logpdf(self, x, params):
+        if self.scipy_args(params) is not None:
+            return self._scipy("logpmf" if self.dist_type == "PMF" else "logpdf", x, params)
+        with np.errstate(divide="ignore"):
+            return np.log(self.pdf(x, params))
+
+    def logcdf(self, x, params):
+        if self.scipy_args(params) is not None:
+            return self._scipy("logcdf", x, params)
+        with np.errstate(divide="ignore"):
+            return np.log(self.cdf(x, params))
+
+    def sf(self, x, params):
+        if self.scipy_args(params) is not None:
+            return self._scipy("sf", x, params)
+        return 1.0 - self.cdf(x, params)
+
+    def logsf(self, x, params):
+        if self.scipy_args(params) is not None:
+            return self._scipy("logsf", x, params)
+        with np.errstate(divide="ignore"):
+            return np.log(self.sf(x, params))
+
+    def grid_bounds(self, params, tail=1e-5, iqr_fence=8.0):
+        """Plot range: the support where finite, else the tail quantiles.
+
+        Heavy tails (Cauchy-like t, F, wide Log-Normal) are additionally
+        fenced at iqr_fence interquartile ranges so the body stays visible.
+        """
+        support_lo, q_lo, q1, q3, q_hi, support_hi = np.asarray(
+            self.ppf(np.array([0.0, tail, 0.25, 0.75, 1 - tail, 1.0]), params), dtype=float)
+        iqr = q3 - q1
+        lo = support_lo if np.isfinite(support_lo) else max(q_lo, q1 - iqr_fence * iqr)
+        hi = support_hi if np.isfinite(support_hi) else min(q_hi, q3 + iqr_fence * iqr)
+        return float(lo), float(hi)
+
+    def param_table(self, param_table):
+        """Normalize a list of param dicts or a dict of columns into 1-D column arrays."""
+        if isinstance(param_table, dict):
+            columns = {name: np.atleast_1d(np.asarray(values)) for name, values in param_table.items()}
+            n_params = len(next(iter(columns.values()))) if columns else 0
+        else:
+            rows = list(param_table)
+            n_params = len(rows)
+            # The family's parameters in param_specs order, then any other keys as first seen
+            seen = dict.fromkeys(name for row in rows for name in row)
+            names = [name for name in self.param_specs if name in seen] + [name for name in seen
+                                                                            if name not in self.param_specs]
+            columns = {}
+            for name in names:
+                absent = next((i for i, row in enumerate(rows) if name not in row), None)
+                if absent is not None:
+                    raise ValueError(f"Parameter row {absent} has no '{name}'")
+                columns[name] = np.asarray([row[name] for row in rows])
+
+        for name, values in columns.items():
+            if values.shape != (n_params,):
+                raise ValueError(f"Parameter column '{name}' has shape {values.shape}, expected ({n_params},)")
+        for name, value in self.fixed_params.items():
+            columns.setdefault(name, np.full(n_params, value))
+        missing = [name for name in self.param_specs if name not in columns]
+        if missing:
+            raise ValueError(f"Missing parameters: {', '.join(missing)}")
+        return columns, n_params
+
+    @timed("dist.generate_batch")
+    def generate_batch(self, param_table, grid):
+        """Evaluate PDF/PMF and CDF for every parameter row on a shared grid.
+
+        Returns (grid, pdf, cdf, dist_type) with pdf and cdf as C-contiguous
+        (n_params, n_points) arrays.
+        """
+        columns, n_params = self.param_table(param_table)
+        grid = np.asarray(grid, dtype=float).ravel()
+        params = {name: values[:, None] for name, values in columns.items()}
+        shape = (n_params, grid.size)
+        y_pdf = np.ascontiguousarray(np.broadcast_to(self.pdf(grid[None, :], params), shape), dtype=float)
+        y_cdf = np.ascontiguousarray(np.broadcast_to(self.cdf(grid[None, :], params), shape), dtype=float)
+        return grid, y_pdf, y_cdf, self.dist_type
+
+    @abstractmethod
+    def generate_data(self, params, x_range=None):
         pass
 
+    # Moments from the family's closed forms where it has them, else by summation or
+    # quadrature (see distributions.moments); what doesn't exist reads "Undefined" or "∞"
+    @timed("dist.calculate_stats")
+    def calculate_stats(self, params):
+        return {name: display_value(value) for name, value in moment_summary(self, params).items()}
+
     @abstractmethod
     def get_info(self):
         pass
 
+    # rng: a numpy Generator, or anything np.random.default_rng accepts (None, a seed, a SeedSequence)
     @abstractmethod
-    def generate_samples(self, params, size):
+    def generate_samples(self, params, size, rng=None):
         pass
 
     def get_quantile_dist(self, params):
         return None
 
     def get_default_comp_params(self):
-        return {}
\ No newline at end of file
+        return {}
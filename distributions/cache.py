@@ -0,0 +1,181 @@
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Nominal size charged for entries whose footprint numpy can't report
+# (frozen scipy distributions, small dicts of statistics).
+OBJECT_OVERHEAD_BYTES = 1024
+# Longer quantile vectors are answered from the cached inverse-CDF tables without memoizing the result
+QUANTILE_RESULT_LEVELS = 64
+
+_MISSING = object()
+
+
+def normalize_params(params):
+    # Slider floats such as 0.30000000000000004 and 0.3 must share a key
+    items = []
+    for name, value in sorted((params or {}).items()):
+        if isinstance(value, (bool, np.bool_)):
+            value = bool(value)
+        elif isinstance(value, (int, float, np.integer, np.floating)):
+            value = round(float(value), 12)
+        items.append((name, value))
+    return tuple(items)
+
+
+def grid_key(x_range):
+    if x_range is None:
+        return None
+    x_range = np.ascontiguousarray(x_range)
+    return (x_range.dtype.str, x_range.shape, hashlib.blake2b(x_range.tobytes(), digest_size=16).digest())
+
+
+def _freeze(value):
+    if isinstance(value, np.ndarray):
+        value = value.view()
+        value.flags.writeable = False
+        return value
+    if isinstance(value, tuple):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _sizeof(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        return sum(_sizeof(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sys.getsizeof(v) for v in value.values())
+    return OBJECT_OVERHEAD_BYTES
+
+
+class LRUCache:
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """Store value (unless it alone exceeds the budget) and return the cached copy."""
+        value = _freeze(value)
+        size = _sizeof(value)
+        if size > self.max_bytes:
+            return value
+
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key][0]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+        return value
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            # Compute outside the lock so concurrent sessions don't serialize on scipy
+            value = self.put(key, compute())
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class DistributionCache:
+    """Memoizes the pure BaseDistribution methods of a registry."""
+
+    def __init__(self, registry, max_bytes=64 * 1024 * 1024, tables=None):
+        self.registry = registry
+        self.lru = LRUCache(max_bytes)
+        # Optional LatticeTables; on-lattice lookups bypass both scipy and the LRU
+        self.tables = tables
+        self.table_hits = 0
+        from .quantiles import QuantileEngine
+
+        # Inverse-CDF tables share the same memory budget
+        self.quantile_engine = QuantileEngine(registry, lru=self.lru)
+
+    def generate_data(self, dist_name, params, x_range=None):
+        if self.tables is not None and x_range is None:
+            result = self.tables.generate_data(dist_name, params)
+            if result is not None:
+                self.table_hits += 1
+                return result
+        key = ("generate_data", dist_name, normalize_params(params), grid_key(x_range))
+        dist = self.registry[dist_name]
+        return self.lru.get_or_compute(key, lambda: dist.generate_data(params, x_range))
+
+    def calculate_stats(self, dist_name, params):
+        key = ("calculate_stats", dist_name, normalize_params(params))
+        dist = self.registry[dist_name]
+        # Hand out copies so callers can't mutate the cached dict
+        return dict(self.lru.get_or_compute(key, lambda: dist.calculate_stats(params)))
+
+    def get_quantile_dist(self, dist_name, params):
+        key = ("get_quantile_dist", dist_name, normalize_params(params))
+        dist = self.registry[dist_name]
+        return self.lru.get_or_compute(key, lambda: dist.get_quantile_dist(params))
+
+    def get_quantiles(self, dist_name, params, levels):
+        if self.tables is not None:
+            result = self.tables.get_quantiles(dist_name, params, levels)
+            if result is not None:
+                self.table_hits += 1
+                return result
+        levels = np.asarray(levels, dtype=float)
+        if levels.size > QUANTILE_RESULT_LEVELS:
+            # Large level vectors (QQ-plots) would crowd out everything else in the LRU
+            return self.quantile_engine.ppf(dist_name, params, levels)
+        key = ("get_quantiles", dist_name, normalize_params(params), tuple(levels.tolist()))
+        return self.lru.get_or_compute(key, lambda: self.quantile_engine.ppf(dist_name, params, levels))
+
+    def compare(self, members, points=None):
+        """N-way comparison of [(dist_name, params), ...]; see distributions.comparison."""
+        from .comparison import COMPARISON_POINTS, compare_members
+
+        return compare_members(self.registry, members, points or COMPARISON_POINTS, lru=self.lru)
+
+    def stats(self):
+        stats = self.lru.stats()
+        stats["table_hits"] = self.table_hits
+        return stats
+
+    def clear(self):
+        self.lru.clear()
@@ -1,36 +1,43 @@
 from .base import BaseDistribution
+from . import closed_form
+from .grid import adaptive_grid
 from scipy.stats import chi2
 import numpy as np
-import streamlit as st
 
 class ChiSquareDistribution(BaseDistribution):
-    def get_params(self, st):
-        df = st.slider("Degrees of Freedom (ν)", 1, 30, 5, help="Degrees of freedom parameter")
-        return {"df": df}
+    closed_form = closed_form.ChiSquare
+
+    param_specs = {
+        "df": {"label": "Degrees of Freedom (ν)", "min": 1, "max": 30, "default": 5, "step": 1, "help": "Degrees of freedom parameter"}
+    }
+    param_domains = {"df": "positive"}
+
+    def pdf(self, x, params):
+        return chi2.pdf(x, df=params["df"])
+
+    def cdf(self, x, params):
+        return chi2.cdf(x, df=params["df"])
+
+    def ppf(self, q, params):
+        return chi2.ppf(q, df=params["df"])
 
     def generate_data(self, params, x_range=None):
         if x_range is None:
-            x = np.linspace(0, max(30, 3*params["df"]), 500)
+            x = adaptive_grid(self, params)
         else:
             x = x_range
-        y_pdf = chi2.pdf(x, df=params["df"])
-        y_cdf = chi2.cdf(x, df=params["df"])
+        y_pdf = self.pdf(x, params)
+        y_cdf = self.cdf(x, params)
         return x, y_pdf, y_cdf, "PDF"
 
-    def calculate_stats(self, params):
-        return {
-            "Mean": params["df"],
-            "Variance": 2 * params["df"],
-            "Standard Deviation": np.sqrt(2 * params["df"]),
-            "Skewness": np.sqrt(8 / params["df"]),
-            "Kurtosis": 12 / params["df"] + 3
-        }
-
     def get_info(self):
         return "Used for testing variance and goodness-of-fit. Always positive and right-skewed. Interpretation: Sum of squares of standard normals; skewness decreases with df.\n\n**Parameter Effects:**\n- Degrees of Freedom (ν): Increases the mean and variance; reduces skewness and makes the distribution more symmetric as ν grows."
 
-    def generate_samples(self, params, size):
-        return np.random.chisquare(params["df"], size)
+    def generate_samples(self, params, size, rng=None):
+        return np.random.default_rng(rng).chisquare(params["df"], size)
+
+    def scipy_args(self, params):
+        return chi2, {"df": params["df"]}
 
     def get_quantile_dist(self, params):
         return chi2(df=params["df"])
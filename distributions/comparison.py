@@ -0,0 +1,173 @@
+"""Overlay several distributions, each with its own parameters, on one grid.
+
+The continuous members share a grid of cell midpoints spanning the union of
+their plot ranges, snapped outward to round numbers so that moving one
+member's slider rarely moves it. The discrete members share every integer
+in the union of their windows holding all but DISCRETE_EPSILON of the mass
+(see grid.discrete_window), or, when that union is longer than
+DISCRETE_BUDGET, bins of equal integer width over it. Members of the same family are evaluated
+together in one broadcast call, and each member's curves are cached under
+its own key, so a rerun in which one member changed evaluates only that one.
+
+Pairwise divergences are taken over the plotted range: sums over the shared
+integers (or integer bins) for discrete pairs and the midpoint rule over the shared grid for
+continuous pairs. A discrete and a continuous member are mutually singular
+(KL is infinite, total variation and Hellinger distance are 1).
+"""
+import numpy as np
+
+from .cache import LRUCache, grid_key, normalize_params
+from .grid import DISCRETE_BUDGET, bin_mass, discrete_window, lattice_bins
+
+COMPARISON_POINTS = 1000
+# The continuous range is snapped outward to a multiple of a 1-2-5 step about span / SNAP_STEPS
+SNAP_STEPS = 8
+DIVERGENCES = ["KL Divergence", "Total Variation", "Hellinger Distance"]
+
+
+def member_label(dist_name, params, dist_obj=None):
+    shown = params if dist_obj is None else {name: params[name] for name in dist_obj.param_specs}
+    if not shown:
+        return dist_name
+    return f"{dist_name}({', '.join(f'{name}={value:g}' for name, value in shown.items())})"
+
+
+def _snap(lo, hi):
+    span = hi - lo
+    if not span > 0:
+        return lo - 0.5, hi + 0.5
+    magnitude = 10.0 ** np.floor(np.log10(span / SNAP_STEPS))
+    step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= span / SNAP_STEPS)
+    return np.floor(lo / step) * step, np.ceil(hi / step) * step
+
+
+def union_grid(registry, members, points=COMPARISON_POINTS, budget=DISCRETE_BUDGET):
+    """(continuous midpoints, cell width, lattice, lattice width) shared by all members.
+
+    The lattice holds integers, or the centres of integer bins lattice width wide.
+    """
+    continuous, discrete = [], []
+    for dist_name, params in members:
+        dist_obj = registry[dist_name]
+        if dist_obj.dist_type == "PMF":
+            discrete.append(discrete_window(dist_obj, params))
+        else:
+            continuous.append(dist_obj.grid_bounds(params))
+
+    x, width = np.empty(0), 0.0
+    if continuous:
+        lo, hi = _snap(min(b[0] for b in continuous), max(b[1] for b in continuous))
+        width = (hi - lo) / points
+        x = lo + width * (np.arange(points) + 0.5)
+    lattice, lattice_width = np.empty(0), 1.0
+    if discrete:
+        edges, lattice_width = lattice_bins(np.ceil(min(b[0] for b in discrete)),
+                                            np.floor(max(b[1] for b in discrete)), budget)
+        lattice = edges[:-1] + lattice_width / 2
+    return x, width, lattice, lattice_width
+
+
+def _evaluate_family(dist_obj, rows, x, bin_width=1.0):
+    columns, n_params = dist_obj.param_table(rows)
+    params = {name: values[:, None] for name, values in columns.items()}
+    shape = (n_params, x.size)
+    if bin_width > 1:
+        # Integer bins: the mean probability per integer, as grid.discrete_grid draws them
+        edges = np.append(x - bin_width / 2, x[-1] + bin_width / 2)
+        mass, cdf = bin_mass(dist_obj, edges[None, :], params)
+        pdf = np.broadcast_to(mass / bin_width, shape).astype(float)
+        with np.errstate(divide="ignore"):
+            return pdf, np.broadcast_to(cdf, shape).astype(float), np.log(pdf)
+    with np.errstate(all="ignore"):
+        logpdf = np.broadcast_to(dist_obj.logpdf(x[None, :], params), shape).astype(float)
+        cdf = np.broadcast_to(dist_obj.cdf(x[None, :], params), shape).astype(float)
+    return np.exp(logpdf), cdf, logpdf
+
+
+def evaluate_members(registry, members, x, lattice, lru=None, lattice_width=1.0):
+    """[(pdf, cdf, logpdf)] per member: on x for continuous members, on lattice for discrete ones."""
+    results = [None] * len(members)
+    missing = {}
+    keys = []
+    for i, (dist_name, params) in enumerate(members):
+        points = lattice if registry[dist_name].dist_type == "PMF" else x
+        key = ("compare_member", dist_name, normalize_params(params), grid_key(points))
+        keys.append(key)
+        if lru is not None:
+            results[i] = lru.get(key)
+        if results[i] is None:
+            missing.setdefault(dist_name, []).append(i)
+
+    # Whatever isn't cached is evaluated one family at a time, all parameter rows at once
+    for dist_name, indices in missing.items():
+        dist_obj = registry[dist_name]
+        points = lattice if dist_obj.dist_type == "PMF" else x
+        pdf, cdf, logpdf = _evaluate_family(dist_obj, [members[i][1] for i in indices], points,
+                                            lattice_width if dist_obj.dist_type == "PMF" else 1.0)
+        for row, i in enumerate(indices):
+            value = (pdf[row], cdf[row], logpdf[row])
+            results[i] = lru.put(keys[i], value) if lru is not None else value
+    return results
+
+
+def divergence_matrices(pdf, logpdf, weight):
+    """Pairwise KL(P_i || P_j), total variation and Hellinger distance of densities on a shared grid.
+
+    pdf and logpdf are (n_members, n_points); weight is the cell width, or 1 for a pmf.
+    """
+    p, q = pdf[:, None, :], pdf[None, :, :]
+    with np.errstate(all="ignore"):
+        kl_terms = np.where(p > 0, p * (logpdf[:, None, :] - logpdf[None, :, :]), 0.0)
+        kl = np.maximum(np.sum(kl_terms, axis=-1) * weight, 0.0)
+        tv = 0.5 * np.sum(np.abs(p - q), axis=-1) * weight
+        hellinger = np.sqrt(0.5 * np.sum((np.sqrt(p) - np.sqrt(q)) ** 2, axis=-1) * weight)
+    # The plotted range leaves out a little mass, so clip to the metrics' true ranges
+    np.fill_diagonal(kl, 0.0)
+    return {
+        "KL Divergence": kl,
+        "Total Variation": np.clip(tv, 0.0, 1.0),
+        "Hellinger Distance": np.clip(hellinger, 0.0, 1.0),
+    }
+
+
+def compare_members(registry, members, points=COMPARISON_POINTS, lru=None):
+    """Evaluate members [(dist_name, params), ...] on their union grid.
+
+    Returns {"members": [{"label", "dist_name", "params", "dist_type", "x", "pdf", "cdf"}],
+    "divergences": {name: (n_members, n_members) array}}.
+    """
+    lru = lru if lru is not None else LRUCache()
+    x, width, lattice, lattice_width = union_grid(registry, members, points)
+    curves = evaluate_members(registry, members, x, lattice, lru, lattice_width)
+
+    n_members = len(members)
+    discrete = np.array([registry[name].dist_type == "PMF" for name, _ in members], dtype=bool)
+    # Mutually singular pairs: one discrete, one continuous
+    divergences = {
+        "KL Divergence": np.full((n_members, n_members), np.inf),
+        "Total Variation": np.ones((n_members, n_members)),
+        "Hellinger Distance": np.ones((n_members, n_members)),
+    }
+    for kind, weight in ((discrete, lattice_width), (~discrete, width)):
+        index = np.flatnonzero(kind)
+        if index.size:
+            pdf = np.stack([curves[i][0] for i in index])
+            logpdf = np.stack([curves[i][2] for i in index])
+            for name, matrix in divergence_matrices(pdf, logpdf, weight).items():
+                divergences[name][np.ix_(index, index)] = matrix
+
+    return {
+        "members": [
+            {
+                "label": member_label(dist_name, params, registry[dist_name]),
+                "dist_name": dist_name,
+                "params": params,
+                "dist_type": registry[dist_name].dist_type,
+                "x": lattice if is_discrete else x,
+                "pdf": pdf,
+                "cdf": cdf,
+            }
+            for (dist_name, params), is_discrete, (pdf, cdf, _) in zip(members, discrete, curves)
+        ],
+        "divergences": divergences,
+    }
@@ -0,0 +1,274 @@
+"""One numeric column of a CSV or NPY file, read in bounded chunks.
+
+    source = ColumnSource("data.csv", column="latency_ms")   # or index=2 for the third column
+    for values, skipped in source.chunks():   # float64 arrays of up to ~1M values
+        ...
+    parts = source.split(8)                   # picklable slices for pool workers
+
+NPY files are memory-mapped and sliced by rows. CSV files are split into
+byte ranges that start and end on line boundaries, and each range is
+parsed block by block with pandas' C parser, so a worker only ever holds
+one block of its own slice. Quoted fields containing newlines are not
+supported. Missing and non-numeric values are skipped and counted.
+
+SampleSource offers the same interface over draws from a registry
+distribution, so anything that reads a file column can read a simulation
+of any size too: by default exactly the draws of
+np.random.default_rng(seed), as the app displays them. plan_parts and
+run_jobs spread the parts over a pool.
+"""
+import csv
+import io
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from .sampling import split_sizes
+from .streaming import stream_samples
+
+# Rows per NPY chunk and bytes per CSV block; both keep a chunk around 8-16 MB
+CHUNK_ROWS = 1 << 20
+CSV_BLOCK_BYTES = 16 << 20
+FILE_TYPES = (".csv", ".npy")
+# Draws per SampleSource block when it is split over independent streams
+SAMPLE_BLOCK = 1 << 22
+# Sources smaller than this are read in-process; pool start-up would dominate
+INLINE_BYTES = 32 << 20
+# Slices per worker, so a slow slice doesn't leave the other workers idle
+PARTS_PER_WORKER = 4
+MIN_PART_BYTES = 8 << 20
+
+
+def csv_columns(path):
+    with open(path, newline="") as fh:
+        return next(csv.reader(fh), [])
+
+
+def npy_columns(path):
+    shape = np.load(path, mmap_mode="r").shape
+    return [] if len(shape) == 1 else [str(i) for i in range(shape[1])]
+
+
+def file_columns(path):
+    """Column names a ColumnSource can read: CSV header names, or NPY column indices ([] for 1-D)."""
+    return csv_columns(path) if _kind(path) == ".csv" else npy_columns(path)
+
+
+def _kind(path):
+    kind = os.path.splitext(path)[1].lower()
+    if kind not in FILE_TYPES:
+        raise ValueError(f"Unsupported data file '{os.path.basename(path)}'; use one of: {', '.join(FILE_TYPES)}")
+    return kind
+
+
+class ColumnSource:
+    """column is a name from file_columns, index a 0-based position; the first column by default."""
+
+    def __init__(self, path, column=None, index=None, start=None, stop=None):
+        self.path = path
+        self.kind = _kind(path)
+        columns = file_columns(path)
+        if column is not None and index is not None:
+            raise ValueError("Give a column name or an index, not both")
+        if column is not None:
+            if not isinstance(column, str):
+                raise TypeError(f"column is a name; pass the position {column!r} as index=")
+            if column not in columns:
+                raise ValueError(f"No column '{column}' in {os.path.basename(path)}")
+            self.index = columns.index(column)
+        elif index is None:
+            self.index = 0
+        elif 0 <= index < max(len(columns), 1):
+            self.index = int(index)
+        else:
+            raise ValueError(f"No column at index {index} in {os.path.basename(path)} ({len(columns)} columns)")
+        self.column = columns[self.index] if columns else None
+        # Rows for NPY, bytes for CSV; None means the whole file
+        if self.kind == ".npy":
+            n_rows = np.load(path, mmap_mode="r").shape[0]
+            self.start, self.stop = start or 0, n_rows if stop is None else stop
+        else:
+            header_end = self._header_bytes()
+            self.start = header_end if start is None else start
+            self.stop = os.path.getsize(path) if stop is None else stop
+
+    def _header_bytes(self):
+        with open(self.path, "rb") as fh:
+            fh.readline()
+            return fh.tell()
+
+    def __repr__(self):
+        return f"ColumnSource({self.path!r}, index={self.index}, start={self.start}, stop={self.stop})"
+
+    @property
+    def nbytes(self):
+        if self.kind == ".csv":
+            return self.stop - self.start
+        array = np.load(self.path, mmap_mode="r")
+        return (self.stop - self.start) * array.itemsize * (array.shape[1] if array.ndim == 2 else 1)
+
+    def split(self, parts):
+        """Up to parts contiguous, non-overlapping slices covering this one."""
+        parts = max(1, int(parts))
+        bounds = np.linspace(self.start, self.stop, parts + 1).astype(np.int64)
+        if self.kind == ".csv":
+            bounds = [self.start] + [self._next_line(int(b)) for b in bounds[1:-1]] + [self.stop]
+        slices = []
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            if stop > start:
+                slices.append(ColumnSource(self.path, index=self.index, start=int(start), stop=int(stop)))
+        return slices
+
+    def _next_line(self, offset):
+        # Move a split point forward to just past the end of the line it falls in
+        with open(self.path, "rb") as fh:
+            fh.seek(max(offset - 1, 0))
+            fh.readline()
+            return min(max(fh.tell(), self.start), self.stop)
+
+    def chunks(self):
+        """Finite float64 values in file order, one bounded chunk at a time.
+
+        Yields (values, skipped) with skipped the count of missing or
+        non-numeric entries in that chunk.
+        """
+        if self.kind == ".npy":
+            array = np.load(self.path, mmap_mode="r")
+            for start in range(self.start, self.stop, CHUNK_ROWS):
+                stop = min(start + CHUNK_ROWS, self.stop)
+                values = array[start:stop] if array.ndim == 1 else array[start:stop, self.index]
+                yield _finite(np.asarray(values, dtype=float))
+        else:
+            for block in self._csv_blocks():
+                yield _finite(self._parse(block))
+
+    def _csv_blocks(self):
+        with open(self.path, "rb") as fh:
+            fh.seek(self.start)
+            remaining = self.stop - self.start
+            carry = b""
+            while remaining > 0:
+                data = fh.read(min(CSV_BLOCK_BYTES, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                data = carry + data
+                # Hand over whole lines only; the tail waits for the next read
+                cut = data.rfind(b"\n") + 1 if remaining > 0 else len(data)
+                carry = data[cut:]
+                if data[:cut].strip():
+                    yield data[:cut]
+            if carry.strip():
+                yield carry
+
+    def _parse(self, block):
+        import pandas as pd
+
+        frame = pd.read_csv(io.BytesIO(block), header=None, usecols=[self.index], skip_blank_lines=True)
+        return pd.to_numeric(frame.iloc[:, 0], errors="coerce").to_numpy(dtype=float)
+
+
+def _finite(values):
+    finite = np.isfinite(values)
+    if finite.all():
+        return values, 0
+    return values[finite], int(values.size - np.count_nonzero(finite))
+
+
+class SampleSource:
+    """total draws from a registry distribution, read like a ColumnSource.
+
+    The draws are fixed at construction, so every pass over the source and
+    every split of it sees the same values. With streams=False they are the
+    draws of np.random.default_rng(seed), the stream the app displays and
+    exports, read as one part. With streams=True they come in blocks of
+    SAMPLE_BLOCK, each from its own stream spawned from seed, so the source
+    splits across workers but holds different values for the same seed.
+    """
+
+    def __init__(self, dist_name, params, total, seed=None, streams=False, blocks=None):
+        self.dist_name = dist_name
+        self.params = params
+        if blocks is None:
+            total = int(total)
+            if total < 1:
+                raise ValueError("A sample source needs at least one draw")
+            if seed is None:
+                seed = np.random.SeedSequence()
+            if streams:
+                seed_seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+                n_blocks = -(-total // SAMPLE_BLOCK)
+                blocks = list(zip(split_sizes(total, n_blocks), seed_seq.spawn(n_blocks)))
+            else:
+                blocks = [(total, seed)]
+        self.blocks = blocks
+
+    def __repr__(self):
+        return f"SampleSource({self.dist_name!r}, {self.params!r}, total={self.total})"
+
+    @property
+    def total(self):
+        return sum(size for size, _ in self.blocks)
+
+    @property
+    def nbytes(self):
+        return self.total * 8
+
+    def split(self, parts):
+        groups = np.array_split(np.arange(len(self.blocks)), max(1, min(int(parts), len(self.blocks))))
+        return [SampleSource(self.dist_name, self.params, None, blocks=[self.blocks[i] for i in group])
+                for group in groups if group.size]
+
+    def chunks(self):
+        from distributions import dist_registry
+
+        dist_obj = dist_registry[self.dist_name]
+        for size, seed in self.blocks:
+            for chunk in stream_samples(dist_obj, self.params, size, rng=np.random.default_rng(seed)):
+                yield np.asarray(chunk, dtype=float), 0
+
+
+def plan_parts(source, workers=None, executor=None):
+    """(parts, inline): one part to read in-process for small sources, else several per worker."""
+    workers = workers or os.cpu_count() or 1
+    inline = executor is None and (workers == 1 or source.nbytes < INLINE_BYTES)
+    n_parts = 1 if inline else max(1, min(workers * PARTS_PER_WORKER, source.nbytes // MIN_PART_BYTES))
+    return source.split(n_parts), inline
+
+
+def run_jobs(jobs, executor=None, workers=None, progress=None, inline=False):
+    """Results of (function, args) jobs in job order, run in-process or on a pool.
+
+    progress(done, total) is called as jobs finish. Pass an existing
+    executor to reuse warm workers; otherwise one is started and shut down.
+    """
+    results = [None] * len(jobs)
+    if inline:
+        for i, (function, args) in enumerate(jobs):
+            results[i] = function(*args)
+            if progress:
+                progress(i + 1, len(jobs))
+        return results
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+    futures = {}
+    try:
+        for i, (function, args) in enumerate(jobs):
+            futures[executor.submit(function, *args)] = i
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[futures[future]] = future.result()
+            if progress:
+                progress(len(jobs) - len(pending), len(jobs))
+    finally:
+        # Also reached when Streamlit interrupts the script on a rerun
+        for future in futures:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+    return results
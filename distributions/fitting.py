@@ -0,0 +1,590 @@
+"""Maximum-likelihood fits of every applicable registry family to a data column.
+
+Usage: python -m distributions.fitting data.csv [--column x] [--workers N] [--criterion AIC]
+
+One parallel pass over the column's parts (see distributions.datasets)
+gathers mergeable sufficient statistics: moments of x and log x, the sum
+of log(1 - x), the sum of log x! and, for small counts, a table of
+value counts. Those give the MLE of Normal, Log-Normal, Exponential,
+Gamma, Chi-square, Beta, Uniform, Poisson, Binomial and Bernoulli
+without touching the data again. t and F have no sufficient statistics;
+they are fitted by Newton's method on log-parameters, each step one
+parallel pass that evaluates the log-likelihood on a small stencil.
+
+Data that are all non-negative integers are fitted with the discrete
+families, other data with the continuous ones. Integer data spread over
+many units (or with negative values) get the continuous families too: at
+unit spacing a density is then close to the probability of its rounding
+bin, so the likelihoods stay comparable with the pmfs.
+Binomial takes n as the largest observed count. Workers only read their
+own slice, chunk by chunk; no process ever holds the whole column.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+from scipy import special as sc
+
+from .datasets import ColumnSource, plan_parts
+from .streaming import RunningStats, StreamingHistogram
+
+# Largest count for which a table of value counts (needed by Binomial) is kept
+COUNT_TABLE_MAX = 1 << 16
+# Upper limit of the profile-likelihood search for Binomial's n
+BINOMIAL_MAX_TRIALS = 1 << 20
+HISTOGRAM_BINS = 100
+MAX_INTEGER_BINS = 400
+# Integer data with at least this standard deviation are also fitted with the continuous families
+WIDE_INTEGER_STD = 10.0
+
+# Newton on log-parameters for the families without sufficient statistics
+STENCIL_STEP = 1e-4
+NEWTON_TOL = 1e-6
+# Stop once a pass gains less log-likelihood than this; far below any AIC difference that matters
+LOGLIK_TOL = 1e-3
+MAX_NEWTON_PASSES = 20
+# Halvings of a step that lowered the likelihood before settling for the best point so far
+MAX_BACKTRACKS = 3
+MAX_LOG_STEP = 1.0
+CRITERIA = ["AIC", "BIC", "Log-Likelihood"]
+
+
+class FitStatistics:
+    """Mergeable sufficient statistics of a data column, gathered in one pass."""
+
+    def __init__(self):
+        self.raw = RunningStats()
+        # Over the positive values only; used when every value is positive
+        self.log = RunningStats()
+        # Over values in (0, 1) only; used when every value is
+        self.sum_log1m = 0.0
+        self.integer = True
+        self.sum_log_factorial = 0.0
+        self.counts = np.zeros(0, dtype=np.int64)
+        self.skipped = 0
+
+    def update(self, values, skipped=0):
+        values = np.asarray(values, dtype=float)
+        self.skipped += skipped
+        if values.size == 0:
+            return self
+        self.raw.update(values)
+        positive = values[values > 0]
+        with np.errstate(divide="ignore"):
+            self.log.update(np.log(positive))
+            self.sum_log1m += float(np.sum(np.log1p(-positive[positive < 1])))
+        if self.integer:
+            self.integer = bool(np.all(values == np.floor(values)))
+        if self.integer and self.raw.min >= 0:
+            self.sum_log_factorial += float(np.sum(sc.gammaln(values + 1)))
+            if self.raw.max <= COUNT_TABLE_MAX:
+                self.counts = _add_counts(self.counts, np.bincount(values.astype(np.int64)))
+        return self
+
+    def merge(self, other):
+        self.raw.merge(other.raw)
+        self.log.merge(other.log)
+        self.sum_log1m += other.sum_log1m
+        self.integer = self.integer and other.integer
+        self.sum_log_factorial += other.sum_log_factorial
+        self.counts = _add_counts(self.counts, other.counts)
+        self.skipped += other.skipped
+        return self
+
+    @property
+    def has_counts(self):
+        return self.integer and self.raw.min >= 0 and self.raw.max <= COUNT_TABLE_MAX
+
+
+def _add_counts(a, b):
+    if a.size < b.size:
+        a, b = b, a
+    a = a.copy()
+    a[:b.size] += b
+    return a
+
+
+# Closed-form and Newton MLEs from FitStatistics: (params, log-likelihood), or a reason string
+
+def _fit_normal(s):
+    n, variance = s.raw.count, s.raw.variance
+    if not variance > 0:
+        return "the data have no spread"
+    return {"mean": s.raw.mean, "std": np.sqrt(variance)}, -0.5 * n * (np.log(2 * np.pi * variance) + 1)
+
+
+def _fit_standard_normal(s):
+    n = s.raw.count
+    return {}, -0.5 * n * np.log(2 * np.pi) - 0.5 * (s.raw.m2 + n * s.raw.mean ** 2)
+
+
+def _fit_log_normal(s):
+    if not s.raw.min > 0:
+        return "needs positive data"
+    n, variance = s.log.count, s.log.variance
+    if not variance > 0:
+        return "the data have no spread"
+    ll = -0.5 * n * (np.log(2 * np.pi * variance) + 1) - n * s.log.mean
+    return {"mean": s.log.mean, "std": np.sqrt(variance)}, ll
+
+
+def _fit_exponential(s):
+    if s.raw.min < 0 or not s.raw.mean > 0:
+        return "needs non-negative data with a positive mean"
+    return {"scale": s.raw.mean}, -s.raw.count * (np.log(s.raw.mean) + 1)
+
+
+def _gamma_shape(gap):
+    # Minka's start and Newton iterations for log k - digamma(k) = gap
+    k = (3 - gap + np.sqrt((gap - 3) ** 2 + 24 * gap)) / (12 * gap)
+    for _ in range(50):
+        step = (np.log(k) - sc.digamma(k) - gap) / (1 / k - sc.polygamma(1, k))
+        k = max(k - step, k / 10)
+        if abs(step) < 1e-12 * k:
+            break
+    return k
+
+
+def _fit_gamma(s):
+    if not s.raw.min > 0:
+        return "needs positive data"
+    mean, mean_log, n = s.raw.mean, s.log.mean, s.raw.count
+    gap = np.log(mean) - mean_log
+    if not gap > 0:
+        return "the data have no spread"
+    k = _gamma_shape(gap)
+    scale = mean / k
+    ll = n * (-sc.gammaln(k) - k * np.log(scale) + (k - 1) * mean_log - k)
+    return {"shape": k, "scale": scale}, ll
+
+
+def _inverse_digamma(y):
+    x = np.exp(y) + 0.5 if y >= -2.22 else -1 / (y + np.euler_gamma)
+    for _ in range(50):
+        step = (sc.digamma(x) - y) / sc.polygamma(1, x)
+        x = max(x - step, x / 10)
+        if abs(step) < 1e-12 * x:
+            break
+    return x
+
+
+def _fit_chi_square(s):
+    if not s.raw.min > 0:
+        return "needs positive data"
+    mean_log, n = s.log.mean, s.raw.count
+    half = _inverse_digamma(mean_log - np.log(2))
+    ll = n * (-half * np.log(2) - sc.gammaln(half) + (half - 1) * mean_log - s.raw.mean / 2)
+    return {"df": 2 * half}, ll
+
+
+def _fit_beta(s):
+    if not (s.raw.min > 0 and s.raw.max < 1):
+        return "needs data strictly between 0 and 1"
+    n, mean, variance = s.raw.count, s.raw.mean, s.raw.variance
+    l1, l2 = s.log.mean, s.sum_log1m / n
+    if not variance > 0:
+        return "the data have no spread"
+    common = mean * (1 - mean) / variance - 1
+    a, b = (mean * common, (1 - mean) * common) if common > 0 else (1.0, 1.0)
+    # Newton on digamma(a) - digamma(a + b) = mean log x, digamma(b) - digamma(a + b) = mean log(1 - x)
+    for _ in range(100):
+        g = np.array([sc.digamma(a) - sc.digamma(a + b) - l1, sc.digamma(b) - sc.digamma(a + b) - l2])
+        t_ab = sc.polygamma(1, a + b)
+        jacobian = np.array([[sc.polygamma(1, a) - t_ab, -t_ab], [-t_ab, sc.polygamma(1, b) - t_ab]])
+        step = np.linalg.solve(jacobian, g)
+        # Halve steps that would leave the positive quadrant
+        while a - step[0] <= 0 or b - step[1] <= 0:
+            step = step / 2
+        a, b = a - step[0], b - step[1]
+        if np.max(np.abs(step) / np.array([a, b])) < 1e-12:
+            break
+    ll = n * ((a - 1) * l1 + (b - 1) * l2 - sc.betaln(a, b))
+    return {"a": a, "b": b}, ll
+
+
+def _fit_uniform(s):
+    low, high = s.raw.min, s.raw.max
+    if not high > low:
+        return "the data have no spread"
+    return {"low": low, "high": high}, -s.raw.count * np.log(high - low)
+
+
+def _fit_poisson(s):
+    if not s.raw.mean > 0:
+        return "needs a positive mean"
+    n, mu = s.raw.count, s.raw.mean
+    return {"mu": mu}, n * mu * np.log(mu) - n * mu - s.sum_log_factorial
+
+
+def _binomial_loglik(s, trials):
+    n, total = s.raw.count, s.raw.mean * s.raw.count
+    p = s.raw.mean / trials
+    k = np.arange(s.counts.size)
+    log_choose = sc.gammaln(trials + 1) - sc.gammaln(k + 1) - sc.gammaln(trials - k + 1)
+    return float(np.dot(s.counts, log_choose)) + sc.xlogy(total, p) + sc.xlog1py(n * trials - total, -p)
+
+
+def _fit_binomial(s):
+    if not s.has_counts:
+        return f"needs non-negative counts up to {COUNT_TABLE_MAX}"
+    if not s.raw.max >= 1:
+        return "needs a positive count"
+    if not s.raw.variance < s.raw.mean:
+        return "the data are not underdispersed (variance >= mean)"
+    # Profile likelihood over n, from the largest count up; it is unimodal, so stop at the first drop
+    trials = int(s.raw.max)
+    best = _binomial_loglik(s, trials)
+    while trials < BINOMIAL_MAX_TRIALS:
+        ll = _binomial_loglik(s, trials + 1)
+        if ll <= best:
+            break
+        trials, best = trials + 1, ll
+    return {"n": trials, "p": s.raw.mean / trials}, best
+
+
+def _fit_bernoulli(s):
+    if s.raw.max > 1:
+        return "needs 0/1 data"
+    n, p = s.raw.count, s.raw.mean
+    return {"p": p}, sc.xlogy(n * p, p) + sc.xlog1py(n * (1 - p), -p)
+
+
+SUFFICIENT_FITS = {
+    "Normal": _fit_normal,
+    "Standard Normal": _fit_standard_normal,
+    "Log-Normal": _fit_log_normal,
+    "Exponential": _fit_exponential,
+    "Gamma": _fit_gamma,
+    "Chi-square": _fit_chi_square,
+    "Beta": _fit_beta,
+    "Uniform": _fit_uniform,
+    "Poisson": _fit_poisson,
+    "Binomial": _fit_binomial,
+    "Bernoulli": _fit_bernoulli,
+}
+
+
+def _t_start(s):
+    # Method of moments on the kurtosis, 3 + 6 / (df - 4)
+    excess = s.raw.kurtosis - 3
+    return {"df": 4 + 6 / excess if excess > 0.01 else 30.0}
+
+
+def _f_start(s):
+    mean, variance = s.raw.mean, s.raw.variance
+    if not s.raw.min > 0:
+        return "needs positive data"
+    dfd = 2 * mean / (mean - 1) if mean > 1 else 10.0
+    spread = variance * (dfd - 2) ** 2 * (dfd - 4) / (2 * dfd ** 2) if dfd > 4 else 0.0
+    dfn = (dfd - 2) / (spread - 1) if spread > 1 else 5.0
+    return {"dfn": float(np.clip(dfn, 0.1, 1e4)), "dfd": float(np.clip(dfd, 0.1, 1e4))}
+
+
+# Families fitted numerically: starting point from the statistics, and log-parameter bounds
+NEWTON_FITS = {
+    "t-distribution": (_t_start, (np.log(1e-2), np.log(1e4))),
+    "F-distribution": (_f_start, (np.log(1e-2), np.log(1e4))),
+}
+CONTINUOUS_FAMILIES = ["Normal", "Standard Normal", "t-distribution", "Uniform", "Exponential", "Gamma",
+                       "Chi-square", "Log-Normal", "Beta", "F-distribution"]
+DISCRETE_FAMILIES = ["Poisson", "Binomial", "Bernoulli"]
+
+
+class StencilNewton:
+    """Newton's method on log-parameters with finite-difference derivatives.
+
+    candidates() lists the parameter points whose log-likelihoods the next
+    data pass must return to update(); that is 3 points for one parameter
+    and 6 for two. A step that lowers the likelihood is halved, at most
+    MAX_BACKTRACKS times in a row.
+    """
+
+    def __init__(self, start, bounds, step=STENCIL_STEP):
+        self.names = list(start)
+        self.theta = np.log(np.array([start[name] for name in self.names], dtype=float))
+        self.bounds = bounds
+        self.h = step
+        self.best = None
+        self.passes = 0
+        self.backtracks = 0
+        self.done = False
+
+    def _offsets(self):
+        d = self.theta.size
+        eye = np.eye(d) * self.h
+        offsets = [np.zeros(d)] + [sign * eye[i] for i in range(d) for sign in (1, -1)]
+        if d == 2:
+            offsets.append(eye[0] + eye[1])
+        return offsets
+
+    def _params(self, theta):
+        return dict(zip(self.names, np.exp(theta).tolist()))
+
+    def candidates(self):
+        return [self._params(self.theta + offset) for offset in self._offsets()]
+
+    def update(self, values):
+        self.passes += 1
+        values = np.asarray(values, dtype=float)
+        f0 = values[0]
+        if self.best is not None and not f0 >= self.best[1]:
+            # Backtrack halfway to the best point so far
+            self.backtracks += 1
+            self.theta = 0.5 * (self.theta + self.best[0])
+            self.done = (self.passes >= MAX_NEWTON_PASSES or self.backtracks > MAX_BACKTRACKS
+                         or np.max(np.abs(self.theta - self.best[0])) < NEWTON_TOL)
+            if self.done:
+                self.theta = self.best[0]
+            return
+        self.backtracks = 0
+        gained = np.inf if self.best is None else f0 - self.best[1]
+        self.best = (self.theta.copy(), f0)
+        if gained < LOGLIK_TOL:
+            self.done = True
+            return
+
+        d, h = self.theta.size, self.h
+        plus, minus = values[1:2 * d + 1:2], values[2:2 * d + 1:2]
+        gradient = (plus - minus) / (2 * h)
+        hessian = np.diag((plus - 2 * f0 + minus) / h ** 2)
+        if d == 2:
+            hessian[0, 1] = hessian[1, 0] = (values[5] - plus[0] - plus[1] + f0) / h ** 2
+        if np.all(np.linalg.eigvalsh(hessian) < 0):
+            step = -np.linalg.solve(hessian, gradient)
+        else:
+            # Not locally concave: climb the gradient instead
+            step = gradient / (np.max(np.abs(gradient)) or 1.0)
+        step *= min(1.0, MAX_LOG_STEP / (np.max(np.abs(step)) or 1.0))
+        theta = np.clip(self.theta + step, *self.bounds)
+        moved = np.max(np.abs(theta - self.theta))
+        self.theta = theta
+        self.done = moved < NEWTON_TOL or self.passes >= MAX_NEWTON_PASSES
+        if self.done:
+            self.theta = self.best[0]
+
+    def result(self):
+        return self._params(self.best[0]), float(self.best[1])
+
+
+def _scan_part(part, tasks):
+    """One pass over a slice: statistics, histogram counts and/or log-likelihood sums."""
+    from distributions import dist_registry
+
+    stats = FitStatistics() if tasks.get("stats") else None
+    hist = StreamingHistogram(*tasks["histogram"]) if tasks.get("histogram") else None
+    loglik = {name: np.zeros(len(candidates)) for name, candidates in tasks.get("loglik", {}).items()}
+    for values, skipped in part.chunks():
+        if stats is not None:
+            stats.update(values, skipped)
+        if hist is not None:
+            hist.update(values)
+        for name, candidates in tasks.get("loglik", {}).items():
+            dist_obj = dist_registry[name]
+            with np.errstate(all="ignore"):
+                for j, params in enumerate(candidates):
+                    loglik[name][j] += np.sum(dist_obj.logpdf(values, params))
+    return {"stats": stats, "histogram": hist, "loglik": loglik}
+
+
+def _scan(parts, tasks, executor, progress, label):
+    results = [None] * len(parts)
+    if executor is None:
+        for i, part in enumerate(parts):
+            results[i] = _scan_part(part, tasks)
+            if progress:
+                progress(label, i + 1, len(parts))
+    else:
+        futures = {executor.submit(_scan_part, part, tasks): i for i, part in enumerate(parts)}
+        try:
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[futures[future]] = future.result()
+                if progress:
+                    progress(label, len(parts) - len(pending), len(parts))
+        finally:
+            # Also reached when Streamlit interrupts the script on a rerun
+            for future in futures:
+                future.cancel()
+
+    merged = {"stats": None, "histogram": None, "loglik": {}}
+    for result in results:
+        for key in ("stats", "histogram"):
+            if result[key] is not None:
+                merged[key] = result[key] if merged[key] is None else merged[key].merge(result[key])
+        for name, sums in result["loglik"].items():
+            merged["loglik"][name] = merged["loglik"].get(name, 0.0) + sums
+    return merged
+
+
+def histogram_range(stats):
+    """(lo, hi, bins) for the data histogram: integer bins for small counts, else ±10 sd within the data."""
+    raw = stats.raw
+    if stats.integer and raw.max - raw.min < MAX_INTEGER_BINS:
+        return raw.min - 0.5, raw.max + 0.5, int(raw.max - raw.min) + 1
+    lo, hi = max(raw.min, raw.mean - 10 * raw.std), min(raw.max, raw.mean + 10 * raw.std)
+    if not hi > lo:
+        lo, hi = lo - 0.5, hi + 0.5
+    return lo, hi, HISTOGRAM_BINS
+
+
+def rank_fits(fits, criterion="AIC"):
+    if criterion not in CRITERIA:
+        raise ValueError(f"Unknown criterion '{criterion}'. Choose from: {', '.join(CRITERIA)}")
+    key = "log_likelihood" if criterion == "Log-Likelihood" else criterion.lower()
+    sign = -1 if criterion == "Log-Likelihood" else 1
+    return sorted(fits, key=lambda fit: sign * fit[key])
+
+
+def candidate_families(stats, continuous=None):
+    """Names of the families applicable to data with these statistics, and {name: reason} for the rest.
+
+    continuous=True fits the continuous families to integer data as well,
+    False never does; None (the default) does so for negative or wide-range
+    integer data (standard deviation of at least WIDE_INTEGER_STD).
+    """
+    counts = stats.integer and stats.raw.min >= 0
+    if not stats.integer:
+        continuous = True
+    elif continuous is None:
+        continuous = not counts or stats.raw.std >= WIDE_INTEGER_STD
+    candidates = (DISCRETE_FAMILIES if counts else []) + (CONTINUOUS_FAMILIES if continuous else [])
+    reason = "discrete family, " + ("negative data" if stats.integer else "continuous data")
+    skipped = {name: reason for name in DISCRETE_FAMILIES if not counts}
+    skipped.update({name: "continuous family, integer data" for name in CONTINUOUS_FAMILIES if not continuous})
+    return candidates, skipped
+
+
+def fit_dataset(source, families=None, criterion="AIC", workers=None, executor=None, progress=None,
+                continuous=None):
+    """Fit every applicable registry family to a ColumnSource by maximum likelihood.
+
+    continuous chooses whether integer data also get the continuous
+    families (see candidate_families). Returns {"fits": [{"dist_name", "params", "log_likelihood", "aic", "bic", "n_params",
+    "method"}, ...] ranked by criterion, "not_fitted": {dist_name: reason}, "stats":
+    FitStatistics, "histogram": StreamingHistogram, "rows", "passes", "seconds"}.
+    progress(label, done, total) is called as slices finish. Pass an existing
+    executor to reuse warm workers.
+    """
+    from distributions import dist_registry
+
+    start_time = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    parts, inline = plan_parts(source, workers, executor)
+
+    own_executor = executor is None and not inline
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        stats = _scan(parts, {"stats": True}, executor, progress, "Sufficient statistics")["stats"]
+        if stats is None or stats.raw.count == 0:
+            raise ValueError("The column holds no numeric values")
+        passes = 1
+
+        candidates, skipped = candidate_families(stats, continuous)
+        families = [name for name in (families or list(dist_registry)) if name in dist_registry]
+        not_fitted = {name: skipped[name] for name in families if name in skipped}
+        fitted = {}
+        for name in families:
+            if name in SUFFICIENT_FITS and name in candidates:
+                result = SUFFICIENT_FITS[name](stats)
+                if isinstance(result, str):
+                    not_fitted[name] = result
+                else:
+                    fitted[name] = result + ("sufficient statistics",)
+
+        searches = {}
+        for name in families:
+            if name in NEWTON_FITS and name in candidates:
+                start_fn, bounds = NEWTON_FITS[name]
+                start = start_fn(stats)
+                if isinstance(start, str):
+                    not_fitted[name] = start
+                else:
+                    searches[name] = StencilNewton(start, bounds)
+
+        # The histogram rides along with the first Newton pass (or gets a pass of its own)
+        tasks = {"histogram": histogram_range(stats)}
+        histogram = None
+        while tasks:
+            active = {name: search for name, search in searches.items() if not search.done}
+            if active:
+                tasks["loglik"] = {name: search.candidates() for name, search in active.items()}
+            label = "Data histogram" if not active else f"Newton step {max(s.passes for s in active.values()) + 1}"
+            merged = _scan(parts, tasks, executor, progress, label)
+            passes += 1
+            histogram = histogram or merged["histogram"]
+            for name, search in active.items():
+                search.update(merged["loglik"][name])
+            tasks = {} if all(search.done for search in searches.values()) else {"loglik": {}}
+        for name, search in searches.items():
+            fitted[name] = search.result() + ("Newton on log-likelihood passes",)
+    finally:
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    n = stats.raw.count
+    fits = []
+    for name, (params, ll, method) in fitted.items():
+        dist_obj = dist_registry[name]
+        params = {**dist_obj.fixed_params, **{key: float(value) for key, value in params.items()}}
+        if "n" in params:
+            params["n"] = int(params["n"])
+        try:
+            dist_obj.validate_params(params)
+        except ValueError as e:
+            not_fitted[name] = str(e)
+            continue
+        k = len(dist_obj.param_specs)
+        ll = float(ll)
+        fits.append({"dist_name": name, "params": params, "log_likelihood": ll,
+                     "aic": 2 * k - 2 * ll, "bic": k * np.log(n) - 2 * ll, "n_params": k, "method": method})
+    return {
+        "fits": rank_fits(fits, criterion),
+        "not_fitted": not_fitted,
+        "stats": stats,
+        "histogram": histogram,
+        "rows": n,
+        "passes": passes,
+        "seconds": time.perf_counter() - start_time,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="CSV (with a header row) or NPY file")
+    column = parser.add_mutually_exclusive_group()
+    column.add_argument("--column", help="Column name: a CSV header, or an NPY column number")
+    column.add_argument("--index", type=int, help="0-based column position (default: the first)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--criterion", choices=CRITERIA, default="AIC")
+    parser.add_argument("--continuous", action=argparse.BooleanOptionalAction, default=None,
+                        help="Also fit the continuous families to integer data (default: when they are "
+                             "negative or spread over many units)")
+    args = parser.parse_args(argv)
+
+    try:
+        source = ColumnSource(args.path, column=args.column, index=args.index)
+        report = fit_dataset(source, criterion=args.criterion, workers=args.workers, continuous=args.continuous,
+                             progress=lambda label, done, total: print(f"{label}: {done}/{total}", file=sys.stderr))
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    print(json.dumps({
+        "rows": report["rows"],
+        "skipped": report["stats"].skipped,
+        "passes": report["passes"],
+        "seconds": report["seconds"],
+        "fits": report["fits"],
+        "not_fitted": report["not_fitted"],
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,40 +1,44 @@
 from .base import BaseDistribution
+from . import closed_form
+from .grid import adaptive_grid
 from scipy.stats import gamma
 import numpy as np
-import streamlit as st
 
 class GammaDistribution(BaseDistribution):
-    def get_params(self, st):
-        col_a, col_b = st.columns(2)
-        with col_a:
-            shape = st.slider("Shape (k)", 0.1, 10.0, 2.0, step=0.1, help="Shape parameter")
-        with col_b:
-            scale = st.slider("Scale (θ)", 0.1, 5.0, 2.0, step=0.1, help="Scale parameter")
-        return {"shape": shape, "scale": scale}
+    closed_form = closed_form.Gamma
+
+    param_specs = {
+        "shape": {"label": "Shape (k)", "min": 0.1, "max": 10.0, "default": 2.0, "step": 0.1, "help": "Shape parameter"},
+        "scale": {"label": "Scale (θ)", "min": 0.1, "max": 5.0, "default": 2.0, "step": 0.1, "help": "Scale parameter"}
+    }
+    param_domains = {"shape": "positive", "scale": "positive"}
+
+    def pdf(self, x, params):
+        return gamma.pdf(x, params["shape"], scale=params["scale"])
+
+    def cdf(self, x, params):
+        return gamma.cdf(x, params["shape"], scale=params["scale"])
+
+    def ppf(self, q, params):
+        return gamma.ppf(q, params["shape"], scale=params["scale"])
 
     def generate_data(self, params, x_range=None):
         if x_range is None:
-            x = np.linspace(0, 20, 500)
+            x = adaptive_grid(self, params)
         else:
             x = x_range
-        y_pdf = gamma.pdf(x, params["shape"], scale=params["scale"])
-        y_cdf = gamma.cdf(x, params["shape"], scale=params["scale"])
+        y_pdf = self.pdf(x, params)
+        y_cdf = self.cdf(x, params)
         return x, y_pdf, y_cdf, "PDF"
 
-    def calculate_stats(self, params):
-        return {
-            "Mean": params["shape"] * params["scale"],
-            "Variance": params["shape"] * params["scale"]**2,
-            "Standard Deviation": np.sqrt(params["shape"]) * params["scale"],
-            "Skewness": 2 / np.sqrt(params["shape"]),
-            "Kurtosis": 6 / params["shape"] + 3
-        }
-
     def get_info(self):
         return "Used for modeling waiting times and continuous positive data. Interpretation: Generalizes exponential; shape and scale control form.\n\n**Parameter Effects:**\n- Shape (k): Larger values reduce skewness and make it more symmetric (approaches normal).\n- Scale (θ): Stretches the distribution horizontally; increases mean and variance."
 
-    def generate_samples(self, params, size):
-        return np.random.gamma(params["shape"], params["scale"], size)
+    def generate_samples(self, params, size, rng=None):
+        return np.random.default_rng(rng).gamma(params["shape"], params["scale"], size)
+
+    def scipy_args(self, params):
+        return gamma, {"a": params["shape"], "scale": params["scale"]}
 
     def get_quantile_dist(self, params):
         return gamma(a=params["shape"], scale=params["scale"])
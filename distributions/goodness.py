@@ -0,0 +1,434 @@
+"""Goodness-of-fit tests of data or draws against registry distributions, at any size.
+
+Usage:
+    python -m distributions.goodness data.csv --column x --dist Normal '{"mean": 0, "std": 1}' [--dist ...]
+    python -m distributions.goodness --sample Gamma '{"shape": 2, "scale": 2}' --size 1e8 \\
+        --dist Gamma '{"shape": 2, "scale": 2}' --mode "Sorted Runs"
+
+For a continuous candidate each chunk of data is mapped through its cdf,
+u = F(x), and the Kolmogorov-Smirnov, Anderson-Darling and Cramér-von
+Mises statistics are computed from the ordered u. Two modes:
+
+- Chunked: u is counted into FINE_BINS equal bins on [0, 1]. Parts of
+  the data run in parallel and memory is one count array per worker.
+  KS is exact to within 1 / FINE_BINS; AD and CvM integrate the ECDF
+  interpolated within bins, which is accurate to well under 1% of the
+  statistic once there are many points per bin.
+- Sorted Runs: u is sorted in runs of RUN_VALUES written to a temporary
+  directory, then merged block by block. Exact, using disk rather than
+  RAM for the full data.
+
+Chi-square uses equiprobable bins under the candidate, about 2 n^0.4 of
+them (Moore's rule) with at least CHI_SQUARE_MIN_EXPECTED expected each.
+Discrete candidates are tested by value counts, exactly in either mode:
+KS (whose p-value is then conservative) and chi-square over integers
+merged until each bin expects at least CHI_SQUARE_MIN_EXPECTED.
+
+Candidates run in parallel. All p-values assume the parameters were not
+estimated from the same data; for fitted parameters they are optimistic.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+from scipy import special as sc
+from scipy import stats
+
+from .datasets import ColumnSource, SampleSource, plan_parts, run_jobs
+from .grid import discrete_window
+
+MODES = ["Chunked", "Sorted Runs"]
+TESTS = ["Kolmogorov-Smirnov", "Anderson-Darling", "Cramér-von Mises", "Chi-square"]
+FINE_BINS = 1 << 20
+# Values per sorted run on disk, and values held from all runs at once while merging
+RUN_VALUES = 1 << 23
+MERGE_VALUES = 1 << 22
+MIN_MERGE_BLOCK = 1 << 12
+# Bins processed at a time when integrating over the fine histogram
+BIN_SLICE = 1 << 16
+GAUSS_NODES = 4
+CHI_SQUARE_MIN_EXPECTED = 5
+MAX_DISCRETE_SUPPORT = 1 << 20
+# Below this AD tail probability the finite-n correction is dropped
+AD_CORRECTION_FLOOR = 1e-3
+# Above this W^2 (p below 1e-7) the CvM series cancels badly and the tail approximation takes over
+CVM_SERIES_MAX = 3.0
+
+
+def _candidate_spec(dist_obj, params):
+    dist_obj.validate_params(params)
+    if dist_obj.dist_type != "PMF":
+        return None
+    lo, hi = discrete_window(dist_obj, params)
+    lo, hi = int(np.ceil(lo)), int(np.floor(hi))
+    if hi - lo + 1 > MAX_DISCRETE_SUPPORT:
+        raise ValueError(f"support of {hi - lo + 1:,} values is too wide to count")
+    return lo, hi
+
+
+def _write_run(run_dir, buffer):
+    u = np.sort(np.concatenate(buffer))
+    path = os.path.join(run_dir, f"run_{len(os.listdir(run_dir))}.npy")
+    np.save(path, u)
+    return path
+
+
+def _scan_part(part, dist_name, params, window, run_dir=None):
+    """Accumulators for one part of the data against one candidate, merged by run_tests."""
+    from distributions import dist_registry
+
+    start = time.perf_counter()
+    dist_obj = dist_registry[dist_name]
+    acc = {"skipped": 0, "runs": [], "below": 0, "above": 0}
+    if window is None:
+        acc["counts"] = np.zeros(FINE_BINS, dtype=np.int64)
+    else:
+        acc["counts"] = np.zeros(window[1] - window[0] + 1, dtype=np.int64)
+    buffer, buffered = [], 0
+    for values, skipped in part.chunks():
+        acc["skipped"] += skipped
+        if window is not None:
+            # F_n at an integer k counts x <= k, which is exactly floor(x) <= k
+            k = np.floor(values)
+            acc["below"] += int(np.count_nonzero(k < window[0]))
+            acc["above"] += int(np.count_nonzero(k > window[1]))
+            inside = k[(k >= window[0]) & (k <= window[1])].astype(np.int64) - window[0]
+            acc["counts"] += np.bincount(inside, minlength=acc["counts"].size)
+            continue
+        with np.errstate(all="ignore"):
+            u = np.clip(np.asarray(dist_obj.cdf(values, params), dtype=float), 0.0, 1.0)
+        index = np.minimum((u * FINE_BINS).astype(np.int64), FINE_BINS - 1)
+        acc["counts"] += np.bincount(index, minlength=FINE_BINS)
+        if run_dir is not None:
+            buffer.append(u)
+            buffered += u.size
+            if buffered >= RUN_VALUES:
+                acc["runs"].append(_write_run(run_dir, buffer))
+                buffer, buffered = [], 0
+    if buffer:
+        acc["runs"].append(_write_run(run_dir, buffer))
+    acc["seconds"] = time.perf_counter() - start
+    return acc
+
+
+def _merge_acc(accs):
+    merged = accs[0]
+    for acc in accs[1:]:
+        merged["counts"] += acc["counts"]
+        for key in ("skipped", "below", "above", "seconds"):
+            merged[key] += acc[key]
+        merged["runs"] += acc["runs"]
+    return merged
+
+
+def _merge_runs(paths, n):
+    """Exact EDF sums over the sorted runs, merged block by block: (D, W^2, A^2)."""
+    runs = [np.load(path, mmap_mode="r") for path in paths]
+    position = [0] * len(runs)
+    block = max(MIN_MERGE_BLOCK, MERGE_VALUES // max(len(runs), 1))
+    offset = 0
+    d, cvm_sum, ad_sum = 0.0, 0.0, 0.0
+    while True:
+        live = [i for i, run in enumerate(runs) if position[i] < run.size]
+        if not live:
+            break
+        heads = {i: np.asarray(runs[i][position[i]:position[i] + block]) for i in live}
+        # Values up to the smallest block end that isn't a run's last value can't be undercut by any run
+        ends = [heads[i][-1] for i in live if position[i] + block < runs[i].size]
+        bound = min(ends) if ends else np.inf
+        taken = []
+        for i in live:
+            m = int(np.searchsorted(heads[i], bound, side="right"))
+            taken.append(heads[i][:m])
+            position[i] += m
+        u = np.sort(np.concatenate(taken))
+        rank = offset + 1.0 + np.arange(u.size)
+        d = max(d, float(np.max(rank / n - u)), float(np.max(u - (rank - 1) / n)))
+        cvm_sum += float(np.sum((u - (2 * rank - 1) / (2 * n)) ** 2))
+        with np.errstate(divide="ignore"):
+            ad_sum += float(np.sum((2 * rank - 1) * np.log(u) + (2 * n + 1 - 2 * rank) * np.log1p(-u)))
+        offset += u.size
+    return d, 1 / (12 * n) + cvm_sum, -n - ad_sum / n
+
+
+def _binned_edf(counts, n):
+    """(D, W^2, A^2) from u counted into equal bins, the ECDF taken as linear within each bin."""
+    bins = counts.size
+    cumulative = np.cumsum(counts)
+    d = float(np.max(np.abs(cumulative / n - np.arange(1, bins + 1) / bins)))
+    nodes, weights = np.polynomial.legendre.leggauss(GAUSS_NODES)
+    fraction, weights = (nodes + 1) / 2, weights / (2 * bins)
+    cvm, ad = 0.0, 0.0
+    for lo in range(0, bins, BIN_SLICE):
+        j = np.arange(lo, min(lo + BIN_SLICE, bins))
+        start = (cumulative[j] - counts[j]) / n
+        t = (j[:, None] + fraction) / bins
+        gap2 = (start[:, None] + counts[j, None] / n * fraction - t) ** 2
+        cvm += float(np.sum(weights * gap2))
+        ad += float(np.sum(weights * gap2 / (t * (1 - t))))
+    return d, n * cvm, n * ad
+
+
+def _chi_square_bins(n):
+    """Equiprobable bin count: a power of two near Moore's 2 n^0.4, each expecting enough points."""
+    bins = 2 ** int(np.round(np.log2(2 * n ** 0.4)))
+    most = 2 ** int(np.floor(np.log2(max(n / CHI_SQUARE_MIN_EXPECTED, 1))))
+    return min(bins, most, FINE_BINS)
+
+
+def _ad_pvalue(a2, n):
+    # Marsaglia & Marsaglia (2004): asymptotic cdf adinf plus their finite-n correction
+    z = a2
+    if z <= 0:
+        return 1.0
+    if z < 2:
+        x = np.exp(-1.2337141 / z) / np.sqrt(z) * (2.00012 + (.247105 - (.0649821 - (.0347962 - (.011672 - .00168691 * z) * z) * z) * z) * z)
+        tail = 1 - x
+    else:
+        # Taken as the tail directly so that small p-values keep their precision
+        tail = -np.expm1(-np.exp(1.0776 - (2.30695 - (.43424 - (.082433 - (.008056 - .0003146 * z) * z) * z) * z) * z))
+        x = 1 - tail
+    if tail < AD_CORRECTION_FLOOR:
+        # The correction is O(1e-4 / n) in absolute terms; beyond here it is noise on the tail
+        return float(tail)
+    c = .01265 + .1757 / n
+    if x > .8:
+        fix = (-130.2137 + (745.2337 - (1705.091 - (1950.646 - (1116.360 - 255.7844 * x) * x) * x) * x) * x) / n
+    elif x < c:
+        t = x / c
+        t = np.sqrt(t) * (1 - t) * (49 * t - 102)
+        fix = t * (.0037 / n ** 2 + .00078 / n + .00006) / n
+    else:
+        t = (x - c) / (.8 - c)
+        t = -.00022633 + (6.54034 - (14.6538 - (14.458 - (8.259 - 1.91864 * t) * t) * t) * t) * t
+        fix = t * (.04213 / n + .01365 / n ** 2)
+    return float(np.clip(tail - fix, 0.0, 1.0))
+
+
+def _cvm_pvalue(w2):
+    if w2 <= 0:
+        return 1.0
+    if w2 >= CVM_SERIES_MAX:
+        # Far tail: the largest eigenvalue, 1 / pi^2, dominates, with the others giving a factor sqrt(2)
+        return float(np.sqrt(2) * sc.erfc(np.pi * np.sqrt(w2 / 2)))
+    # Asymptotic cdf of W^2 (Anderson & Darling, 1952), summed until the terms vanish
+    total = 0.0
+    for k in range(50):
+        y = 4 * k + 1
+        q = y ** 2 / (16 * w2)
+        term = (np.exp(sc.gammaln(k + 0.5) - sc.gammaln(k + 1)) / (np.pi ** 1.5 * np.sqrt(w2))
+                * np.sqrt(y) * np.exp(-q) * sc.kv(0.25, q))
+        total += term
+        if abs(term) < 1e-12:
+            break
+    return float(np.clip(1 - total, 0.0, 1.0))
+
+
+def _result(statistic, p_value, **extra):
+    return {"statistic": float(statistic), "p_value": float(p_value), **extra}
+
+
+def _continuous_tests(counts, n, edf=None):
+    """Tests from the fine histogram of u, with exact (D, W^2, A^2) from sorted runs when given."""
+    if edf is None:
+        d, w2, a2 = _binned_edf(counts, n)
+        ks = _result(d, stats.kstwo.sf(d, n), error_bound=1 / FINE_BINS)
+    else:
+        d, w2, a2 = edf
+        ks = _result(d, stats.kstwo.sf(d, n))
+    tests = {
+        "Kolmogorov-Smirnov": ks,
+        "Anderson-Darling": _result(a2, _ad_pvalue(a2, n) if np.isfinite(a2) else 0.0),
+        "Cramér-von Mises": _result(w2, _cvm_pvalue(w2)),
+    }
+    bins = _chi_square_bins(n)
+    if bins >= 2:
+        observed = counts.reshape(bins, -1).sum(axis=1)
+        expected = n / bins
+        chi2 = float(np.sum((observed - expected) ** 2) / expected)
+        tests["Chi-square"] = _result(chi2, stats.chi2.sf(chi2, bins - 1), bins=bins)
+    return tests
+
+
+def _merge_sparse_bins(expected, observed):
+    # Adjacent bins are pooled until each expects CHI_SQUARE_MIN_EXPECTED; a short last group joins the one before
+    starts, pooled = [0], 0.0
+    for i, e in enumerate(expected):
+        pooled += e
+        if pooled >= CHI_SQUARE_MIN_EXPECTED and i + 1 < expected.size:
+            starts.append(i + 1)
+            pooled = 0.0
+    if len(starts) > 1 and pooled < CHI_SQUARE_MIN_EXPECTED:
+        starts.pop()
+    starts = np.array(starts)
+    return np.add.reduceat(expected, starts), np.add.reduceat(observed, starts)
+
+
+def _discrete_tests(dist_obj, params, window, acc, n):
+    lo, hi = window
+    k = np.arange(lo, hi + 1, dtype=float)
+    with np.errstate(all="ignore"):
+        cdf = np.asarray(dist_obj.cdf(k, params), dtype=float)
+        cdf_before = float(dist_obj.cdf(lo - 1.0, params))
+    ecdf = (acc["below"] + np.cumsum(acc["counts"])) / n
+    d = max(float(np.max(np.abs(ecdf - cdf))), abs(acc["below"] / n - cdf_before))
+    tests = {"Kolmogorov-Smirnov": _result(d, stats.kstwo.sf(d, n), note="conservative for a discrete distribution")}
+
+    # The end bins take the tails, so the expected masses add up to 1
+    mass = np.diff(np.concatenate([[0.0], cdf]))
+    mass[0] += cdf_before
+    mass[-1] += 1 - cdf[-1]
+    observed = acc["counts"].astype(float)
+    observed[0] += acc["below"]
+    observed[-1] += acc["above"]
+    expected, observed = _merge_sparse_bins(n * mass, observed)
+    if expected.size >= 2:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            terms = np.where(expected > 0, (observed - expected) ** 2 / expected, np.where(observed > 0, np.inf, 0.0))
+        chi2 = float(np.sum(terms))
+        tests["Chi-square"] = _result(chi2, stats.chi2.sf(chi2, expected.size - 1), bins=int(expected.size))
+    return tests
+
+
+def _sorted_job(source, dist_name, params, run_root):
+    # One candidate end to end: write its sorted runs, then merge them
+    run_dir = tempfile.mkdtemp(prefix="distviz_gof_", dir=run_root)
+    try:
+        acc = _scan_part(source, dist_name, params, None, run_dir)
+        start = time.perf_counter()
+        n = int(acc["counts"].sum())
+        acc["edf"] = _merge_runs(acc["runs"], n) if n else None
+        acc["seconds"] += time.perf_counter() - start
+        acc["runs"] = []
+        return acc
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+
+
+def run_tests(source, candidates, mode="Chunked", workers=None, executor=None, progress=None, run_dir=None):
+    """Test a ColumnSource or SampleSource against candidates [(dist_name, params), ...].
+
+    Returns {"results": [{"dist_name", "params", "seconds", "tests": {name: {"statistic",
+    "p_value", ...}}} or {"dist_name", "params", "error"}, ...], "n", "skipped", "mode",
+    "seconds"}. A candidate's seconds is the compute time spent on it across
+    workers; the report's seconds is wall time. run_dir is where Sorted Runs
+    mode spills its runs (default: the system temporary directory).
+    """
+    from distributions import dist_registry
+
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode '{mode}'. Choose from: {', '.join(MODES)}")
+    wall_start = time.perf_counter()
+    windows, errors = {}, {}
+    for i, (dist_name, params) in enumerate(candidates):
+        try:
+            windows[i] = _candidate_spec(dist_registry[dist_name], params)
+        except (KeyError, ValueError) as e:
+            errors[i] = str(e)
+
+    parts, inline = plan_parts(source, workers, executor)
+    jobs, owners = [], []
+    for i, (dist_name, params) in enumerate(candidates):
+        if i in errors:
+            continue
+        if mode == "Sorted Runs" and windows[i] is None:
+            jobs.append((_sorted_job, (source, dist_name, params, run_dir)))
+            owners.append(i)
+        else:
+            for part in parts:
+                jobs.append((_scan_part, (part, dist_name, params, windows[i])))
+                owners.append(i)
+    # Candidates are independent, so everything goes to the pool at once
+    results = run_jobs(jobs, executor, workers, progress, inline)
+
+    accs = {}
+    for owner, acc in zip(owners, results):
+        accs.setdefault(owner, []).append(acc)
+    n = skipped = None
+    report = []
+    for i, (dist_name, params) in enumerate(candidates):
+        if i in errors:
+            report.append({"dist_name": dist_name, "params": params, "error": errors[i]})
+            continue
+        acc = _merge_acc(accs[i])
+        n = int(acc["counts"].sum() + acc["below"] + acc["above"])
+        skipped = acc["skipped"]
+        if n == 0:
+            raise ValueError("The data hold no numeric values")
+        dist_obj = dist_registry[dist_name]
+        if windows[i] is not None:
+            tests = _discrete_tests(dist_obj, params, windows[i], acc, n)
+        else:
+            tests = _continuous_tests(acc["counts"], n, acc.get("edf"))
+        report.append({"dist_name": dist_name, "params": params, "seconds": acc["seconds"],
+                       "tests": {name: tests[name] for name in TESTS if name in tests}})
+    return {"results": report, "n": n, "skipped": skipped, "mode": mode,
+            "seconds": time.perf_counter() - wall_start}
+
+
+def results_table(report):
+    """One row per candidate and test, for display."""
+    from distributions import dist_registry
+    from .comparison import member_label
+
+    rows = []
+    for result in report["results"]:
+        label = member_label(result["dist_name"], result["params"], dist_registry.get(result["dist_name"]))
+        if "error" in result:
+            rows.append({"Distribution": label, "Test": "—", "Statistic": np.nan, "p-value": np.nan,
+                         "Note": result["error"]})
+            continue
+        for name, test in result["tests"].items():
+            notes = [test["note"]] if "note" in test else []
+            if "bins" in test:
+                notes.append(f"{test['bins']} bins")
+            if "error_bound" in test:
+                notes.append(f"± {test['error_bound']:.1e}")
+            rows.append({"Distribution": label, "Test": name, "Statistic": test["statistic"],
+                         "p-value": test["p_value"], "Note": ", ".join(notes)})
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", nargs="?", help="CSV (with a header row) or NPY file")
+    column = parser.add_mutually_exclusive_group()
+    column.add_argument("--column", help="Column name: a CSV header, or an NPY column number")
+    column.add_argument("--index", type=int, help="0-based column position (default: the first)")
+    parser.add_argument("--sample", nargs=2, metavar=("DIST", "PARAMS"), help="Test draws from a distribution instead")
+    parser.add_argument("--size", type=float, default=1e6)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--streams", action="store_true",
+                        help="Draw --sample from independent streams so the draws split across workers")
+    parser.add_argument("--dist", nargs=2, action="append", required=True, metavar=("DIST", "PARAMS"),
+                        help="Candidate distribution and its parameters as JSON; repeat for more")
+    parser.add_argument("--mode", choices=MODES, default="Chunked")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--run-dir", default=None, help="Where Sorted Runs mode writes its runs")
+    args = parser.parse_args(argv)
+    if (args.path is None) == (args.sample is None):
+        parser.error("give either a data file or --sample")
+
+    try:
+        if args.sample:
+            source = SampleSource(args.sample[0], json.loads(args.sample[1]), args.size, seed=args.seed,
+                                  streams=args.streams)
+        else:
+            source = ColumnSource(args.path, column=args.column, index=args.index)
+        candidates = [(name, json.loads(params)) for name, params in args.dist]
+        report = run_tests(source, candidates, args.mode, workers=args.workers, run_dir=args.run_dir,
+                           progress=lambda done, total: print(f"{done}/{total} jobs", file=sys.stderr))
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
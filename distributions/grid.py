@@ -0,0 +1,133 @@
+import numpy as np
+
+# Points per trace; the old fixed linspace used 500
+DEFAULT_BUDGET = 200
+# Points in the uniform seed grid before refinement
+INITIAL_POINTS = 33
+# Allowed deviation of the piecewise-linear trace from the true curve,
+# as a fraction of the curve's vertical extent
+DEFAULT_TOLERANCE = 2e-3
+# Intervals are never split below (hi - lo) / (budget * MIN_WIDTH_FACTOR),
+# which keeps refinement away from integrable singularities at the support edge
+MIN_WIDTH_FACTOR = 64
+
+
+def _finite_extent(y):
+    finite = y[np.isfinite(y)]
+    if finite.size == 0:
+        return 1.0
+    extent = finite.max() - min(finite.min(), 0.0)
+    return extent if extent > 0 else 1.0
+
+
+def refine_grid(func, lo, hi, budget=DEFAULT_BUDGET, tol=DEFAULT_TOLERANCE, initial=INITIAL_POINTS):
+    """Sample func on [lo, hi], adding points where linear interpolation is worst.
+
+    func must be vectorized. Each pass evaluates the midpoints of the newest
+    intervals in a single call, then splits the intervals whose midpoint
+    error exceeds tol (largest first) until the point budget is spent.
+    """
+    initial = max(2, min(initial, budget))
+    x = np.linspace(lo, hi, initial)
+    y = np.asarray(func(x), dtype=float)
+    scale = _finite_extent(y)
+    min_width = (hi - lo) / (budget * MIN_WIDTH_FACTOR)
+
+    mid_x = 0.5 * (x[:-1] + x[1:])
+    mid_y = np.asarray(func(mid_x), dtype=float)
+
+    while x.size < budget:
+        with np.errstate(invalid="ignore"):
+            err = np.abs(mid_y - 0.5 * (y[:-1] + y[1:])) / scale
+        err = np.where(np.isfinite(err), err, np.inf)
+        err[np.diff(x) < 2 * min_width] = 0.0
+        candidates = np.flatnonzero(err > tol)
+        if candidates.size == 0:
+            break
+        take = candidates[np.argsort(err[candidates])[::-1][:budget - x.size]]
+        take.sort()
+
+        # Split each chosen interval at its (already evaluated) midpoint
+        new_x = np.insert(x, take + 1, mid_x[take])
+        new_y = np.insert(y, take + 1, mid_y[take])
+        split = np.zeros(new_x.size - 1, dtype=bool)
+        split[take + np.arange(take.size)] = True
+        split[take + np.arange(take.size) + 1] = True
+
+        new_mid_x = 0.5 * (new_x[:-1] + new_x[1:])
+        new_mid_y = np.empty_like(new_mid_x)
+        new_mid_y[~split] = mid_y[np.setdiff1d(np.arange(mid_x.size), take)]
+        new_mid_y[split] = func(new_mid_x[split])
+
+        x, y, mid_x, mid_y = new_x, new_y, new_mid_x, new_mid_y
+        scale = max(scale, _finite_extent(y))
+
+    return x, y
+
+
+def adaptive_grid(dist_obj, params, budget=DEFAULT_BUDGET, tol=DEFAULT_TOLERANCE):
+    lo, hi = dist_obj.grid_bounds(params)
+    x, _ = refine_grid(lambda pts: dist_obj.pdf(pts, params), lo, hi, budget=budget, tol=tol)
+    return x
+
+
+# Probability mass a discrete trace may leave out, split evenly between the two tails
+DISCRETE_EPSILON = 1e-12
+# Most bars in a discrete trace; wider windows are drawn as bins of several integers
+DISCRETE_BUDGET = 400
+
+
+def discrete_window(dist_obj, params, eps=DISCRETE_EPSILON):
+    """Integer range [lo, hi] holding all but eps of a discrete distribution's mass."""
+    with np.errstate(all="ignore"):
+        lo, hi = np.asarray(dist_obj.ppf(np.array([eps / 2, 1 - eps / 2]), params), dtype=float)
+    if not (np.isfinite(lo) and np.isfinite(hi)):
+        raise ValueError(f"Could not locate the probability mass of {type(dist_obj).__name__} for these parameters")
+    return lo, hi
+
+
+def lattice_bins(lo, hi, budget=DISCRETE_BUDGET):
+    """(edges, width): the integers lo..hi in at most budget bins of equal integer width.
+
+    Edges sit half-way between integers, so width 1 gives every integer its
+    own bin. The last bin may reach past hi to keep the widths equal.
+    """
+    span = hi - lo + 1
+    width = max(np.ceil(span / budget), 1.0)
+    return lo - 0.5 + width * np.arange(np.ceil(span / width) + 1), width
+
+
+def bin_mass(dist_obj, edges, params):
+    """(probability of each bin between consecutive edges, cdf at each bin's right edge)"""
+    with np.errstate(all="ignore"):
+        cdf = np.asarray(dist_obj.cdf(edges, params), dtype=float)
+        sf = np.asarray(dist_obj.sf(edges, params), dtype=float)
+    # Differences of the cdf below the median and of the survival function above it,
+    # so bins deep in either tail don't cancel against a value near 1
+    mass = np.where(cdf[..., :-1] < 0.5, np.diff(cdf), -np.diff(sf))
+    return np.maximum(mass, 0.0), cdf[..., 1:]
+
+
+def discrete_grid(dist_obj, params, budget=DISCRETE_BUDGET, eps=DISCRETE_EPSILON):
+    """(x, pmf, cdf) over the eps-window, in at most budget bars.
+
+    The pmf is exponentiated from logpdf so far-tail terms don't underflow
+    on the way. Windows longer than the budget are split into bins of
+    equal integer width: x is the bin centre, the pmf is the bin's mean
+    probability per integer (keeping bars on the same scale as unbinned
+    ones) and the cdf is taken at the bin's last integer.
+    """
+    lo, hi = discrete_window(dist_obj, params, eps)
+    span = hi - lo + 1
+    if span <= budget:
+        k = np.arange(lo, hi + 1)
+        with np.errstate(all="ignore"):
+            return k, np.exp(dist_obj.logpdf(k, params)), np.asarray(dist_obj.cdf(k, params), dtype=float)
+
+    width = np.ceil(span / budget)
+    # Bin edges sit half-way between integers: bin i holds lo + i*width .. lo + (i+1)*width - 1
+    last = np.minimum(lo + width * np.arange(1, np.ceil(span / width) + 1) - 1, hi)
+    edges = np.concatenate([[lo - 1], last])
+    mass, cdf = bin_mass(dist_obj, edges, params)
+    counts = np.diff(edges)
+    return edges[:-1] + 0.5 * (counts + 1), mass / counts, cdf
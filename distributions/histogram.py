@@ -0,0 +1,30 @@
+import numpy as np
+
+BIN_RULES = ["Fixed", "Freedman–Diaconis", "Scott"]
+# Keeps the bar trace small however many samples are drawn
+MAX_BINS = 400
+
+
+def bin_count(rule, values, total, lo, hi, bins=30):
+    """Number of equal-width bins over [lo, hi] for a histogram of total points.
+
+    Freedman–Diaconis and Scott need a spread estimate; it is taken from
+    values, which may be just the first chunk of a stream. The width
+    formula still uses the full total.
+    """
+    if rule == "Fixed":
+        return bins
+    values = np.asarray(values, dtype=float)
+    if values.size < 2:
+        return bins
+    if rule == "Freedman–Diaconis":
+        q1, q3 = np.percentile(values, [25, 75])
+        width = 2 * (q3 - q1) * total ** (-1 / 3)
+    elif rule == "Scott":
+        width = 3.49 * values.std() * total ** (-1 / 3)
+    else:
+        raise ValueError(f"Unknown bin rule '{rule}'. Choose from: {', '.join(BIN_RULES)}")
+    if not width > 0:
+        return bins
+    return int(np.clip(np.ceil((hi - lo) / width), 1, MAX_BINS))
+
@@ -0,0 +1,165 @@
+"""Monte Carlo sampling distributions of common statistics.
+
+R replicates of size n are drawn in vectorized (block, n) arrays, so each
+worker call is a handful of numpy operations rather than a Python loop
+per replicate. Blocks run in a process pool with their own SeedSequence
+streams, which makes results reproducible for a given seed.
+"""
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+from scipy.stats import norm, t as student_t
+
+from .sampling import spawn_generators
+
+# Upper bound on samples held by one block (R_block * n); ~32 MB of float64
+BLOCK_ELEMENTS = 1 << 22
+# Jobs smaller than this run in-process; pool start-up would dominate
+INLINE_ELEMENTS = 1 << 20
+
+
+class MonteCarloCancelled(Exception):
+    pass
+
+
+def _t_statistic(samples, mu):
+    n = samples.shape[1]
+    return (samples.mean(axis=1) - mu) / (samples.std(axis=1, ddof=1) / np.sqrt(n))
+
+
+STATISTICS = {
+    "Mean": lambda samples, mu: samples.mean(axis=1),
+    "Median": lambda samples, mu: np.median(samples, axis=1),
+    "Variance": lambda samples, mu: samples.var(axis=1, ddof=1),
+    "Max": lambda samples, mu: samples.max(axis=1),
+    "t-statistic": _t_statistic,
+}
+
+
+def _population_moment(dist_obj, params, name):
+    value = dist_obj.calculate_stats(params).get(name)
+    return float(value) if isinstance(value, (int, float, np.number)) else None
+
+
+def _run_block(dist_name, params, n, replicates, statistic, rng, mu):
+    from distributions import dist_registry
+
+    samples = dist_registry[dist_name].generate_samples(params, (replicates, n), rng=rng)
+    return STATISTICS[statistic](np.asarray(samples, dtype=float), mu)
+
+
+def plan_blocks(n, replicates):
+    block = max(1, min(replicates, BLOCK_ELEMENTS // max(n, 1)))
+    sizes = [block] * (replicates // block)
+    if replicates % block:
+        sizes.append(replicates % block)
+    return sizes
+
+
+def run_monte_carlo(dist_name, params, n, replicates, statistic="Mean", seed=None,
+                    workers=None, executor=None, progress=None, cancel_event=None):
+    """Return the R values of statistic computed on R independent samples of size n.
+
+    progress(done, total) is called as blocks finish. Setting cancel_event
+    (a threading.Event) stops the run with MonteCarloCancelled; pending
+    blocks are cancelled. Pass an existing executor to reuse warm workers.
+    """
+    from distributions import dist_registry
+
+    if statistic not in STATISTICS:
+        raise ValueError(f"Unknown statistic '{statistic}'. Choose from: {', '.join(STATISTICS)}")
+    if n < 2 and statistic in ("Variance", "t-statistic"):
+        raise ValueError(f"{statistic} needs samples of size n >= 2")
+
+    dist_obj = dist_registry[dist_name]
+    mu = _population_moment(dist_obj, params, "Mean")
+    if statistic == "t-statistic" and mu is None:
+        raise ValueError(f"The t-statistic needs a finite population mean; {dist_name} has none for these parameters")
+
+    sizes = plan_blocks(n, replicates)
+    generators = spawn_generators(seed, len(sizes))
+    results = [None] * len(sizes)
+
+    if n * replicates <= INLINE_ELEMENTS:
+        for i, (size, rng) in enumerate(zip(sizes, generators)):
+            if cancel_event is not None and cancel_event.is_set():
+                raise MonteCarloCancelled()
+            results[i] = _run_block(dist_name, params, n, size, statistic, rng, mu)
+            if progress:
+                progress(i + 1, len(sizes))
+        return np.concatenate(results)
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count())
+    futures = {}
+    try:
+        for i, (size, rng) in enumerate(zip(sizes, generators)):
+            futures[executor.submit(_run_block, dist_name, params, n, size, statistic, rng, mu)] = i
+        pending = set(futures)
+        done_count = 0
+        while pending:
+            done, pending = wait(pending, timeout=0.25, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[futures[future]] = future.result()
+                done_count += 1
+            if done and progress:
+                progress(done_count, len(sizes))
+            if cancel_event is not None and cancel_event.is_set():
+                raise MonteCarloCancelled()
+    finally:
+        # Also reached when Streamlit interrupts the script on a rerun
+        for future in futures:
+            future.cancel()
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+    return np.concatenate(results)
+
+
+def theoretical_sampling_distribution(dist_obj, params, n, statistic, x, bin_width=1.0):
+    """Density of the statistic's sampling distribution on x, or None when no reference applies.
+
+    Mean uses the CLT normal approximation, t-statistic the t(n-1)
+    distribution (exact for normal data), Variance a normal matched to the
+    exact mean and variance of s^2, Max the exact order-statistic
+    density n F^(n-1) f, and Median the asymptotic normal with variance
+    1 / (4 n f(m)^2).
+
+    The Max of a discrete family is integer-valued: its reference is the
+    probability of the whole-integer bin bin_width wide around x, divided by
+    bin_width, i.e. the density of a histogram with such bins (bin_width 1
+    gives the pmf of the max).
+    """
+    x = np.asarray(x, dtype=float)
+    mean = _population_moment(dist_obj, params, "Mean")
+    variance = _population_moment(dist_obj, params, "Variance")
+
+    if statistic == "Mean":
+        if mean is None or variance is None:
+            return None
+        return norm.pdf(x, loc=mean, scale=np.sqrt(variance / n))
+    if statistic == "t-statistic":
+        return student_t.pdf(x, df=n - 1)
+    if statistic == "Variance":
+        kurtosis = _population_moment(dist_obj, params, "Kurtosis")
+        if variance is None or kurtosis is None:
+            return None
+        # Var(s^2) = sigma^4 (kurtosis - (n - 3) / (n - 1)) / n
+        spread = variance ** 2 * (kurtosis - (n - 3) / (n - 1)) / n
+        return norm.pdf(x, loc=variance, scale=np.sqrt(spread)) if spread > 0 else None
+    if statistic == "Max":
+        if dist_obj.dist_type == "PMF":
+            half = bin_width / 2
+            mass = dist_obj.cdf(np.floor(x + half), params) ** n - dist_obj.cdf(np.floor(x - half), params) ** n
+            return mass / bin_width
+        return n * dist_obj.cdf(x, params) ** (n - 1) * dist_obj.pdf(x, params)
+    if statistic == "Median":
+        if dist_obj.dist_type == "PMF":
+            return None
+        median = float(dist_obj.ppf(0.5, params))
+        density = float(dist_obj.pdf(median, params))
+        if not np.isfinite(density) or density <= 0:
+            return None
+        return norm.pdf(x, loc=median, scale=1 / (2 * density * np.sqrt(n)))
+    return None
@@ -0,0 +1,12 @@
+import numpy as np
+
+
+def spawn_generators(seed, n_streams):
+    """Independent, reproducible Generators derived from one seed via SeedSequence.spawn."""
+    seed_seq = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    return [np.random.default_rng(child) for child in seed_seq.spawn(n_streams)]
+
+
+def split_sizes(size, parts):
+    base, extra = divmod(int(size), parts)
+    return [base + (1 if i < extra else 0) for i in range(parts)]
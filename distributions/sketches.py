@@ -0,0 +1,405 @@
+"""Mergeable, fixed-memory summaries of samples or data too large to hold.
+
+Usage:
+    python -m distributions.sketches sample Normal '{"mean": 0, "std": 1}' --size 1e9 --out normal.npz
+    python -m distributions.sketches build data.csv --column latency_ms --out latency.npz
+    python -m distributions.sketches merge a.npz b.npz --out all.npz
+    python -m distributions.sketches ks all.npz Normal '{"mean": 0, "std": 1}'
+
+A DataSketch bundles RunningStats (count, mean, moments, min, max), a KLL
+quantile sketch and optionally a StreamingHistogram over a fixed range.
+Each is built from chunks, merged across worker processes and saved to
+an .npz file, so sketches of separate runs or files can be combined later.
+
+The KLL sketch (Karnin, Lang and Liberty, 2016) keeps about 3k values
+whatever the count. rank_error is the normalized rank error of a single
+query that DataSketches reports at 99% confidence: about 0.27% for the
+default k of 1024. error_bound holds for all queries at once, which is
+what a supremum such as the KS distance needs: about 0.46% for k = 1024.
+Both are 0 while the sketch still holds every value.
+"""
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+from .datasets import plan_parts, run_jobs
+from .sampling import spawn_generators, split_sizes
+from .streaming import RunningStats, StreamingHistogram, stream_samples
+
+DEFAULT_K = 1024
+# Smallest capacity of any compactor level
+MIN_CAPACITY = 8
+# Capacities shrink by this factor per level below the top one
+CAPACITY_DECAY = 2 / 3
+# Samples per worker call; each call holds one stream_samples chunk at a time
+PART_SAMPLES = 1 << 24
+INLINE_SAMPLES = 1 << 22
+QQ_POINTS = 200
+# Confidence of the rank error bounds
+RANK_ERROR_DELTA = 0.01
+# The all-queries bound checks this many rank points per single-query error width
+BOUND_GRID_DENSITY = 10
+FORMAT_VERSION = 1
+
+
+class KLLSketch:
+    """Mergeable quantile sketch: level h holds values standing for 2**h points each."""
+
+    def __init__(self, k=DEFAULT_K, seed=None):
+        if k < MIN_CAPACITY:
+            raise ValueError(f"KLL sketch needs k >= {MIN_CAPACITY}")
+        self.k = int(k)
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._rng = np.random.default_rng(seed)
+        self._sorted = None
+
+    @property
+    def exact(self):
+        """True until the first compaction: every value is still held with weight 1."""
+        return len(self.levels) == 1
+
+    @property
+    def rank_error(self):
+        """Normalized rank error of one query at 99% confidence."""
+        if self.exact:
+            return 0.0
+        # DataSketches' empirical fit of the single-query normalized rank error
+        return 2.296 / self.k ** 0.9723
+
+    @property
+    def error_bound(self):
+        """Normalized rank error of every query at once, at 99% confidence.
+
+        The single-query error is sub-Gaussian. A union bound over m fixed
+        rank points widens it by sqrt(ln(2m/delta) / ln(2/delta)), and ranks
+        between neighbouring points add at most their spacing 1/m.
+        """
+        single = self.rank_error
+        if single == 0.0:
+            return 0.0
+        m = int(np.ceil(BOUND_GRID_DENSITY / single))
+        widen = np.sqrt(np.log(2 * m / RANK_ERROR_DELTA) / np.log(2 / RANK_ERROR_DELTA))
+        return float(single * widen + 1 / m)
+
+    @property
+    def retained(self):
+        return sum(level.size for level in self.levels)
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(MIN_CAPACITY, int(np.ceil(self.k * CAPACITY_DECAY ** depth)))
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return self
+        self.count += values.size
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        if other.k != self.k:
+            raise ValueError(f"Only sketches with the same k can be merged ({self.k} vs {other.k})")
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, level in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _compress(self):
+        self._sorted = None
+        h = 0
+        while h < len(self.levels):
+            if self.levels[h].size < self._capacity(h):
+                h += 1
+                continue
+            if h + 1 == len(self.levels):
+                self.levels.append(np.empty(0))
+            level = np.sort(self.levels[h])
+            # An odd item out stays behind, so the total weight is preserved exactly
+            keep = level[:level.size % 2]
+            pairs = level[level.size % 2:]
+            promoted = pairs[self._rng.integers(2)::2]
+            self.levels[h] = keep
+            self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            # A new top level shrinks every capacity below it, so start over from the bottom
+            h = 0
+
+    def sorted_view(self):
+        """(unique values ascending, cumulative counts up to and including each)"""
+        if self._sorted is None:
+            values = np.concatenate(self.levels)
+            weights = np.concatenate([np.full(level.size, 2.0 ** h) for h, level in enumerate(self.levels)])
+            order = np.argsort(values, kind="stable")
+            values, weights = values[order], weights[order]
+            unique, start = np.unique(values, return_index=True)
+            self._sorted = unique, np.cumsum(np.add.reduceat(weights, start)) if values.size else np.empty(0)
+        return self._sorted
+
+    def rank(self, x):
+        """Estimated fraction of points <= x."""
+        values, cumulative = self.sorted_view()
+        index = np.searchsorted(values, np.asarray(x, dtype=float), side="right")
+        return np.where(index > 0, cumulative[np.maximum(index - 1, 0)], 0.0) / max(self.count, 1)
+
+    def quantile(self, q):
+        """Smallest retained value whose estimated rank is at least q."""
+        if self.count == 0:
+            raise ValueError("The sketch is empty")
+        values, cumulative = self.sorted_view()
+        index = np.searchsorted(cumulative, np.asarray(q, dtype=float) * self.count, side="left")
+        return values[np.clip(index, 0, values.size - 1)]
+
+
+class DataSketch:
+    """RunningStats + KLLSketch (+ StreamingHistogram when a range is given), updated together."""
+
+    def __init__(self, k=DEFAULT_K, histogram_range=None, seed=None):
+        self.stats = RunningStats()
+        self.quantiles = KLLSketch(k, seed=seed)
+        self.histogram = StreamingHistogram(*histogram_range) if histogram_range else None
+        self.skipped = 0
+
+    @property
+    def count(self):
+        return self.stats.count
+
+    def update(self, values, skipped=0):
+        self.stats.update(values)
+        self.quantiles.update(values)
+        if self.histogram is not None:
+            self.histogram.update(values)
+        self.skipped += skipped
+        return self
+
+    def merge(self, other):
+        self.stats.merge(other.stats)
+        self.quantiles.merge(other.quantiles)
+        if self.histogram is not None and other.histogram is not None:
+            self.histogram.merge(other.histogram)
+        elif other.histogram is not None or self.histogram is not None:
+            # A histogram only one side has would no longer count every point
+            self.histogram = None
+        self.skipped += other.skipped
+        return self
+
+    def save(self, path):
+        s, kll = self.stats, self.quantiles
+        arrays = {
+            "format_version": np.array(FORMAT_VERSION),
+            "stats": np.array([s.count, s.mean, s.m2, s.m3, s.m4, s.min, s.max, self.skipped], dtype=float),
+            "kll_k": np.array(kll.k),
+            "kll_count": np.array(kll.count),
+            "kll_range": np.array([kll.min, kll.max]),
+            "kll_items": np.concatenate(kll.levels),
+            "kll_sizes": np.array([level.size for level in kll.levels]),
+        }
+        if self.histogram is not None:
+            h = self.histogram
+            arrays.update(hist_edges=h.edges, hist_counts=h.counts, hist_outside=np.array([h.underflow, h.overflow]))
+        with open(path, "wb") as fh:
+            np.savez(fh, **arrays)
+        return path
+
+    @classmethod
+    def load(cls, path, seed=None):
+        with np.load(path) as data:
+            if int(data["format_version"]) != FORMAT_VERSION:
+                raise ValueError(f"{os.path.basename(path)} is sketch format {int(data['format_version'])}; "
+                                 f"expected {FORMAT_VERSION}")
+            sketch = cls(int(data["kll_k"]), seed=seed)
+            s = sketch.stats
+            count, s.mean, s.m2, s.m3, s.m4, s.min, s.max, skipped = data["stats"].tolist()
+            s.count, sketch.skipped = int(count), int(skipped)
+            kll = sketch.quantiles
+            kll.count = int(data["kll_count"])
+            kll.min, kll.max = data["kll_range"].tolist()
+            kll.levels = np.split(data["kll_items"], np.cumsum(data["kll_sizes"])[:-1])
+            if "hist_edges" in data:
+                edges = data["hist_edges"]
+                sketch.histogram = StreamingHistogram(edges[0], edges[-1], edges.size - 1)
+                sketch.histogram.edges = edges
+                sketch.histogram.counts = data["hist_counts"].astype(np.int64)
+                sketch.histogram.underflow, sketch.histogram.overflow = (int(v) for v in data["hist_outside"])
+        return sketch
+
+
+def ecdf_points(sketch):
+    """(x, F) of the empirical CDF as a right-continuous step function (at most ~3k steps)."""
+    kll = sketch.quantiles if isinstance(sketch, DataSketch) else sketch
+    values, cumulative = kll.sorted_view()
+    return values, cumulative / max(kll.count, 1)
+
+
+def qq_points(sketch, dist_cache, dist_name, params, points=QQ_POINTS):
+    """(theoretical quantiles, sample quantiles) at points evenly spaced probability levels.
+
+    Theoretical quantiles come from the distribution's frozen scipy object
+    (get_quantile_dist); the families without one use the quantile engine.
+    """
+    kll = sketch.quantiles if isinstance(sketch, DataSketch) else sketch
+    levels = (np.arange(points) + 0.5) / points
+    frozen = dist_cache.get_quantile_dist(dist_name, params)
+    theoretical = frozen.ppf(levels) if frozen is not None else dist_cache.get_quantiles(dist_name, params, levels)
+    return np.asarray(theoretical, dtype=float), kll.quantile(levels)
+
+
+def ks_distance(sketch, dist_obj, params):
+    """Kolmogorov-Smirnov distance sup |F_n - F| from a sketch, and its error bound.
+
+    Returns {"statistic", "error_bound", "count"}; the exact distance of the
+    full data lies within statistic ± error_bound, the all-queries rank
+    error (0 when the sketch has not compacted anything).
+    """
+    kll = sketch.quantiles if isinstance(sketch, DataSketch) else sketch
+    if kll.count == 0:
+        raise ValueError("The sketch is empty")
+    values, cumulative = kll.sorted_view()
+    upper = cumulative / kll.count
+    lower = np.concatenate([[0.0], upper[:-1]])
+    with np.errstate(all="ignore"):
+        cdf = np.asarray(dist_obj.cdf(values, params), dtype=float)
+        # Just below each value: the cdf itself when continuous, one step down when discrete
+        cdf_before = np.asarray(dist_obj.cdf(values - 1, params), dtype=float) if dist_obj.dist_type == "PMF" else cdf
+    statistic = max(float(np.max(upper - cdf)), float(np.max(cdf_before - lower)), 0.0)
+    return {"statistic": statistic, "error_bound": kll.error_bound, "count": kll.count}
+
+
+def _sketch_samples_part(dist_name, params, size, rng, k, histogram_range):
+    from distributions import dist_registry
+
+    sketch = DataSketch(k, histogram_range, seed=rng)
+    for chunk in stream_samples(dist_registry[dist_name], params, size, rng=rng):
+        sketch.update(chunk)
+    return sketch
+
+
+def _sketch_source_part(part, k, histogram_range, seed):
+    sketch = DataSketch(k, histogram_range, seed=seed)
+    for values, skipped in part.chunks():
+        sketch.update(values, skipped)
+    return sketch
+
+
+def _merged(sketches):
+    merged = sketches[0]
+    for sketch in sketches[1:]:
+        merged.merge(sketch)
+    return merged
+
+
+def sketch_samples(dist_name, params, total, k=DEFAULT_K, histogram_range=None, seed=None,
+                   workers=None, executor=None, progress=None):
+    """DataSketch of total draws, built in parts with their own SeedSequence streams.
+
+    The result depends only on seed and total. progress(done, total_parts)
+    is called as parts finish. Pass an existing executor to reuse warm workers.
+    """
+    total = int(total)
+    if total < 1:
+        raise ValueError("Nothing to sketch: total must be at least 1")
+    n_parts = max(-(-total // PART_SAMPLES), 1)
+    sizes = split_sizes(total, n_parts)
+    jobs = [(_sketch_samples_part, (dist_name, params, size, rng, k, histogram_range))
+            for size, rng in zip(sizes, spawn_generators(seed, n_parts))]
+    return _merged(run_jobs(jobs, executor, workers, progress, inline=total <= INLINE_SAMPLES))
+
+
+def sketch_source(source, k=DEFAULT_K, histogram_range=None, seed=None, workers=None, executor=None, progress=None):
+    """DataSketch of a distributions.datasets.ColumnSource, one part per slice of the file."""
+    parts, inline = plan_parts(source, workers, executor)
+    seeds = np.random.SeedSequence(seed).spawn(len(parts))
+    jobs = [(_sketch_source_part, (part, k, histogram_range, part_seed)) for part, part_seed in zip(parts, seeds)]
+    sketch = _merged(run_jobs(jobs, executor, workers, progress, inline))
+    if sketch.count == 0:
+        raise ValueError("The column holds no numeric values")
+    return sketch
+
+
+def summary(sketch):
+    levels = [0.001, 0.01, 0.25, 0.5, 0.75, 0.99, 0.999]
+    return {
+        **{name: value if isinstance(value, int) else float(value) for name, value in sketch.stats.as_dict().items()},
+        "Skipped": sketch.skipped,
+        "Quantiles": dict(zip(map(str, levels), sketch.quantiles.quantile(levels).tolist())),
+        "Rank Error (per query)": sketch.quantiles.rank_error,
+        "Rank Error Bound (all queries)": sketch.quantiles.error_bound,
+        "Retained Values": sketch.quantiles.retained,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sample = commands.add_parser("sample", help="Sketch draws from a registry distribution")
+    sample.add_argument("dist")
+    sample.add_argument("params", help="JSON object of parameters")
+    sample.add_argument("--size", type=float, required=True)
+    sample.add_argument("--seed", type=int, default=None)
+
+    build = commands.add_parser("build", help="Sketch a column of a CSV or NPY file")
+    build.add_argument("path")
+    column = build.add_mutually_exclusive_group()
+    column.add_argument("--column", help="Column name: a CSV header, or an NPY column number")
+    column.add_argument("--index", type=int, help="0-based column position (default: the first)")
+
+    merge = commands.add_parser("merge", help="Merge saved sketches")
+    merge.add_argument("inputs", nargs="+")
+
+    for command in (sample, build, merge):
+        command.add_argument("--out", required=True, help="Output .npz file")
+    for command in (sample, build):
+        command.add_argument("--k", type=int, default=DEFAULT_K)
+        command.add_argument("--workers", type=int, default=None)
+
+    ks = commands.add_parser("ks", help="KS distance of a saved sketch from a registry distribution")
+    ks.add_argument("sketch")
+    ks.add_argument("dist")
+    ks.add_argument("params", help="JSON object of parameters")
+    args = parser.parse_args(argv)
+
+    from distributions import dist_registry
+
+    try:
+        if args.command in ("sample", "ks") and args.dist not in dist_registry:
+            raise ValueError(f"Unknown distribution '{args.dist}'. Choose from: {', '.join(dist_registry)}")
+        if args.command == "sample":
+            sketch = sketch_samples(args.dist, json.loads(args.params), args.size, k=args.k, seed=args.seed,
+                                    workers=args.workers)
+        elif args.command == "build":
+            from .datasets import ColumnSource
+
+            sketch = sketch_source(ColumnSource(args.path, column=args.column, index=args.index), k=args.k,
+                                   workers=args.workers)
+        elif args.command == "merge":
+            sketch = DataSketch.load(args.inputs[0])
+            for path in args.inputs[1:]:
+                sketch.merge(DataSketch.load(path))
+        else:
+            result = ks_distance(DataSketch.load(args.sketch), dist_registry[args.dist], json.loads(args.params))
+            print(json.dumps(result, indent=2))
+            return 0
+    except (OSError, ValueError, KeyError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    sketch.save(args.out)
+    print(json.dumps(summary(sketch), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
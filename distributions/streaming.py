@@ -0,0 +1,179 @@
+import itertools
+
+import numpy as np
+
+from .grid import discrete_window, lattice_bins
+from .histogram import bin_count
+
+# Samples drawn per chunk; bounds peak memory at a few MB regardless of total size
+DEFAULT_CHUNK_SIZE = 1 << 18
+
+
+class RunningStats:
+    """Mergeable count/mean/central moments/min/max (Welford, Pébay's pairwise update)."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        if values.size == 0:
+            return self
+        chunk = RunningStats()
+        chunk.count = values.size
+        chunk.mean = float(values.mean())
+        d = values - chunk.mean
+        d2 = d * d
+        chunk.m2 = float(d2.sum())
+        chunk.m3 = float((d2 * d).sum())
+        chunk.m4 = float((d2 * d2).sum())
+        chunk.min = float(values.min())
+        chunk.max = float(values.max())
+        return self.merge(chunk)
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+        na, nb = self.count, other.count
+        n = na + nb
+        delta = other.mean - self.mean
+        delta_n = delta / n
+        m2 = self.m2 + other.m2 + delta * delta_n * na * nb
+        m3 = (self.m3 + other.m3
+              + delta * delta_n ** 2 * na * nb * (na - nb)
+              + 3 * delta_n * (na * other.m2 - nb * self.m2))
+        m4 = (self.m4 + other.m4
+              + delta * delta_n ** 3 * na * nb * (na * na - na * nb + nb * nb)
+              + 6 * delta_n ** 2 * (na * na * other.m2 + nb * nb * self.m2)
+              + 4 * delta_n * (na * other.m3 - nb * self.m3))
+        self.count = n
+        self.mean += delta_n * nb
+        self.m2, self.m3, self.m4 = m2, m3, m4
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self):
+        # Population variance, matching np.std's default ddof=0
+        return self.m2 / self.count if self.count else np.nan
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    @property
+    def skewness(self):
+        if self.count == 0 or self.m2 == 0:
+            return np.nan
+        return np.sqrt(self.count) * self.m3 / self.m2 ** 1.5
+
+    @property
+    def kurtosis(self):
+        # Non-excess kurtosis, the convention used by calculate_stats
+        if self.count == 0 or self.m2 == 0:
+            return np.nan
+        return self.count * self.m4 / self.m2 ** 2
+
+    def as_dict(self):
+        return {
+            "Count": self.count,
+            "Mean": self.mean,
+            "Standard Deviation": self.std,
+            "Min": self.min,
+            "Max": self.max,
+            "Skewness": self.skewness,
+            "Kurtosis": self.kurtosis,
+        }
+
+
+class StreamingHistogram:
+    """Fixed, equal-width bins filled chunk by chunk; out-of-range values are tallied separately."""
+
+    def __init__(self, lo, hi, bins):
+        if not hi > lo:
+            raise ValueError("Histogram range must satisfy lo < hi")
+        self.edges = np.linspace(lo, hi, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+
+    @property
+    def bin_width(self):
+        return self.edges[1] - self.edges[0]
+
+    @property
+    def centers(self):
+        return 0.5 * (self.edges[:-1] + self.edges[1:])
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        bins = self.counts.size
+        index = np.floor((values - self.edges[0]) / self.bin_width).astype(np.int64)
+        # The right edge belongs to the last bin, as with np.histogram
+        index[values == self.edges[-1]] = bins - 1
+        self.underflow += int(np.count_nonzero(index < 0))
+        self.overflow += int(np.count_nonzero(index >= bins))
+        in_range = index[(index >= 0) & (index < bins)]
+        self.counts += np.bincount(in_range, minlength=bins)
+        return self
+
+    def merge(self, other):
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("Only histograms with identical bin edges can be merged")
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+
+def stream_samples(dist_obj, params, total, chunk_size=DEFAULT_CHUNK_SIZE, rng=None):
+    rng = np.random.default_rng(rng)
+    remaining = int(total)
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        yield dist_obj.generate_samples(params, size, rng=rng)
+        remaining -= size
+
+
+def histogram_range(dist_obj, params):
+    # Bins have to be fixed before the first chunk arrives, so take them from the theory
+    if dist_obj.dist_type == "PMF":
+        # Bins of whole integers over the window the pmf trace covers, at most DISCRETE_BUDGET of them
+        edges, _ = lattice_bins(*discrete_window(dist_obj, params))
+        return float(edges[0]), float(edges[-1]), edges.size - 1
+    lo, hi = dist_obj.grid_bounds(params)
+    return lo, hi, None
+
+
+def summarize_samples(dist_obj, params, total, bins=30, rule="Fixed", chunk_size=DEFAULT_CHUNK_SIZE, rng=None,
+                      sketch=None):
+    """Draw total samples chunk by chunk; return (RunningStats, StreamingHistogram).
+
+    Memory stays bounded by chunk_size however large total is. Discrete
+    distributions get one bin per integer of their window (several integers
+per bin past grid.DISCRETE_BUDGET); continuous ones use the
+    bin rule, with its spread estimate taken from the first chunk. A
+    quantile sketch (distributions.sketches.KLLSketch) passed as sketch is
+    fed the same chunks.
+    """
+    chunks = stream_samples(dist_obj, params, total, chunk_size, rng=rng)
+    first = next(chunks, np.empty(0))
+    lo, hi, support_bins = histogram_range(dist_obj, params)
+    stats = RunningStats()
+    hist = StreamingHistogram(lo, hi, support_bins or bin_count(rule, first, total, lo, hi, bins))
+    for chunk in itertools.chain([first], chunks):
+        stats.update(chunk)
+        hist.update(chunk)
+        if sketch is not None:
+            sketch.update(chunk)
+    return stats, hist
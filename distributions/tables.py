@@ -0,0 +1,268 @@
+"""Precomputed PDF/CDF/quantile tables over the slider parameter lattice.
+
+Build once, offline:
+    python -m distributions.tables build --out tables [--workers N] [--only Normal Beta]
+
+The app then memory-maps the .npy files read-only, so every server process
+shares the same pages through the OS page cache and on-lattice requests
+never reach scipy. Values are stored as float64, exactly what
+generate_data returns. A table records the table format, the SciPy
+version and the settings that shape its values (the fast-path switch and
+the grid budgets, see table_settings); a table that differs in any of
+them is skipped (see LatticeTables.skipped) until it is rebuilt.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy
+
+from .closed_form import fast_paths_enabled, set_fast_paths
+from .grid import DEFAULT_BUDGET, DEFAULT_TOLERANCE, DISCRETE_BUDGET, DISCRETE_EPSILON
+
+FORMAT_VERSION = 3
+# Levels drawn by "Show Quantiles" in the app
+QUANTILE_LEVELS = [0.025, 0.25, 0.5, 0.75, 0.975]
+CHUNK_ROWS = 512
+
+
+def table_slug(dist_name):
+    return re.sub(r"[^a-z0-9]+", "-", dist_name.lower()).strip("-")
+
+
+def table_settings():
+    """The settings a table's values depend on besides the code; they must match for it to be used."""
+    return {
+        "fast_paths": fast_paths_enabled(),
+        "grid_budget": DEFAULT_BUDGET,
+        "grid_tolerance": DEFAULT_TOLERANCE,
+        "discrete_budget": DISCRETE_BUDGET,
+        "discrete_epsilon": DISCRETE_EPSILON,
+    }
+
+
+def settings_mismatch(settings):
+    """Why a table built with settings can't be used now, or None."""
+    current = table_settings()
+    changed = [f"{name}={settings.get(name)!r} (now {value!r})" for name, value in current.items()
+               if settings.get(name) != value]
+    return "built with " + ", ".join(changed) + "; rebuild it" if changed else None
+
+
+def lattice_axes(dist_obj):
+    axes = {}
+    for name, spec in dist_obj.param_specs.items():
+        count = int(round((spec["max"] - spec["min"]) / spec["step"])) + 1
+        values = spec["min"] + spec["step"] * np.arange(count)
+        # Match the values a slider actually reports, not accumulated float error
+        decimals = max(0, -int(np.floor(np.log10(spec["step"]))) + 2)
+        axes[name] = np.round(values, decimals)
+    return axes
+
+
+def lattice_params(dist_obj, axes, flat_index):
+    names = list(axes)
+    shape = tuple(len(axes[name]) for name in names)
+    coords = np.unravel_index(flat_index, shape) if names else ()
+    params = dict(dist_obj.fixed_params)
+    for name, coord in zip(names, coords):
+        value = axes[name][coord]
+        params[name] = int(value) if isinstance(dist_obj.param_specs[name]["step"], int) else float(value)
+    return params
+
+
+def _compute_rows(dist_name, start, stop, fast_paths):
+    from distributions import dist_registry
+
+    # Workers evaluate with the builder's fast-path setting, whatever their environment says
+    set_fast_paths(fast_paths)
+    dist_obj = dist_registry[dist_name]
+    axes = lattice_axes(dist_obj)
+    rows = []
+    for flat_index in range(start, stop):
+        params = lattice_params(dist_obj, axes, flat_index)
+        try:
+            dist_obj.validate_params(params)
+        except ValueError:
+            rows.append(None)
+            continue
+        with np.errstate(all="ignore"):
+            x, y_pdf, y_cdf, _ = dist_obj.generate_data(params)
+            q = dist_obj.ppf(np.array(QUANTILE_LEVELS), params)
+        rows.append((x, y_pdf, y_cdf, q))
+    return rows
+
+
+def build_table(dist_name, out_dir, workers=None):
+    from distributions import dist_registry
+
+    dist_obj = dist_registry[dist_name]
+    axes = lattice_axes(dist_obj)
+    n_rows = int(np.prod([len(values) for values in axes.values()])) if axes else 1
+
+    chunks = [(start, min(start + CHUNK_ROWS, n_rows)) for start in range(0, n_rows, CHUNK_ROWS)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_compute_rows, dist_name, start, stop, fast_paths_enabled()) for start, stop in chunks]
+        rows = [row for future in futures for row in future.result()]
+
+    width = max((len(row[0]) for row in rows if row is not None), default=0)
+    x_table = np.full((n_rows, width), np.nan, dtype=np.float64)
+    pdf_table = np.full((n_rows, width), np.nan, dtype=np.float64)
+    cdf_table = np.full((n_rows, width), np.nan, dtype=np.float64)
+    lengths = np.zeros(n_rows, dtype=np.int32)
+    q_table = np.full((n_rows, len(QUANTILE_LEVELS)), np.nan, dtype=np.float64)
+    for i, row in enumerate(rows):
+        if row is None:
+            continue
+        x, y_pdf, y_cdf, q = row
+        lengths[i] = len(x)
+        x_table[i, :len(x)] = x
+        pdf_table[i, :len(x)] = y_pdf
+        cdf_table[i, :len(x)] = y_cdf
+        q_table[i] = q
+
+    table_dir = os.path.join(out_dir, table_slug(dist_name))
+    os.makedirs(table_dir, exist_ok=True)
+    np.save(os.path.join(table_dir, "x.npy"), x_table)
+    np.save(os.path.join(table_dir, "pdf.npy"), pdf_table)
+    np.save(os.path.join(table_dir, "cdf.npy"), cdf_table)
+    np.save(os.path.join(table_dir, "length.npy"), lengths)
+    np.save(os.path.join(table_dir, "quantiles.npy"), q_table)
+
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "scipy_version": scipy.__version__,
+        "settings": table_settings(),
+        "dist_name": dist_name,
+        "dist_type": dist_obj.dist_type,
+        "fixed_params": dist_obj.fixed_params,
+        "axes": {name: {"min": float(values[0]), "step": dist_obj.param_specs[name]["step"], "count": len(values)}
+                 for name, values in axes.items()},
+        "quantile_levels": QUANTILE_LEVELS,
+    }
+    with open(os.path.join(table_dir, "meta.json"), "w") as fh:
+        json.dump(meta, fh, indent=2)
+    return n_rows, width
+
+
+class LatticeTable:
+    def __init__(self, table_dir):
+        with open(os.path.join(table_dir, "meta.json")) as fh:
+            self.meta = json.load(fh)
+        if self.meta["format_version"] != FORMAT_VERSION:
+            raise ValueError(f"{table_dir} was built with table format {self.meta['format_version']}, "
+                             f"expected {FORMAT_VERSION}; rebuild it")
+        if self.meta.get("scipy_version") != scipy.__version__:
+            raise ValueError(f"{table_dir} was built with SciPy {self.meta.get('scipy_version', 'unknown')}, "
+                             f"running {scipy.__version__}; rebuild it")
+        self.dist_type = self.meta["dist_type"]
+        self.fixed_params = self.meta["fixed_params"]
+        self.axes = self.meta["axes"]
+        self.shape = tuple(axis["count"] for axis in self.axes.values())
+        self.x = np.load(os.path.join(table_dir, "x.npy"), mmap_mode="r")
+        self.pdf = np.load(os.path.join(table_dir, "pdf.npy"), mmap_mode="r")
+        self.cdf = np.load(os.path.join(table_dir, "cdf.npy"), mmap_mode="r")
+        self.length = np.load(os.path.join(table_dir, "length.npy"), mmap_mode="r")
+        q_path = os.path.join(table_dir, "quantiles.npy")
+        self.quantiles = np.load(q_path, mmap_mode="r") if os.path.exists(q_path) else None
+
+    def row_index(self, params):
+        if set(params) != set(self.axes) | set(self.fixed_params):
+            return None
+        for name, value in self.fixed_params.items():
+            if params[name] != value:
+                return None
+        coords = []
+        for name, axis in self.axes.items():
+            position = (params[name] - axis["min"]) / axis["step"]
+            coord = int(round(position))
+            if not 0 <= coord < axis["count"] or abs(position - coord) > 1e-6:
+                return None
+            coords.append(coord)
+        row = int(np.ravel_multi_index(coords, self.shape)) if coords else 0
+        return row if self.length[row] > 0 else None
+
+    def generate_data(self, params):
+        row = self.row_index(params)
+        if row is None:
+            return None
+        n = int(self.length[row])
+        # Plain ndarray views, still backed by the shared mapping
+        return np.asarray(self.x[row, :n]), np.asarray(self.pdf[row, :n]), np.asarray(self.cdf[row, :n]), self.dist_type
+
+    def get_quantiles(self, params, levels):
+        if self.quantiles is None or list(levels) != self.meta["quantile_levels"]:
+            return None
+        row = self.row_index(params)
+        return None if row is None else np.asarray(self.quantiles[row])
+
+
+class LatticeTables:
+    """Read-only view over a directory written by build_table.
+
+    Missing tables and stale ones (another table format, SciPy version or
+    table_settings) answer None, so callers compute the values instead;
+    skipped maps each stale table's distribution to the reason. Settings
+    are checked again on every lookup, since fast paths can be switched
+    at runtime.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._tables = {}
+        self.skipped = {}
+
+    def table(self, dist_name):
+        if dist_name not in self._tables:
+            table_dir = os.path.join(self.directory, table_slug(dist_name))
+            table = None
+            if os.path.exists(os.path.join(table_dir, "meta.json")):
+                try:
+                    table = LatticeTable(table_dir)
+                except ValueError as e:
+                    self.skipped[dist_name] = str(e)
+            self._tables[dist_name] = table
+        table = self._tables[dist_name]
+        if table is not None:
+            mismatch = settings_mismatch(table.meta["settings"])
+            if mismatch:
+                self.skipped[dist_name] = f"{os.path.join(self.directory, table_slug(dist_name))} was {mismatch}"
+                return None
+            self.skipped.pop(dist_name, None)
+        return table
+
+    def generate_data(self, dist_name, params):
+        table = self.table(dist_name)
+        return None if table is None else table.generate_data(params)
+
+    def get_quantiles(self, dist_name, params, levels):
+        table = self.table(dist_name)
+        return None if table is None else table.get_quantiles(params, levels)
+
+
+def main(argv=None):
+    from distributions import dist_registry
+
+    parser = argparse.ArgumentParser(description="Precompute lattice tables for the distribution registry")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="Evaluate every lattice point and write .npy tables")
+    build.add_argument("--out", default="tables", help="Output directory")
+    build.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    build.add_argument("--only", nargs="+", choices=list(dist_registry), help="Restrict to these distributions")
+    args = parser.parse_args(argv)
+
+    for dist_name in args.only or list(dist_registry):
+        start = time.perf_counter()
+        n_rows, width = build_table(dist_name, args.out, workers=args.workers)
+        print(f"{dist_name}: {n_rows} lattice points x {width} grid points "
+              f"in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""Opt-in wall-clock timing of named stages.
+
+    from distributions.timing import stage, timed, timer
+
+    timer.enable()            # per thread; DISTVIZ_TIMING=1 enables it everywhere
+    with stage("app.figure"):
+        ...
+
+While timing is off, stage() hands back a shared no-op context and timed
+wrappers make one attribute lookup before calling straight through.
+"""
+import functools
+import os
+import threading
+from collections import defaultdict, deque
+from contextlib import nullcontext
+from time import perf_counter
+
+import numpy as np
+
+# Durations kept per stage for the rolling percentiles
+WINDOW = 512
+PERCENTILES = (50, 90, 99)
+METRIC_NAME = "distviz_stage_seconds"
+
+_DISABLED = nullcontext()
+
+
+class _Stage:
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.record(self.name, perf_counter() - self.start)
+        return False
+
+
+class StageTimer:
+    def __init__(self, window=WINDOW, enabled=False):
+        self.default_enabled = enabled
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._window = window
+        self._durations = defaultdict(lambda: deque(maxlen=self._window))
+        self._counts = defaultdict(int)
+        self._totals = defaultdict(float)
+
+    @property
+    def enabled(self):
+        # Thread-local, so one Streamlit session turning it on doesn't time every other session
+        return getattr(self._local, "enabled", self.default_enabled)
+
+    def enable(self, on=True):
+        self._local.enabled = on
+
+    def begin_run(self):
+        """Start collecting this thread's stages for last_run()."""
+        self._local.run = {}
+
+    def last_run(self):
+        return dict(getattr(self._local, "run", None) or {})
+
+    def record(self, name, seconds):
+        with self._lock:
+            self._durations[name].append(seconds)
+            self._counts[name] += 1
+            self._totals[name] += seconds
+        run = getattr(self._local, "run", None)
+        if run is not None:
+            run[name] = run.get(name, 0.0) + seconds
+
+    def stage(self, name):
+        return _Stage(self, name) if self.enabled else _DISABLED
+
+    def timed(self, name):
+        def decorate(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(name, perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def summary(self):
+        """{stage: {"count", "total_s", "p50_s", "p90_s", "p99_s"}} over the rolling window."""
+        with self._lock:
+            snapshot = {name: (np.array(durations), self._counts[name], self._totals[name])
+                        for name, durations in self._durations.items()}
+        summary = {}
+        for name, (durations, count, total) in sorted(snapshot.items()):
+            entry = {"count": count, "total_s": total}
+            for p, value in zip(PERCENTILES, np.percentile(durations, PERCENTILES)):
+                entry[f"p{p}_s"] = float(value)
+            summary[name] = entry
+        return summary
+
+    def prometheus_text(self, metric=METRIC_NAME):
+        lines = [f"# HELP {metric} Wall time spent in each app and distribution stage.",
+                 f"# TYPE {metric} summary"]
+        for name, entry in self.summary().items():
+            # Label values escape backslash, double quote and newline
+            name = name.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            for p in PERCENTILES:
+                lines.append(f'{metric}{{stage="{name}",quantile="{p / 100:g}"}} {entry[f"p{p}_s"]:.9g}')
+            lines.append(f'{metric}_sum{{stage="{name}"}} {entry["total_s"]:.9g}')
+            lines.append(f'{metric}_count{{stage="{name}"}} {entry["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def write_metrics(self, path):
+        # Written aside and renamed so a scraper never reads a half-written file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as fh:
+            fh.write(self.prometheus_text())
+        os.replace(tmp_path, path)
+
+    def reset(self):
+        with self._lock:
+            self._durations.clear()
+            self._counts.clear()
+            self._totals.clear()
+
+
+timer = StageTimer(enabled=os.environ.get("DISTVIZ_TIMING", "") not in ("", "0"))
+stage = timer.stage
+timed = timer.timed
@@ -0,0 +1,2 @@
+from .data import (EXPORT_FORMATS, ChunkedTable, curve_table, export_table, samples_table,
+                   sweep_table, write_arrow, write_csv, write_npy, write_parquet)
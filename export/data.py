@@ -0,0 +1,154 @@
+"""Chunked export of curves, parameter sweeps and samples.
+
+Every source is a ChunkedTable that yields column chunks on demand and
+every writer consumes it one chunk at a time. Peak memory is therefore
+one chunk (DEFAULT_CHUNK_ROWS rows) regardless of how many rows are
+exported.
+"""
+import numpy as np
+
+from distributions.streaming import stream_samples
+
+DEFAULT_CHUNK_ROWS = 1 << 16
+
+# Format name -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "CSV": (".csv", "text/csv"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+    "Arrow": (".arrow", "application/vnd.apache.arrow.file"),
+    "NPY": (".npy", "application/octet-stream"),
+}
+
+
+class ChunkedTable:
+    def __init__(self, columns, n_rows, chunks):
+        self.columns = list(columns)
+        self.n_rows = n_rows
+        self._chunks = chunks
+
+    def __iter__(self):
+        # A fresh pass each time, so a table can be written more than once
+        return iter(self._chunks())
+
+
+def curve_table(x, y_pdf, y_cdf=None, pdf_name="pdf_pmf", chunk_rows=DEFAULT_CHUNK_ROWS):
+    data = {"x": np.asarray(x), pdf_name: np.asarray(y_pdf)}
+    if y_cdf is not None:
+        data["cdf"] = np.asarray(y_cdf)
+    n_rows = len(data["x"])
+
+    def chunks():
+        for start in range(0, n_rows, chunk_rows):
+            yield {name: values[start:start + chunk_rows] for name, values in data.items()}
+    return ChunkedTable(data, n_rows, chunks)
+
+
+def sweep_table(dist_obj, param_table, grid, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Long-format sweep: one row per (parameter row, grid point) with the parameters as columns.
+
+    generate_batch runs on as many parameter rows as fit in one chunk, so
+    the full (n_params x n_points) arrays never exist at once.
+    """
+    columns, n_params = dist_obj.param_table(param_table)
+    grid = np.asarray(grid, dtype=float).ravel()
+    rows_per_chunk = max(1, chunk_rows // max(grid.size, 1))
+
+    def chunks():
+        for start in range(0, n_params, rows_per_chunk):
+            block = {name: values[start:start + rows_per_chunk] for name, values in columns.items()}
+            _, y_pdf, y_cdf, _ = dist_obj.generate_batch(block, grid)
+            k = y_pdf.shape[0]
+            chunk = {name: np.repeat(values, grid.size) for name, values in block.items()}
+            chunk["x"] = np.tile(grid, k)
+            chunk["pdf_pmf"] = y_pdf.ravel()
+            chunk["cdf"] = y_cdf.ravel()
+            yield chunk
+    return ChunkedTable(list(columns) + ["x", "pdf_pmf", "cdf"], n_params * grid.size, chunks)
+
+
+def samples_table(dist_obj, params, total, seed=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """total draws from np.random.default_rng(seed), the same values the app and summarize_samples draw.
+
+    seed is an int or a SeedSequence; None picks one now, so every pass
+    over the table still yields the same samples.
+    """
+    if seed is None:
+        seed = np.random.SeedSequence()
+
+    def chunks():
+        # A fresh generator per pass replays the stream from the start
+        for chunk in stream_samples(dist_obj, params, total, chunk_rows, rng=np.random.default_rng(seed)):
+            yield {"sample": chunk}
+    return ChunkedTable(["sample"], int(total), chunks)
+
+
+def write_csv(table, path):
+    with open(path, "w", newline="") as fh:
+        fh.write(",".join(table.columns) + "\n")
+        for chunk in table:
+            block = np.column_stack([np.asarray(chunk[name], dtype=float) for name in table.columns])
+            np.savetxt(fh, block, delimiter=",", fmt="%.17g")
+
+
+def _record_batches(table, pa):
+    for chunk in table:
+        yield pa.record_batch([pa.array(chunk[name]) for name in table.columns], names=table.columns)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Parquet and Arrow export need pyarrow: `pip install pyarrow`") from None
+    return pyarrow
+
+
+def write_parquet(table, path):
+    pa = _require_pyarrow()
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for batch in _record_batches(table, pa):
+            if writer is None:
+                writer = pq.ParquetWriter(path, batch.schema)
+            writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_arrow(table, path):
+    pa = _require_pyarrow()
+
+    writer = None
+    try:
+        for batch in _record_batches(table, pa):
+            if writer is None:
+                writer = pa.ipc.new_file(path, batch.schema)
+            writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def write_npy(table, path):
+    # A (n_rows, n_columns) float64 array filled in place through a memory map
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64,
+                                    shape=(table.n_rows, len(table.columns)))
+    row = 0
+    for chunk in table:
+        n = len(chunk[table.columns[0]])
+        for j, name in enumerate(table.columns):
+            out[row:row + n, j] = chunk[name]
+        row += n
+    out.flush()
+    del out
+
+
+def export_table(table, fmt, path):
+    writers = {"CSV": write_csv, "Parquet": write_parquet, "Arrow": write_arrow, "NPY": write_npy}
+    if fmt not in writers:
+        raise ValueError(f"Unknown export format '{fmt}'. Choose from: {', '.join(writers)}")
+    writers[fmt](table, path)
+    return path
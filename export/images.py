@@ -0,0 +1,179 @@
+"""Static PNG/SVG rendering with a warm renderer and a content-addressed cache.
+
+Batch mode renders a report pack (every registry distribution, or a
+parameter sweep from a JSON job file) across worker processes, each
+keeping its own renderer alive for all of its figures:
+
+    python -m export.images --out report --format png svg [--workers N] [--jobs jobs.json]
+
+jobs.json is a list of {"dist": "<registry name>", "params": {...}};
+missing params fall back to the distribution's defaults. Files are named
+after the distribution and its parameters; jobs whose names would clash
+(e.g. mean=0.1 and mean=0.1000001, both "0.1" when shortened) get a
+-2, -3, ... suffix in job order.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import plotly.io as pio
+
+from distributions.cache import LRUCache
+from distributions.sampling import split_sizes
+from distributions.tables import table_slug
+
+IMAGE_FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+
+
+def figure_key(fig, fmt, width=None, height=None, scale=None):
+    payload = pio.to_json(fig, validate=False, pretty=False)
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return (digest, fmt, width, height, scale)
+
+
+class ImageRenderer:
+    """Keeps one kaleido renderer running and caches images by figure content."""
+
+    def __init__(self, max_bytes=128 * 1024 * 1024):
+        self.cache = LRUCache(max_bytes)
+        self._lock = threading.Lock()
+        self._started = False
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            try:
+                import kaleido
+            except ImportError:
+                raise ImportError("Image export needs kaleido: `pip install kaleido`") from None
+            # kaleido >= 1.0 launches a browser per call unless a sync server is running;
+            # older kaleido keeps its own subprocess alive after the first render
+            if hasattr(kaleido, "start_sync_server"):
+                kaleido.start_sync_server(silence_warnings=True)
+            self._started = True
+
+    def stop(self):
+        with self._lock:
+            if not self._started:
+                return
+            import kaleido
+            if hasattr(kaleido, "stop_sync_server"):
+                kaleido.stop_sync_server(silence_warnings=True)
+            self._started = False
+
+    def render(self, fig, fmt="png", width=None, height=None, scale=None):
+        if fmt not in IMAGE_FORMATS:
+            raise ValueError(f"Unknown image format '{fmt}'. Choose from: {', '.join(IMAGE_FORMATS)}")
+        self.start()
+        key = figure_key(fig, fmt, width, height, scale)
+        return self.cache.get_or_compute(
+            key, lambda: pio.to_image(fig, format=fmt, width=width, height=height, scale=scale))
+
+    def stats(self):
+        return self.cache.stats()
+
+
+# One renderer per worker process, started by the pool initializer
+_worker_renderer = None
+
+
+def _init_worker():
+    global _worker_renderer
+    _worker_renderer = ImageRenderer()
+    _worker_renderer.start()
+
+
+def default_jobs():
+    from distributions import dist_registry
+
+    return [{"dist": name, "params": dist_obj.default_params()} for name, dist_obj in dist_registry.items()]
+
+
+def _job_figure(job):
+    from distributions import dist_registry
+    from ui.figures import build_distribution_figure
+
+    dist_obj = dist_registry[job["dist"]]
+    params = dist_obj.default_params()
+    params.update(job.get("params", {}))
+    dist_obj.validate_params(params)
+    x, y_pdf, y_cdf, dist_type = dist_obj.generate_data(params)
+    return build_distribution_figure(job["dist"], x, y_pdf, y_cdf, dist_type, show_cdf=job.get("show_cdf", False))
+
+
+def job_file_stub(job):
+    parts = [table_slug(job["dist"])]
+    parts += [f"{name}={value:g}" for name, value in sorted(job.get("params", {}).items())]
+    return "_".join(parts)
+
+
+def job_file_stubs(jobs):
+    """job_file_stub of each job, with a -2, -3, ... suffix on any that repeats an earlier one."""
+    stubs, taken = [], set()
+    for job in jobs:
+        stub = base = job_file_stub(job)
+        copy = 1
+        while stub in taken:
+            copy += 1
+            stub = f"{base}-{copy}"
+        taken.add(stub)
+        stubs.append(stub)
+    return stubs
+
+
+def _render_jobs(jobs, stubs, out_dir, formats):
+    written = []
+    for job, stub in zip(jobs, stubs):
+        fig = _job_figure(job)
+        for fmt in formats:
+            path = os.path.join(out_dir, f"{stub}.{fmt}")
+            with open(path, "wb") as fh:
+                fh.write(_worker_renderer.render(fig, fmt))
+            written.append(path)
+    return written
+
+
+def render_batch(jobs, out_dir, formats=("png",), workers=None):
+    """Render every job to every format in parallel; returns the written paths in job order."""
+    os.makedirs(out_dir, exist_ok=True)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs)))
+    # Contiguous slices keep each worker's renderer busy without per-figure IPC
+    bounds = np.cumsum([0] + split_sizes(len(jobs), workers))
+    slices = [jobs[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+    # Named up front, so no two jobs write the same file even from different workers
+    stubs = job_file_stubs(jobs)
+    stub_slices = [stubs[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        results = pool.map(_render_jobs, slices, stub_slices, [out_dir] * workers, [formats] * workers)
+        return [path for paths in results for path in paths]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render distribution plots to PNG/SVG in parallel")
+    parser.add_argument("--out", default="report", help="Output directory")
+    parser.add_argument("--format", nargs="+", default=["png"], choices=list(IMAGE_FORMATS))
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--jobs", help="JSON job file; defaults to every registry distribution")
+    args = parser.parse_args(argv)
+
+    if args.jobs:
+        with open(args.jobs) as fh:
+            jobs = json.load(fh)
+    else:
+        jobs = default_jobs()
+
+    start = time.perf_counter()
+    paths = render_batch(jobs, args.out, args.format, args.workers)
+    print(f"Rendered {len(paths)} images to {args.out} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
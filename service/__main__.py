@@ -0,0 +1,30 @@
+import argparse
+import asyncio
+import sys
+
+from .server import DEFAULT_BATCH_WINDOW, DEFAULT_MAX_BATCH, ComputeService
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve pdf/cdf/ppf/stats/samples for every registry distribution over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="Sampling worker processes (default: CPU count)")
+    parser.add_argument("--batch-window-ms", type=float, default=DEFAULT_BATCH_WINDOW * 1000,
+                        help="How long to collect concurrent requests before evaluating them together")
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    args = parser.parse_args(argv)
+
+    service = ComputeService(args.workers, args.batch_window_ms / 1000, args.max_batch)
+    print(f"Serving on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,283 @@
+"""Asynchronous HTTP compute service over dist_registry (stdlib only).
+
+Endpoints (JSON in, JSON out):
+    POST /pdf      {"dist", "params", "x": [...]}     -> {"values": [...]}
+    POST /cdf      {"dist", "params", "x": [...]}     -> {"values": [...]}
+    POST /ppf      {"dist", "params", "q": [...]}     -> {"values": [...]}
+    POST /stats    {"dist", "params"}                 -> {"stats": {...}}
+    POST /samples  {"dist", "params", "size", "seed"} -> {"samples": [...]}
+    GET  /distributions, /health, /metrics
+
+Concurrent pdf/cdf/ppf requests for the same distribution are collected
+for a short window and answered by one broadcast scipy call. Sampling
+runs on a process pool so large draws never block the event loop; its
+workers start from a fork server, so they never inherit the listening
+socket or an open client connection.
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from distributions import dist_registry
+
+MAX_BODY_BYTES = 16 * 1024 * 1024
+MAX_SAMPLES = 1_000_000
+DEFAULT_BATCH_WINDOW = 0.002
+DEFAULT_MAX_BATCH = 256
+LATENCY_WINDOW = 2048
+# Paths reported by /metrics; anything else is counted under "other"
+ENDPOINTS = ("/pdf", "/cdf", "/ppf", "/stats", "/samples", "/distributions", "/health")
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _json_values(values):
+    values = np.asarray(values)
+    if values.dtype.kind in "biu" or np.all(np.isfinite(values)):
+        return values.tolist()
+    # JSON has no NaN/Infinity; report them as null
+    return [v if np.isfinite(v) else None for v in values.tolist()]
+
+
+def _json_scalar(value):
+    if isinstance(value, (int, float, np.number)):
+        value = float(value)
+        return value if np.isfinite(value) else None
+    return value
+
+
+def resolve_request(body):
+    dist_name = body.get("dist")
+    if dist_name not in dist_registry:
+        raise RequestError(404, f"Unknown distribution '{dist_name}'. Choose from: {', '.join(dist_registry)}")
+    dist_obj = dist_registry[dist_name]
+    params = dist_obj.default_params()
+    overrides = body.get("params") or {}
+    if not isinstance(overrides, dict):
+        raise RequestError(400, "'params' must be a JSON object")
+    unknown = set(overrides) - set(dist_obj.param_specs)
+    if unknown:
+        fixed = unknown & set(dist_obj.fixed_params)
+        if fixed:
+            raise RequestError(400, f"{dist_name} fixes {', '.join(sorted(fixed))}; it cannot be set")
+        raise RequestError(400, f"Unknown parameters for {dist_name}: {', '.join(sorted(unknown))}")
+    params.update(overrides)
+    for name, value in params.items():
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise RequestError(400, f"Parameter '{name}' must be a number")
+    try:
+        dist_obj.validate_params(params)
+    except ValueError as e:
+        raise RequestError(400, str(e))
+    return dist_name, dist_obj, params
+
+
+def _draw_samples(dist_name, params, size, seed):
+    return dist_registry[dist_name].generate_samples(params, size, rng=seed)
+
+
+class Metrics:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.requests = defaultdict(int)
+        self.errors = defaultdict(int)
+        self.latencies = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+        self.batches = defaultdict(int)
+        self.batched_requests = defaultdict(int)
+
+    def observe(self, endpoint, seconds, ok):
+        if endpoint not in ENDPOINTS:
+            endpoint = "other"
+        self.requests[endpoint] += 1
+        if not ok:
+            self.errors[endpoint] += 1
+        self.latencies[endpoint].append(seconds)
+
+    def observe_batch(self, op, size):
+        self.batches[op] += 1
+        self.batched_requests[op] += size
+
+    def snapshot(self):
+        uptime = time.monotonic() - self.started
+        endpoints = {}
+        for endpoint, count in self.requests.items():
+            latencies = np.array(self.latencies[endpoint]) * 1000
+            endpoints[endpoint] = {
+                "requests": count,
+                "errors": self.errors[endpoint],
+                "throughput_rps": count / uptime if uptime else 0.0,
+                "latency_ms": {f"p{p}": float(np.percentile(latencies, p)) for p in (50, 95, 99)},
+            }
+        batching = {op: {"batches": n, "mean_batch_size": self.batched_requests[op] / n}
+                    for op, n in self.batches.items()}
+        return {"uptime_seconds": uptime, "endpoints": endpoints, "batching": batching}
+
+
+class MicroBatcher:
+    """Coalesces pdf/cdf/ppf requests per (distribution, operation) into one vectorized call."""
+
+    def __init__(self, metrics, window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH):
+        self.metrics = metrics
+        self.window = window
+        self.max_batch = max_batch
+        self._queues = {}
+
+    async def submit(self, dist_name, op, params, points):
+        key = (dist_name, op)
+        future = asyncio.get_running_loop().create_future()
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = []
+            asyncio.get_running_loop().call_later(self.window, self._flush, key)
+        queue.append((params, points, future))
+        if len(queue) >= self.max_batch:
+            self._flush(key)
+        return await future
+
+    def _flush(self, key):
+        queue = self._queues.pop(key, None)
+        if not queue:
+            return
+        dist_name, op = key
+        dist_obj = dist_registry[dist_name]
+        self.metrics.observe_batch(op, len(queue))
+        try:
+            # Each evaluation point carries its own request's parameters, so a
+            # single elementwise scipy call answers every queued request
+            lengths = [len(points) for _, points, _ in queue]
+            points = np.concatenate([points for _, points, _ in queue])
+            params = {name: np.repeat([p[name] for p, _, _ in queue], lengths)
+                      for name in queue[0][0]}
+            with np.errstate(all="ignore"):
+                values = np.broadcast_to(getattr(dist_obj, op)(points, params), points.shape)
+            for (_, _, future), part in zip(queue, np.split(values, np.cumsum(lengths)[:-1])):
+                if not future.done():
+                    future.set_result(part)
+        except Exception as e:
+            for _, _, future in queue:
+                if not future.done():
+                    future.set_exception(e)
+
+
+class ComputeService:
+    def __init__(self, workers=None, batch_window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH):
+        self.metrics = Metrics()
+        self.batcher = MicroBatcher(self.metrics, batch_window, max_batch)
+        # Forked workers would start lazily mid-request and keep copies of the open sockets
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self.pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count(),
+                                        mp_context=multiprocessing.get_context(start_method))
+
+    async def handle(self, method, path, body):
+        if path == "/health":
+            return {"status": "ok"}
+        if path == "/metrics":
+            return self.metrics.snapshot()
+        if path == "/distributions":
+            return {name: {"type": d.dist_type, "params": d.default_params()} for name, d in dist_registry.items()}
+        if method != "POST":
+            raise RequestError(405 if path in ("/pdf", "/cdf", "/ppf", "/stats", "/samples") else 404,
+                               f"{method} {path} is not supported")
+
+        dist_name, dist_obj, params = resolve_request(body)
+        if path in ("/pdf", "/cdf", "/ppf"):
+            field = "q" if path == "/ppf" else "x"
+            try:
+                points = np.atleast_1d(np.asarray(body[field], dtype=float))
+            except (KeyError, TypeError, ValueError):
+                raise RequestError(400, f"'{field}' must be a number or a list of numbers")
+            values = await self.batcher.submit(dist_name, path[1:], params, points.ravel())
+            return {"values": _json_values(values)}
+        if path == "/stats":
+            return {"stats": {name: _json_scalar(value) for name, value in dist_obj.calculate_stats(params).items()}}
+        if path == "/samples":
+            size = body.get("size", 100)
+            if not isinstance(size, int) or not 0 < size <= MAX_SAMPLES:
+                raise RequestError(400, f"'size' must be an integer between 1 and {MAX_SAMPLES}")
+            seed = body.get("seed")
+            if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int) or seed < 0):
+                raise RequestError(400, "'seed' must be a non-negative integer")
+            samples = await asyncio.get_running_loop().run_in_executor(
+                self.pool, _draw_samples, dist_name, params, size, seed)
+            return {"samples": _json_values(samples)}
+        raise RequestError(404, f"No endpoint {path}")
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        data = json.dumps(payload).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + data)
+        await writer.drain()
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Malformed request line"}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+                start = time.perf_counter()
+                path = urlsplit(target).path
+                status = 200
+                try:
+                    length = int(headers.get("content-length", 0))
+                    if length > MAX_BODY_BYTES:
+                        raise RequestError(413, f"Request body exceeds {MAX_BODY_BYTES} bytes")
+                    raw = await reader.readexactly(length) if length else b""
+                    try:
+                        body = json.loads(raw) if raw else {}
+                    except json.JSONDecodeError:
+                        raise RequestError(400, "Request body is not valid JSON")
+                    if not isinstance(body, dict):
+                        raise RequestError(400, "Request body must be a JSON object")
+                    payload = await self.handle(method, path, body)
+                except RequestError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except Exception as e:
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+                await self._respond(writer, status, payload, keep_alive)
+                if path != "/metrics":
+                    self.metrics.observe(path, time.perf_counter() - start, status == 200)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        server = await asyncio.start_server(self.serve_connection, host, port)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+from batch.jobs import JobError, Manifest, normalize_job, run_batch, run_job
+from distributions import dist_registry
+
+
+def test_misspelled_parameter_is_rejected():
+    with pytest.raises(JobError, match="unknown parameters for Normal: sdt"):
+        normalize_job({"dist": "Normal", "params": {"mean": 1.0, "sdt": 2.0}, "output": "out"}, 3)
+
+
+def test_csv_params_are_checked_too():
+    with pytest.raises(JobError, match="unknown parameters"):
+        normalize_job({"dist": "Poisson", "params": '{"lambda": 3}', "output": "out"}, 2)
+    with pytest.raises(JobError, match="must be an object"):
+        normalize_job({"dist": "Poisson", "params": "[3]", "output": "out"}, 2)
+
+
+def test_out_of_domain_parameter_is_rejected():
+    with pytest.raises(JobError, match="Job 1"):
+        normalize_job({"dist": "Binomial", "params": {"p": 1.2}, "output": "out"}, 1)
+
+
+@pytest.mark.parametrize("seed", [7, None])
+def test_batch_samples_replay_the_seeded_stream(seed, tmp_path):
+    raw = {"dist": "Gamma", "params": {"shape": 3.0}, "samples": 250_000, "output": str(tmp_path / "job")}
+    if seed is not None:
+        raw["seed"] = seed
+    job = normalize_job(raw, 1)
+    _, samples_path = run_job(job, "NPY")
+    written = np.load(samples_path)[:, 0]
+    expected = dist_registry["Gamma"].generate_samples(job["params"], 250_000, rng=np.random.default_rng(job["seed"]))
+    np.testing.assert_array_equal(written, expected)
+    # A rerun of the same job writes the same samples
+    _, again = run_job(normalize_job(raw, 1), "NPY")
+    np.testing.assert_array_equal(np.load(again)[:, 0], written)
+
+
+def test_grid_is_rejected_for_discrete_jobs():
+    with pytest.raises(JobError, match="Poisson is discrete"):
+        normalize_job({"dist": "Poisson", "grid": "0:10:5", "output": "out"}, 4)
+    assert normalize_job({"dist": "Normal", "grid": "0:10:5", "output": "out"}, 4)["grid"]["num"] == 5
+
+
+def _jobs(tmp_path):
+    raws = [
+        {"dist": "Normal", "params": {"std": 2.0}, "grid": "-5:5:11", "output": str(tmp_path / "a")},
+        {"dist": "Normal", "params": {"std": 2.0}, "grid": "-5:5:11", "output": str(tmp_path / "copy" / "a")},
+        {"dist": "Poisson", "params": {"mu": 3.0}, "samples": 100, "output": str(tmp_path / "b")},
+    ]
+    return [normalize_job(raw, i) for i, raw in enumerate(raws, 1)]
+
+
+def test_run_batch_computes_once_and_copies_duplicates(tmp_path):
+    statuses = []
+    counts = run_batch(_jobs(tmp_path), "NPY", workers=1,
+                       progress=lambda finished, total, job, status, seconds: statuses.append(status))
+    assert counts == {"done": 2, "skipped": 0, "duplicates": 1, "failed": 0}
+    assert sorted(statuses) == ["copied", "done", "done"]
+    np.testing.assert_array_equal(np.load(tmp_path / "a.npy"), np.load(tmp_path / "copy" / "a.npy"))
+    assert np.load(tmp_path / "b_samples.npy").shape == (100, 1)
+
+
+def test_manifest_resumes_finished_jobs(tmp_path):
+    path = str(tmp_path / "manifest.jsonl")
+    jobs = _jobs(tmp_path)
+    assert run_batch(jobs, "NPY", workers=1, manifest=Manifest(path))["done"] == 2
+    # A fresh run over the same manifest skips every job whose files are still there
+    assert run_batch(jobs, "NPY", workers=1, manifest=Manifest(path)) == {
+        "done": 0, "skipped": 3, "duplicates": 0, "failed": 0}
+    (tmp_path / "b.npy").unlink()
+    counts = run_batch(jobs, "NPY", workers=1, manifest=Manifest(path))
+    assert counts == {"done": 1, "skipped": 2, "duplicates": 0, "failed": 0}
+
+
+def test_failed_copy_does_not_abort_the_batch(tmp_path):
+    jobs = _jobs(tmp_path)
+    # A file where the duplicate's directory should be makes its copy fail
+    (tmp_path / "copy").write_text("")
+    path = str(tmp_path / "manifest.jsonl")
+    counts = run_batch(jobs, "NPY", workers=1, manifest=Manifest(path))
+    assert counts == {"done": 2, "skipped": 0, "duplicates": 0, "failed": 1}
+    assert not Manifest(path).is_done(jobs[1], "NPY") and Manifest(path).is_done(jobs[2], "NPY")
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from distributions import dist_registry
+from distributions.cache import DistributionCache, LRUCache
+
+
+def test_budget_evicts_least_recently_used():
+    cache = LRUCache(max_bytes=3 * 800)
+    for key in "abc":
+        cache.put(key, np.zeros(100))
+    cache.get("a")
+    cache.put("d", np.zeros(100))
+    assert cache.get("b") is None
+    assert all(cache.get(key) is not None for key in "acd")
+    stats = cache.stats()
+    assert stats["bytes"] == 3 * 800 <= stats["max_bytes"] and stats["evictions"] == 1
+
+
+def test_bytes_never_exceed_the_budget():
+    cache = LRUCache(max_bytes=10_000)
+    rng = np.random.default_rng(0)
+    for i in range(200):
+        cache.put(i, np.zeros(int(rng.integers(1, 600))))
+        assert cache.current_bytes <= cache.max_bytes
+    assert cache.current_bytes == sum(size for _, size in cache._entries.values())
+
+
+def test_oversized_values_are_returned_but_not_kept():
+    cache = LRUCache(max_bytes=100)
+    value = cache.put("big", np.zeros(1000))
+    assert value.shape == (1000,) and cache.get("big") is None and cache.current_bytes == 0
+
+
+def test_cached_arrays_are_read_only():
+    cache = LRUCache()
+    value = cache.put("x", np.arange(5.0))
+    with pytest.raises(ValueError):
+        value[0] = 1.0
+
+
+def test_distribution_cache_reuses_and_normalizes_keys():
+    cache = DistributionCache(dist_registry, max_bytes=1 << 20)
+    first = cache.generate_data("Normal", {"mean": 0.1 + 0.2, "std": 1.0})
+    second = cache.generate_data("Normal", {"mean": 0.3, "std": 1.0})
+    assert first[0] is second[0]
+    assert cache.lru.stats()["hits"] == 1
+    assert cache.lru.current_bytes <= cache.lru.max_bytes
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from distributions import dist_registry
+from distributions.comparison import compare_members, union_grid
+from distributions.grid import DISCRETE_BUDGET, discrete_window
+from distributions.streaming import histogram_range, summarize_samples
+
+
+def test_small_lattice_keeps_every_integer():
+    members = [("Poisson", {"mu": 4.0}), ("Binomial", {"n": 20, "p": 0.5})]
+    _, _, lattice, lattice_width = union_grid(dist_registry, members)
+    assert lattice_width == 1.0
+    np.testing.assert_array_equal(lattice, np.arange(lattice[0], lattice[-1] + 1))
+
+
+def test_wide_lattice_stays_within_the_budget():
+    members = [("Poisson", {"mu": 3.0}), ("Poisson", {"mu": 1e7}), ("Binomial", {"n": 10**9, "p": 0.5})]
+    _, _, lattice, lattice_width = union_grid(dist_registry, members)
+    assert lattice.size <= DISCRETE_BUDGET and lattice_width > 1
+    result = compare_members(dist_registry, members)
+    for member in result["members"]:
+        # Mean probability per integer times the bin width sums to the member's mass
+        assert member["pdf"].sum() * lattice_width == pytest.approx(1.0, abs=1e-9)
+    tv = result["divergences"]["Total Variation"]
+    assert tv[1, 1] == 0.0 and tv[0, 1] == pytest.approx(1.0)
+
+
+def test_binned_divergence_of_close_members():
+    members = [("Poisson", {"mu": 1e6}), ("Poisson", {"mu": 1e6 + 500})]
+    result = compare_members(dist_registry, members)
+    # Both spread over the same bins; shifting the mean by half a standard deviation moves about 0.2 of the mass
+    assert 0.1 < result["divergences"]["Total Variation"][0, 1] < 0.3
+
+
+def test_histogram_range_covers_the_window_in_integer_bins():
+    dist_obj = dist_registry["Poisson"]
+    params = {"mu": 1e6}
+    lo, hi, bins = histogram_range(dist_obj, params)
+    window = discrete_window(dist_obj, params)
+    assert bins <= DISCRETE_BUDGET
+    assert lo <= window[0] - 0.5 and hi >= window[1] + 0.5
+    width = (hi - lo) / bins
+    assert width == np.round(width)
+    _, hist = summarize_samples(dist_obj, params, 100_000, rng=np.random.default_rng(0))
+    assert hist.counts.sum() == 100_000
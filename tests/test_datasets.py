@@ -0,0 +1,60 @@
+import json
+
+import numpy as np
+import pytest
+
+from distributions.datasets import ColumnSource
+from distributions.goodness import main as goodness_main
+
+
+def _values(source):
+    return np.concatenate([values for values, _ in source.chunks()])
+
+
+@pytest.fixture
+def numeric_headers(tmp_path):
+    # Header names that look like positions: "1" is the first column, not the second
+    path = tmp_path / "data.csv"
+    path.write_text("1,0\n" + "".join(f"{i},{-i}\n" for i in range(100)))
+    return str(path)
+
+
+def test_name_and_index_are_distinct(numeric_headers):
+    np.testing.assert_array_equal(_values(ColumnSource(numeric_headers, column="1")), np.arange(100))
+    np.testing.assert_array_equal(_values(ColumnSource(numeric_headers, index=1)), -np.arange(100))
+    np.testing.assert_array_equal(_values(ColumnSource(numeric_headers, column="0")), -np.arange(100))
+
+
+def test_ambiguous_or_missing_columns_are_rejected(numeric_headers):
+    with pytest.raises(TypeError, match="index="):
+        ColumnSource(numeric_headers, column=1)
+    with pytest.raises(ValueError, match="not both"):
+        ColumnSource(numeric_headers, column="1", index=0)
+    with pytest.raises(ValueError, match="No column 'x'"):
+        ColumnSource(numeric_headers, column="x")
+    with pytest.raises(ValueError, match="index 2"):
+        ColumnSource(numeric_headers, index=2)
+
+
+def test_split_keeps_the_column(numeric_headers):
+    source = ColumnSource(numeric_headers, index=1)
+    parts = source.split(3)
+    assert all(part.index == 1 for part in parts)
+    np.testing.assert_array_equal(np.concatenate([_values(part) for part in parts]), -np.arange(100))
+
+
+def test_npy_columns_by_name_and_index(tmp_path):
+    path = str(tmp_path / "data.npy")
+    np.save(path, np.column_stack([np.arange(10.0), np.arange(10.0) * 2]))
+    np.testing.assert_array_equal(_values(ColumnSource(path, column="1")), np.arange(10.0) * 2)
+    np.testing.assert_array_equal(_values(ColumnSource(path, index=0)), np.arange(10.0))
+
+
+def test_cli_column_is_a_name(numeric_headers, capsys):
+    assert goodness_main([numeric_headers, "--column", "1", "--dist", "Uniform", '{"low": 0, "high": 100}',
+                          "--workers", "1"]) == 0
+    by_name = json.loads(capsys.readouterr().out)
+    assert goodness_main([numeric_headers, "--index", "0", "--dist", "Uniform", '{"low": 0, "high": 100}',
+                          "--workers", "1"]) == 0
+    by_index = json.loads(capsys.readouterr().out)
+    assert by_index["results"][0]["tests"] == by_name["results"][0]["tests"]
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from distributions import dist_registry
+from distributions.streaming import summarize_samples
+from export import export_table, samples_table
+
+
+def _exported(dist_name, params, total, seed, tmp_path):
+    path = export_table(samples_table(dist_registry[dist_name], params, total, seed=seed), "NPY",
+                        str(tmp_path / "samples.npy"))
+    return np.load(path)[:, 0]
+
+
+@pytest.mark.parametrize("dist_name", ["Normal", "Gamma", "Binomial", "Poisson", "t-distribution"])
+def test_seeded_export_matches_displayed_samples(dist_name, tmp_path):
+    dist_obj = dist_registry[dist_name]
+    params = dist_obj.default_params()
+    # The app draws with np.random.default_rng(seed) in chunks of its own size
+    stats, _ = summarize_samples(dist_obj, params, 300_000, rng=np.random.default_rng(42))
+    exported = _exported(dist_name, params, 300_000, 42, tmp_path)
+    expected = dist_obj.generate_samples(params, 300_000, rng=np.random.default_rng(42))
+    np.testing.assert_array_equal(exported, expected)
+    assert exported.mean() == pytest.approx(stats.mean, rel=1e-12)
+    assert exported.min() == stats.min and exported.max() == stats.max
+
+
+def test_unseeded_table_replays_the_same_samples(tmp_path):
+    table = samples_table(dist_registry["Normal"], {"mean": 0.0, "std": 1.0}, 1000)
+    first, second = (np.concatenate([chunk["sample"] for chunk in table]) for _ in range(2))
+    np.testing.assert_array_equal(first, second)
@@ -0,0 +1,74 @@
+import math
+
+import numpy as np
+import pytest
+
+from benchmarks.fast_paths import check_agreement
+from distributions import dist_registry
+from distributions.closed_form import set_fast_paths
+
+
+@pytest.mark.parametrize("dist_name", list(dist_registry))
+def test_fast_paths_agree_with_scipy(dist_name):
+    assert check_agreement(dist_name, points=20, grid=100) == []
+
+
+@pytest.mark.parametrize("dist_name, params", [
+    ("Normal", {"mean": 0.0, "std": -1.0}),
+    ("Log-Normal", {"mean": 0.0, "std": 0.0}),
+    ("Gamma", {"shape": -2.0, "scale": 1.0}),
+    ("Beta", {"a": 2.0, "b": -1.0}),
+    ("t-distribution", {"df": 0.0}),
+    ("Binomial", {"n": 10, "p": 1.5}),
+    ("Poisson", {"mu": -1.0}),
+])
+def test_fast_paths_are_nan_outside_the_domain(dist_name, params):
+    dist_obj = dist_registry[dist_name]
+    x = np.linspace(-1, 3, 9)
+    previous = set_fast_paths(True)
+    try:
+        for name in dist_obj.closed_form_methods:
+            with np.errstate(all="ignore"):
+                values = getattr(dist_obj, name)(np.clip(x, 0, 1) if name == "ppf" else x, params)
+            assert np.isnan(values).all(), name
+    finally:
+        set_fast_paths(previous)
+
+
+def test_fast_paths_mask_only_the_invalid_rows():
+    dist_obj = dist_registry["Normal"]
+    params = {"mean": 0.0, "std": np.array([1.0, -1.0])}
+    previous = set_fast_paths(True)
+    try:
+        values = dist_obj.cdf(1.0, params)
+    finally:
+        set_fast_paths(previous)
+    assert values[0] == pytest.approx(0.8413447460685429) and np.isnan(values[1])
+
+
+@pytest.mark.parametrize("dist_name", list(dist_registry))
+def test_scipy_path_uses_scipy_tails(dist_name):
+    dist_obj = dist_registry[dist_name]
+    params = dist_obj.default_params()
+    rv, kwargs = dist_obj.scipy_args(params)
+    x = np.asarray(dist_obj.ppf(np.array([1e-12, 0.5, 1 - 1e-12]), params), dtype=float)
+    previous = set_fast_paths(False)
+    try:
+        for name in ("sf", "logsf", "logcdf"):
+            np.testing.assert_array_equal(getattr(dist_obj, name)(x, params), getattr(rv, name)(x, **kwargs),
+                                          err_msg=name)
+    finally:
+        set_fast_paths(previous)
+
+
+def test_far_tail_log_survival():
+    # 1 - cdf(9) is exactly 0 in double precision; erfc keeps the tail
+    dist_obj = dist_registry["Normal"]
+    expected = math.log(math.erfc(9 / math.sqrt(2)) / 2)
+    for fast in (True, False):
+        previous = set_fast_paths(fast)
+        try:
+            value = dist_obj.logsf(9.0, {"mean": 0.0, "std": 1.0})
+        finally:
+            set_fast_paths(previous)
+        assert value == pytest.approx(expected, rel=1e-12)
@@ -0,0 +1,45 @@
+import numpy as np
+import plotly.graph_objects as go
+import pytest
+
+from ui.figures import WEBGL_THRESHOLD, downsample, line_trace, lttb_indices
+
+
+@pytest.mark.parametrize("n, threshold", [(10_000, 1200), (1201, 1200), (50, 3)])
+def test_lttb_keeps_endpoints_and_size(n, threshold):
+    x = np.linspace(-5, 5, n)
+    indices = lttb_indices(x, np.exp(-x ** 2), threshold)
+    assert indices.size == threshold
+    assert indices[0] == 0 and indices[-1] == n - 1
+    # One point per bucket, in order: the kept x stay strictly increasing
+    assert (np.diff(x[indices]) > 0).all()
+
+
+def test_lttb_keeps_a_spike():
+    x = np.arange(10_000, dtype=float)
+    y = np.zeros_like(x)
+    y[4321] = 1.0
+    assert 4321 in lttb_indices(x, y, 100)
+
+
+def test_lttb_leaves_short_series_alone():
+    x = np.arange(10.0)
+    np.testing.assert_array_equal(lttb_indices(x, x, 20), np.arange(10))
+    kept_x, _ = downsample(x, x, budget=20)
+    np.testing.assert_array_equal(kept_x, x)
+
+
+def test_lttb_tolerates_non_finite_values():
+    x = np.linspace(0, 1, 5000)
+    with np.errstate(divide="ignore"):
+        y = 1 / x
+    indices = lttb_indices(x, y, 500)
+    assert indices.size == 500 and indices[0] == 0
+
+
+def test_trace_type_follows_the_input_length():
+    long_x = np.linspace(0, 1, WEBGL_THRESHOLD + 1)
+    trace = line_trace(long_x, long_x)
+    assert isinstance(trace, go.Scattergl) and len(trace.x) < long_x.size
+    short_x = np.linspace(0, 1, WEBGL_THRESHOLD)
+    assert isinstance(line_trace(short_x, short_x), go.Scatter)
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from distributions import dist_registry
+from distributions.datasets import ColumnSource
+from distributions.fitting import (FitStatistics, NEWTON_FITS, StencilNewton, SUFFICIENT_FITS, candidate_families,
+                                   fit_dataset)
+
+ROWS = 20_000
+
+
+def _source(tmp_path, values):
+    path = tmp_path / "data.npy"
+    np.save(path, np.asarray(values, dtype=float))
+    return ColumnSource(str(path))
+
+
+def _fits(report):
+    return {fit["dist_name"]: fit for fit in report["fits"]}
+
+
+# (family, true params, sampler); sample sizes give relative standard errors well below 5%
+RECOVERY = [
+    ("Normal", {"mean": 3.0, "std": 2.0}, lambda rng: rng.normal(3.0, 2.0, ROWS)),
+    ("Log-Normal", {"mean": 0.5, "std": 0.8}, lambda rng: rng.lognormal(0.5, 0.8, ROWS)),
+    ("Exponential", {"scale": 2.5}, lambda rng: rng.exponential(2.5, ROWS)),
+    ("Gamma", {"shape": 2.0, "scale": 3.0}, lambda rng: rng.gamma(2.0, 3.0, ROWS)),
+    ("Chi-square", {"df": 4.0}, lambda rng: rng.chisquare(4.0, ROWS)),
+    ("Beta", {"a": 2.0, "b": 5.0}, lambda rng: rng.beta(2.0, 5.0, ROWS)),
+    ("Uniform", {"low": -1.0, "high": 4.0}, lambda rng: rng.uniform(-1.0, 4.0, ROWS)),
+    ("t-distribution", {"df": 5.0}, lambda rng: rng.standard_t(5.0, ROWS)),
+    ("F-distribution", {"dfn": 8.0, "dfd": 20.0}, lambda rng: rng.f(8.0, 20.0, ROWS)),
+    ("Poisson", {"mu": 4.0}, lambda rng: rng.poisson(4.0, ROWS)),
+    ("Binomial", {"n": 12, "p": 0.3}, lambda rng: rng.binomial(12, 0.3, ROWS)),
+    ("Bernoulli", {"p": 0.3}, lambda rng: rng.binomial(1, 0.3, ROWS)),
+]
+
+
+@pytest.mark.parametrize("dist_name, params, sample", RECOVERY, ids=[case[0] for case in RECOVERY])
+def test_fit_dataset_recovers_parameters(tmp_path, dist_name, params, sample):
+    report = fit_dataset(_source(tmp_path, sample(np.random.default_rng(7))), families=[dist_name], workers=1)
+    fitted = _fits(report)[dist_name]["params"]
+    for name, value in params.items():
+        assert fitted[name] == pytest.approx(value, rel=0.1), name
+
+
+@pytest.mark.parametrize("dist_name, sample, reference", [
+    ("Gamma", lambda rng: rng.gamma(0.7, 2.0, 5000), lambda x: stats.gamma.fit(x, floc=0)),
+    ("Beta", lambda rng: rng.beta(0.6, 3.0, 5000), lambda x: stats.beta.fit(x, floc=0, fscale=1)),
+    ("Chi-square", lambda rng: rng.chisquare(3.0, 5000), lambda x: stats.chi2.fit(x, floc=0, fscale=1)),
+], ids=["Gamma", "Beta", "Chi-square"])
+def test_sufficient_fits_are_the_mle(dist_name, sample, reference):
+    # Same data, same likelihood: the closed-form and Newton solutions must agree with scipy's optimizer
+    x = sample(np.random.default_rng(11))
+    params, ll = SUFFICIENT_FITS[dist_name](FitStatistics().update(x))
+    expected = reference(x)
+    shapes = [params[name] for name in ("shape", "a", "b", "df") if name in params]
+    np.testing.assert_allclose(shapes, expected[:len(shapes)], rtol=1e-3)
+    if dist_name == "Gamma":
+        assert params["scale"] == pytest.approx(expected[2], rel=1e-3)
+    assert ll == pytest.approx(np.sum(dist_registry[dist_name].logpdf(x, params)), rel=1e-10)
+
+
+def test_stencil_newton_finds_the_t_maximum():
+    x = np.random.default_rng(3).standard_t(4.0, 5000)
+    start_fn, bounds = NEWTON_FITS["t-distribution"]
+    search = StencilNewton(start_fn(FitStatistics().update(x)), bounds)
+    while not search.done:
+        search.update([np.sum(stats.t.logpdf(x, **candidate)) for candidate in search.candidates()])
+    params, ll = search.result()
+    expected_df = stats.t.fit(x, floc=0, fscale=1)[0]
+    assert params["df"] == pytest.approx(expected_df, rel=1e-2)
+    assert ll == pytest.approx(np.sum(stats.t.logpdf(x, expected_df)), abs=1e-2)
+
+
+def test_wide_integer_data_keep_the_continuous_families(tmp_path):
+    x = np.round(np.random.default_rng(5).gamma(2.0, 50.0, 5000))
+    # Gamma needs positive data; a rounded zero would rule it out
+    assert x.min() > 0
+    report = fit_dataset(_source(tmp_path, x), workers=1)
+    fits = _fits(report)
+    assert {"Gamma", "Poisson", "Normal"} <= set(fits)
+    assert fits["Gamma"]["params"]["shape"] == pytest.approx(2.0, rel=0.1)
+    assert report["fits"][0]["dist_name"] == "Gamma"
+
+    report = fit_dataset(_source(tmp_path, x), workers=1, continuous=False)
+    assert "Gamma" not in _fits(report)
+    assert report["not_fitted"]["Gamma"] == "continuous family, integer data"
+
+
+def test_negative_integers_are_fitted_with_continuous_families(tmp_path):
+    x = np.random.default_rng(9).integers(-3, 4, 1000)
+    report = fit_dataset(_source(tmp_path, x), workers=1)
+    assert "Normal" in _fits(report) and "Uniform" in _fits(report)
+    assert report["not_fitted"]["Poisson"] == "discrete family, negative data"
+
+
+def test_small_counts_get_only_the_discrete_families():
+    candidates, skipped = candidate_families(FitStatistics().update(np.random.default_rng(1).poisson(3.0, 500)))
+    assert candidates == ["Poisson", "Binomial", "Bernoulli"]
+    assert skipped["Normal"] == "continuous family, integer data"
+    candidates, skipped = candidate_families(FitStatistics().update([0.5, 1.5, 2.0]))
+    assert "Poisson" not in candidates and skipped["Poisson"] == "discrete family, continuous data"
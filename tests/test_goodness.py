@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from distributions import dist_registry
+from distributions.datasets import SampleSource
+from distributions.goodness import run_tests
+
+
+def _values(source):
+    return np.concatenate([values for part in source.split(4) for values, _ in part.chunks()])
+
+
+def test_sample_source_reproduces_the_displayed_stream():
+    params = {"mean": 1.0, "std": 2.0}
+    source = SampleSource("Normal", params, 100_000, seed=42)
+    expected = dist_registry["Normal"].generate_samples(params, 100_000, rng=np.random.default_rng(42))
+    np.testing.assert_array_equal(_values(source), expected)
+
+
+def test_independent_streams_split_and_replay():
+    source = SampleSource("Poisson", {"mu": 3.0}, 50_000, seed=7, streams=True)
+    np.testing.assert_array_equal(_values(source), _values(SampleSource("Poisson", {"mu": 3.0}, 50_000, seed=7,
+                                                                       streams=True)))
+    assert sum(part.total for part in source.split(3)) == 50_000
+
+
+@pytest.mark.parametrize("mode", ["Chunked", "Sorted Runs"])
+def test_tests_run_on_the_seeded_draws(mode, tmp_path):
+    params = {"mean": 0.0, "std": 1.0}
+    values = dist_registry["Normal"].generate_samples(params, 2_000, rng=np.random.default_rng(42))
+    report = run_tests(SampleSource("Normal", params, 2_000, seed=42), [("Normal", params)], mode,
+                       workers=1, run_dir=str(tmp_path))
+    ks = report["results"][0]["tests"]["Kolmogorov-Smirnov"]
+    exact = stats.kstest(values, "norm")
+    assert ks["statistic"] == pytest.approx(exact.statistic, abs=1e-6)
+
+
+@pytest.fixture(scope="module")
+def normal_reports():
+    params = {"mean": 0.0, "std": 1.0}
+    reports = {}
+    for seed in (1, 2):
+        values = dist_registry["Normal"].generate_samples(params, 2_000, rng=np.random.default_rng(seed))
+        tests = {mode: run_tests(SampleSource("Normal", params, 2_000, seed=seed), [("Normal", params)], mode,
+                                 workers=1)["results"][0]["tests"] for mode in ("Chunked", "Sorted Runs")}
+        reports[seed] = values, tests
+    return reports
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+@pytest.mark.parametrize("mode, rel", [("Sorted Runs", 1e-9), ("Chunked", 1e-3)])
+def test_anderson_darling_matches_scipy(normal_reports, seed, mode, rel):
+    values, tests = normal_reports[seed]
+    ad = tests[mode]["Anderson-Darling"]
+    reference = stats.goodness_of_fit(stats.norm, values, known_params={"loc": 0.0, "scale": 1.0}, statistic="ad",
+                                      n_mc_samples=4_000, rng=np.random.default_rng(0))
+    assert ad["statistic"] == pytest.approx(reference.statistic, rel=rel)
+    # scipy's p-value is Monte Carlo: standard error below 0.008 at 4000 draws
+    assert ad["p_value"] == pytest.approx(reference.pvalue, abs=0.03)
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+@pytest.mark.parametrize("mode, rel", [("Sorted Runs", 1e-9), ("Chunked", 1e-3)])
+def test_cramer_von_mises_matches_scipy(normal_reports, seed, mode, rel):
+    values, tests = normal_reports[seed]
+    cvm = tests[mode]["Cramér-von Mises"]
+    reference = stats.cramervonmises(values, "norm")
+    assert cvm["statistic"] == pytest.approx(reference.statistic, rel=rel)
+    # Asymptotic against scipy's finite-n distribution
+    assert cvm["p_value"] == pytest.approx(reference.pvalue, abs=2e-3)
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_chi_square_matches_scipy(normal_reports, seed):
+    values, tests = normal_reports[seed]
+    for mode in ("Chunked", "Sorted Runs"):
+        chi2 = tests[mode]["Chi-square"]
+        observed, _ = np.histogram(stats.norm.cdf(values), bins=chi2["bins"], range=(0.0, 1.0))
+        reference = stats.chisquare(observed)
+        assert chi2["statistic"] == pytest.approx(reference.statistic, rel=1e-12)
+        assert chi2["p_value"] == pytest.approx(reference.pvalue, rel=1e-9)
+
+
+@pytest.mark.parametrize("mode", ["Chunked", "Sorted Runs"])
+def test_discrete_tests_match_scipy(mode):
+    # Every value of Binomial(4, 0.5) expects well over 5 of 2000 draws, so no bins are pooled
+    params = {"n": 4, "p": 0.5}
+    values = dist_registry["Binomial"].generate_samples(params, 2_000, rng=np.random.default_rng(3))
+    tests = run_tests(SampleSource("Binomial", params, 2_000, seed=3), [("Binomial", params)], mode,
+                      workers=1)["results"][0]["tests"]
+    k = np.arange(5)
+    counts = np.bincount(values, minlength=5)
+    reference = stats.chisquare(counts, 2_000 * stats.binom.pmf(k, 4, 0.5))
+    assert tests["Chi-square"]["bins"] == 5
+    assert tests["Chi-square"]["statistic"] == pytest.approx(reference.statistic, rel=1e-12)
+    assert tests["Chi-square"]["p_value"] == pytest.approx(reference.pvalue, rel=1e-9)
+    d = np.max(np.abs(np.cumsum(counts) / 2_000 - stats.binom.cdf(k, 4, 0.5)))
+    assert tests["Kolmogorov-Smirnov"]["statistic"] == pytest.approx(d, rel=1e-12)
+    assert tests["Kolmogorov-Smirnov"]["p_value"] == pytest.approx(stats.kstwo.sf(d, 2_000), rel=1e-12)
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from distributions import dist_registry
+from distributions.grid import DEFAULT_BUDGET, INITIAL_POINTS, adaptive_grid, refine_grid
+
+CONTINUOUS = [name for name, dist_obj in dist_registry.items() if dist_obj.dist_type == "PDF"]
+
+
+@pytest.mark.parametrize("budget", [2, 10, INITIAL_POINTS, 200, 1000])
+def test_refine_grid_respects_the_budget_and_endpoints(budget):
+    x, y = refine_grid(lambda t: np.exp(-t ** 2 / 0.01), -3.0, 3.0, budget=budget)
+    assert 2 <= x.size <= budget and x.size == y.size
+    assert (x[0], x[-1]) == (-3.0, 3.0)
+    assert (np.diff(x) > 0).all()
+    np.testing.assert_array_equal(y, np.exp(-x ** 2 / 0.01))
+
+
+def test_refine_grid_meets_the_tolerance():
+    func = lambda t: np.exp(-t ** 2 / 0.02)
+    x, y = refine_grid(func, -3.0, 3.0, budget=2000, tol=1e-3)
+    dense = np.linspace(-3.0, 3.0, 100_001)
+    # Midpoint errors bound the interpolation error of a smooth curve up to a small factor
+    assert np.max(np.abs(np.interp(dense, x, y) - func(dense))) < 2e-3
+    assert x.size < 2000
+
+
+def test_refine_grid_spends_points_where_the_curve_bends():
+    x, _ = refine_grid(lambda t: np.exp(-t ** 2 / 0.01), -3.0, 3.0, budget=200)
+    assert np.sum(np.abs(x) < 0.5) > np.sum(np.abs(x) > 1.0)
+
+
+def test_refine_grid_stops_at_a_singularity():
+    # An integrable pole at the left edge must not swallow the whole budget
+    with np.errstate(divide="ignore"):
+        x, y = refine_grid(lambda t: 1 / np.sqrt(t), 0.0, 4.0, budget=200)
+    assert x.size <= 200 and np.isinf(y[0])
+    assert np.min(np.diff(x)) >= 4.0 / (200 * 64)
+
+
+def test_refine_grid_stays_uniform_for_straight_lines():
+    x, _ = refine_grid(lambda t: 2 * t + 1, 0.0, 1.0, budget=200)
+    np.testing.assert_allclose(x, np.linspace(0.0, 1.0, INITIAL_POINTS))
+
+
+@pytest.mark.parametrize("dist_name", CONTINUOUS)
+def test_adaptive_grid_spans_the_plot_range(dist_name):
+    dist_obj = dist_registry[dist_name]
+    params = dist_obj.default_params()
+    x = adaptive_grid(dist_obj, params)
+    lo, hi = dist_obj.grid_bounds(params)
+    assert (x[0], x[-1]) == (lo, hi)
+    assert x.size <= DEFAULT_BUDGET and (np.diff(x) > 0).all()
+
+
+@pytest.mark.parametrize("dist_name, params, support", [
+    ("Beta", {"a": 0.5, "b": 0.5}, (0.0, 1.0)),
+    ("Exponential", {"scale": 2.0}, (0.0, None)),
+    ("Gamma", {"shape": 0.5, "scale": 1.0}, (0.0, None)),
+])
+def test_adaptive_grid_reaches_finite_support_ends(dist_name, params, support):
+    x = adaptive_grid(dist_registry[dist_name], params, budget=120)
+    assert x.size <= 120
+    assert x[0] == support[0]
+    if support[1] is not None:
+        assert x[-1] == support[1]
+
+
+def test_adaptive_grid_resolves_jumps():
+    # Uniform pads its support by one on each side; refinement closes in on both jumps
+    x = adaptive_grid(dist_registry["Uniform"], {"low": -1.0, "high": 2.0})
+    assert (x[0], x[-1]) == (-2.0, 3.0)
+    for jump in (-1.0, 2.0):
+        assert np.min(np.abs(x - jump)) < 0.01
@@ -0,0 +1,19 @@
+from export.images import job_file_stub, job_file_stubs
+
+
+def test_shortened_names_that_clash_get_a_suffix():
+    jobs = [
+        {"dist": "Normal", "params": {"mean": 0.1, "std": 1}},
+        {"dist": "Normal", "params": {"mean": 0.1000001, "std": 1}},
+        {"dist": "Normal", "params": {"mean": 0.2, "std": 1}},
+        {"dist": "Normal", "params": {"mean": 0.10000001, "std": 1}},
+    ]
+    assert job_file_stub(jobs[0]) == job_file_stub(jobs[1])
+    stubs = job_file_stubs(jobs)
+    assert stubs == ["normal_mean=0.1_std=1", "normal_mean=0.1_std=1-2", "normal_mean=0.2_std=1",
+                     "normal_mean=0.1_std=1-3"]
+
+
+def test_distinct_names_are_unchanged():
+    jobs = [{"dist": "Poisson", "params": {"mu": mu}} for mu in (1, 2, 3)]
+    assert job_file_stubs(jobs) == [job_file_stub(job) for job in jobs]
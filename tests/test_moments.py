@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from distributions import dist_registry
+from distributions.moments import moment_summary, stats_table
+
+DISCRETE = [
+    ("Binomial", {"n": 20, "p": 0.5}, stats.binom(20, 0.5)),
+    ("Binomial", {"n": 37, "p": 0.13}, stats.binom(37, 0.13)),
+    ("Poisson", {"mu": 4.0}, stats.poisson(4.0)),
+    ("Poisson", {"mu": 0.3}, stats.poisson(0.3)),
+    ("Bernoulli", {"p": 0.3}, stats.bernoulli(0.3)),
+]
+
+
+@pytest.mark.parametrize("dist_name, params, reference", DISCRETE)
+def test_discrete_moments_match_scipy(dist_name, params, reference):
+    summary = moment_summary(dist_registry[dist_name], params)
+    mean, variance, skewness, excess = reference.stats("mvsk")
+    assert summary["Mean"] == pytest.approx(mean, rel=1e-14)
+    assert summary["Variance"] == pytest.approx(variance, rel=1e-14)
+    assert summary["Skewness"] == pytest.approx(skewness, rel=1e-12, abs=1e-15)
+    assert summary["Kurtosis"] == pytest.approx(excess + 3, rel=1e-12)
+    assert summary["Entropy"] == pytest.approx(reference.entropy(), rel=1e-12)
+
+
+def test_default_stats_are_exact():
+    assert dist_registry["Poisson"].calculate_stats({"mu": 4.0})["Mean"] == 4.0
+    assert dist_registry["Binomial"].calculate_stats({"n": 20, "p": 0.5})["Variance"] == 5.0
+
+
+@pytest.mark.parametrize("dist_name, params, variance", [
+    ("Poisson", {"mu": 1e12}, 1e12),
+    ("Binomial", {"n": 10 ** 9, "p": 0.3}, 2.1e8),
+])
+def test_huge_supports_use_closed_forms(dist_name, params, variance):
+    stats_ = dist_registry[dist_name].calculate_stats(params)
+    assert stats_["Variance"] == pytest.approx(variance, rel=1e-12)
+    # Entropy of a near-normal lattice distribution
+    assert stats_["Entropy"] == pytest.approx(0.5 * np.log(2 * np.pi * np.e * variance), rel=1e-9)
+
+
+def test_entropy_series_joins_the_support_sum():
+    # Either side of the switch to the large-variance expansion
+    mu = np.array([9_000.0, 11_000.0])
+    entropy = stats_table(dist_registry["Poisson"], {"mu": mu})["Entropy"]
+    exact = [-np.sum(stats.poisson(m).pmf(np.arange(int(m) - 1000, int(m) + 1000))
+                     * stats.poisson(m).logpmf(np.arange(int(m) - 1000, int(m) + 1000))) for m in mu]
+    np.testing.assert_allclose(entropy, exact, rtol=1e-11)
+
+
+def test_continuous_moments_match_scipy():
+    summary = moment_summary(dist_registry["Gamma"], {"shape": 2.5, "scale": 1.5})
+    mean, variance, skewness, excess = stats.gamma(2.5, scale=1.5).stats("mvsk")
+    assert summary["Mean"] == pytest.approx(mean)
+    assert summary["Variance"] == pytest.approx(variance)
+    assert summary["Skewness"] == pytest.approx(skewness)
+    assert summary["Kurtosis"] == pytest.approx(excess + 3)
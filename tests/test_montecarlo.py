@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from distributions import dist_registry
+from distributions.grid import lattice_bins
+from distributions.montecarlo import run_monte_carlo, theoretical_sampling_distribution
+
+
+@pytest.mark.parametrize("dist_name, params, n", [
+    ("Poisson", {"mu": 4.0}, 10),
+    ("Poisson", {"mu": 400.0}, 30),
+    ("Binomial", {"n": 2000, "p": 0.3}, 5),
+])
+def test_discrete_max_reference_matches_the_histogram_density(dist_name, params, n):
+    dist_obj = dist_registry[dist_name]
+    values = run_monte_carlo(dist_name, params, n, 20_000, "Max", seed=1, workers=1)
+    edges, width = lattice_bins(values.min(), values.max(), 50)
+    density, _ = np.histogram(values, bins=edges, density=True)
+    centers = 0.5 * (edges[:-1] + edges[1:])
+    reference = theoretical_sampling_distribution(dist_obj, params, n, "Max", centers, bin_width=width)
+    # Both are per unit of x: they integrate to about 1 over the bins and agree bar by bar
+    assert reference.sum() * width == pytest.approx(1.0, abs=1e-3)
+    assert np.abs(density - reference).max() * width < 0.02
+
+
+def test_unit_bins_give_the_pmf_of_the_max():
+    dist_obj = dist_registry["Binomial"]
+    params = {"n": 10, "p": 0.5}
+    k = np.arange(11.0)
+    expected = dist_obj.cdf(k, params) ** 3 - dist_obj.cdf(k - 1, params) ** 3
+    np.testing.assert_allclose(theoretical_sampling_distribution(dist_obj, params, 3, "Max", k), expected)
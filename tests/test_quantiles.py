@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from distributions import dist_registry
+from distributions.closed_form import set_fast_paths
+from distributions.quantiles import QuantileEngine
+
+LEVELS = np.concatenate([np.linspace(1e-6, 1 - 1e-6, 1001), np.logspace(-14, -3, 23), 1 - np.logspace(-14, -3, 23),
+                         [0.0, 1.0]])
+
+CASES = [(name, dist_obj.default_params()) for name, dist_obj in dist_registry.items()] + [
+    ("F-distribution", {"dfn": 5.0, "dfd": 2.0}),
+    ("Gamma", {"shape": 0.5, "scale": 2.0}),
+    ("Beta", {"a": 0.5, "b": 0.5}),
+    ("Log-Normal", {"mean": 1.0, "std": 2.0}),
+]
+
+
+@pytest.mark.parametrize("fast", [True, False], ids=["fast", "scipy"])
+@pytest.mark.parametrize("dist_name, params", CASES)
+def test_engine_matches_ppf(dist_name, params, fast):
+    dist_obj = dist_registry[dist_name]
+    previous = set_fast_paths(fast)
+    try:
+        values = QuantileEngine(dist_registry).ppf(dist_name, params, LEVELS)
+        with np.errstate(all="ignore"):
+            expected = dist_obj.ppf(LEVELS, params)
+            scale = dist_obj.ppf(0.75, params) - dist_obj.ppf(0.25, params)
+    finally:
+        set_fast_paths(previous)
+    # Relative error, measured against the interquartile range near zero
+    np.testing.assert_allclose(values, expected, rtol=1e-12, atol=1e-12 * scale)
+
+
+def test_engine_keeps_the_input_shape():
+    levels = np.array([[0.1, 0.5], [0.9, 0.99]])
+    values = QuantileEngine(dist_registry).ppf("Gamma", {"shape": 2.0, "scale": 2.0}, levels)
+    assert values.shape == levels.shape
+    np.testing.assert_allclose(values, dist_registry["Gamma"].ppf(levels, {"shape": 2.0, "scale": 2.0}), rtol=1e-12)
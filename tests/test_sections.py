@@ -0,0 +1,100 @@
+import numpy as np
+
+from ui.sections import REASON_CHARS, SectionGraph
+
+
+class Counter:
+    """compute() stand-in that counts its calls and returns the call number."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.calls
+
+
+def test_unchanged_inputs_reuse_the_value():
+    graph, compute = SectionGraph(), Counter()
+    for _ in range(3):
+        graph.begin_run()
+        assert graph.run("curve", {"dist": "Normal", "params": {"mean": 0.0}}, compute) == 1
+    assert compute.calls == 1 and graph.reused == ["curve"]
+    assert [entry["reason"] for entry in graph.entries()] == ["first run"]
+
+
+def test_upstream_change_recomputes_dependents():
+    graph, curve, plot, table = SectionGraph(), Counter(), Counter(), Counter()
+
+    def rerun(mean):
+        graph.begin_run()
+        graph.run("curve", {"params": {"mean": mean}}, curve)
+        graph.run("plot", {"show_cdf": False}, plot, after=("curve",))
+        graph.run("table", {"rows": 3}, table)
+
+    rerun(0.0)
+    rerun(0.0)
+    assert (curve.calls, plot.calls, table.calls) == (1, 1, 1)
+    rerun(1.0)
+    assert (curve.calls, plot.calls, table.calls) == (2, 2, 1)
+    assert graph.reused == ["table"]
+    latest = graph.entries()[0]
+    assert (latest["section"], latest["reason"]) == ("plot", "curve changed")
+
+
+def test_upstream_that_did_not_run_counts_as_changed():
+    graph, plot = SectionGraph(), Counter()
+    graph.begin_run()
+    graph.run("curve", {}, Counter())
+    graph.run("plot", {}, plot, after=("curve",))
+    # A run where the upstream section was skipped (e.g. hidden) must not reuse the old plot
+    graph.begin_run()
+    graph.run("plot", {}, plot, after=("curve",))
+    assert plot.calls == 2 and graph.entries()[0]["reason"] == "curve changed"
+
+
+def test_float_rounding_and_containers_are_frozen():
+    graph, compute = SectionGraph(), Counter()
+    graph.begin_run()
+    graph.run("curve", {"p": 0.1 + 0.2, "range": [0, 1], "n": np.int64(5), "flag": np.bool_(True)}, compute)
+    graph.begin_run()
+    graph.run("curve", {"p": 0.3, "range": (0, 1), "n": 5, "flag": True}, compute)
+    assert compute.calls == 1
+    # A real change well above the rounding is still seen
+    graph.begin_run()
+    graph.run("curve", {"p": 0.3 + 1e-9, "range": (0, 1), "n": 5, "flag": True}, compute)
+    assert compute.calls == 2
+
+
+def test_large_integer_seeds_stay_exact():
+    graph, compute = SectionGraph(), Counter()
+    seed = np.uint64(2 ** 63 + 1)
+    graph.begin_run()
+    graph.run("samples", {"seed": seed}, compute)
+    graph.begin_run()
+    graph.run("samples", {"seed": seed + np.uint64(1)}, compute)
+    assert compute.calls == 2
+
+
+def test_change_log_reasons():
+    graph = SectionGraph()
+    graph.begin_run()
+    graph.run("curve", {"dist": "Normal", "params": {"mean": 0.0, "std": 1.0}, "grid": "x" * REASON_CHARS}, Counter())
+    graph.begin_run()
+    graph.run("curve", {"dist": "Normal", "params": {"mean": 2.0, "std": 1.0}, "grid": "y" * REASON_CHARS}, Counter())
+    entry = graph.entries()[0]
+    # Parameter dicts report the parameter that moved; long values are named without quoting them
+    assert entry["reason"] == "grid, params.mean: 0.0 → 2.0"
+    assert entry["run"] == 2 and entry["section"] == "curve" and entry["ms"] >= 0
+
+
+def test_log_size_and_attach():
+    state = {}
+    graph = SectionGraph.attach(state)
+    assert SectionGraph.attach(state) is graph
+    small = SectionGraph(log_size=2)
+    for i in range(5):
+        small.begin_run()
+        small.run("curve", {"i": i}, Counter())
+    assert [entry["run"] for entry in small.entries()] == [5, 4]
+    assert small.value("curve") == 1 and small.value("missing") is None
@@ -0,0 +1,119 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+from scipy import stats
+
+from distributions import dist_registry
+from service.server import ComputeService, RequestError, resolve_request
+
+
+def test_defaults_are_inside_every_domain():
+    for dist_name, dist_obj in dist_registry.items():
+        params = dist_obj.default_params()
+        dist_obj.validate_params(params)
+        assert dist_obj.domain_mask(params), dist_name
+
+
+@pytest.mark.parametrize("dist_name, params", [
+    ("Normal", {"std": -1}),
+    ("Normal", {"std": 0}),
+    ("Log-Normal", {"std": -0.5}),
+    ("Chi-square", {"df": 0}),
+    ("t-distribution", {"df": -2}),
+    ("F-distribution", {"dfd": 0}),
+    ("Beta", {"a": -1}),
+    ("Gamma", {"scale": 0}),
+    ("Exponential", {"scale": -1}),
+    ("Uniform", {"low": 2, "high": 1}),
+    ("Binomial", {"n": 2.5}),
+    ("Binomial", {"n": -1}),
+    ("Binomial", {"p": 1.5}),
+    ("Bernoulli", {"p": -0.1}),
+    ("Poisson", {"mu": -1}),
+    ("Normal", {"mean": float("inf")}),
+])
+def test_out_of_domain_parameters_are_rejected(dist_name, params):
+    with pytest.raises(RequestError) as raised:
+        resolve_request({"dist": dist_name, "params": params})
+    assert raised.value.status == 400
+
+
+def test_edge_of_domain_is_accepted():
+    resolve_request({"dist": "Binomial", "params": {"n": 0, "p": 1.0}})
+    resolve_request({"dist": "Poisson", "params": {"mu": 0}})
+
+
+def test_fixed_parameters_cannot_be_overridden():
+    with pytest.raises(RequestError, match="fixes mean") as raised:
+        resolve_request({"dist": "Standard Normal", "params": {"mean": 5}})
+    assert raised.value.status == 400
+
+
+async def _request(port, method, path, body=None, close=True):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    data = json.dumps(body).encode() if body is not None else b""
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(data)}\r\n"
+                  f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n").encode() + data)
+    await writer.drain()
+    # A closing response must reach EOF: nothing else may hold the connection open
+    raw = await asyncio.wait_for(reader.read(), timeout=60)
+    writer.close()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+def _with_service(scenario, **options):
+    async def main():
+        service = ComputeService(workers=1, **options)
+        server = await asyncio.start_server(service.serve_connection, "127.0.0.1", 0)
+        try:
+            return await scenario(service, server.sockets[0].getsockname()[1])
+        finally:
+            server.close()
+            service.close()
+    return asyncio.run(main())
+
+
+def test_http_round_trip():
+    async def scenario(service, port):
+        status, payload = await _request(port, "POST", "/cdf", {"dist": "Normal", "params": {"std": 2}, "x": [0, 2]})
+        assert status == 200 and payload["values"] == pytest.approx(stats.norm.cdf([0, 2], scale=2))
+        status, payload = await _request(port, "POST", "/samples", {"dist": "Poisson", "size": 50, "seed": 3})
+        assert status == 200
+        assert payload["samples"] == dist_registry["Poisson"].generate_samples({"mu": 4.0}, 50, rng=3).tolist()
+        # Once the pool has workers, closing connections still end
+        status, payload = await _request(port, "POST", "/stats", {"dist": "Binomial"})
+        assert status == 200 and payload["stats"]["Mean"] == 10.0
+        assert (await _request(port, "POST", "/samples", {"dist": "Normal", "seed": 1.5}))[0] == 400
+        assert (await _request(port, "POST", "/samples", {"dist": "Normal", "seed": -1}))[0] == 400
+        assert (await _request(port, "POST", "/cdf", {"dist": "Normal", "params": {"std": -1}, "x": 0}))[0] == 400
+        assert (await _request(port, "GET", "/nothing-here"))[0] == 404
+        assert (await _request(port, "GET", "/also-missing"))[0] == 404
+        status, metrics = await _request(port, "GET", "/metrics")
+        assert set(metrics["endpoints"]) == {"/cdf", "/samples", "/stats", "other"}
+        assert metrics["endpoints"]["other"]["requests"] == 2
+    _with_service(scenario)
+
+
+def test_concurrent_requests_share_one_batch():
+    async def scenario(service, port):
+        stds = [0.5, 1.0, 2.0, 4.0] * 10
+        results = await asyncio.gather(*(
+            service.batcher.submit("Normal", "pdf", {"mean": 1.0, "std": std}, np.array([0.0, 1.0, 3.0]))
+            for std in stds))
+        for std, values in zip(stds, results):
+            np.testing.assert_allclose(values, stats.norm.pdf([0.0, 1.0, 3.0], loc=1.0, scale=std), rtol=1e-12)
+        batching = service.metrics.snapshot()["batching"]["pdf"]
+        assert batching["batches"] == 1 and batching["mean_batch_size"] == len(stds)
+    _with_service(scenario, batch_window=0.05)
+
+
+def test_full_batches_flush_early():
+    async def scenario(service, port):
+        results = await asyncio.gather(*(
+            service.batcher.submit("Gamma", "cdf", {"shape": 2.0, "scale": s}, np.array([1.0])) for s in (1, 2, 3, 4, 5)))
+        assert [float(r[0]) for r in results] == pytest.approx(stats.gamma.cdf(1.0, 2.0, scale=[1, 2, 3, 4, 5]))
+        assert service.metrics.snapshot()["batching"]["cdf"]["batches"] == 3
+    _with_service(scenario, batch_window=10.0, max_batch=2)
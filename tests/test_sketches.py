@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from distributions import dist_registry
+from distributions.sketches import DataSketch, KLLSketch, ks_distance
+
+
+def _sup_rank_error(sketch, values):
+    ordered = np.sort(values)
+    exact = np.arange(1, ordered.size + 1) / ordered.size
+    return np.abs(sketch.rank(ordered) - exact).max()
+
+
+def test_uncompacted_sketch_is_exact():
+    values = np.random.default_rng(1).normal(size=100)
+    sketch = KLLSketch(seed=0).update(values)
+    assert sketch.exact and sketch.rank_error == 0.0 and sketch.error_bound == 0.0
+    ks = ks_distance(sketch, dist_registry["Normal"], {"mean": 0.0, "std": 1.0})
+    assert ks["statistic"] == pytest.approx(stats.kstest(values, "norm").statistic, abs=1e-12)
+    assert ks["error_bound"] == 0.0
+
+
+def test_all_queries_bound_covers_the_supremum():
+    sketch = KLLSketch(k=64, seed=3)
+    values = np.random.default_rng(3).exponential(size=200_000)
+    for chunk in np.array_split(values, 13):
+        sketch.update(chunk)
+    assert not sketch.exact
+    assert sketch.rank_error < sketch.error_bound
+    assert _sup_rank_error(sketch, values) <= sketch.error_bound
+    assert sketch.count == values.size
+
+
+def test_merge_keeps_count_range_and_rank_error():
+    rng = np.random.default_rng(5)
+    parts = [rng.normal(loc, size=size) for loc, size in [(0, 40_000), (3, 1_000), (-2, 75_000)]]
+    merged = KLLSketch(k=128, seed=0)
+    for i, part in enumerate(parts):
+        merged.merge(KLLSketch(k=128, seed=i).update(part))
+    values = np.concatenate(parts)
+    assert merged.count == values.size
+    assert (merged.min, merged.max) == (values.min(), values.max())
+    # The retained weights still add up to the number of points
+    assert merged.sorted_view()[1][-1] == values.size
+    assert _sup_rank_error(merged, values) <= merged.error_bound
+    with pytest.raises(ValueError, match="same k"):
+        merged.merge(KLLSketch(k=256))
+
+
+def test_saved_sketch_round_trips(tmp_path):
+    sketch = DataSketch(k=64, histogram_range=(-4, 4, 40), seed=0)
+    sketch.update(np.random.default_rng(9).normal(size=30_000))
+    loaded = DataSketch.load(sketch.save(str(tmp_path / "sketch.npz")))
+    assert loaded.count == sketch.count and loaded.quantiles.exact == sketch.quantiles.exact
+    np.testing.assert_array_equal(loaded.quantiles.quantile([0.1, 0.5, 0.9]), sketch.quantiles.quantile([0.1, 0.5, 0.9]))
+    np.testing.assert_array_equal(loaded.histogram.counts, sketch.histogram.counts)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from scipy import stats
+
+from distributions import dist_registry
+from distributions.streaming import RunningStats, summarize_samples
+
+
+def _check(running, values):
+    assert running.count == values.size
+    assert running.mean == pytest.approx(values.mean(), rel=1e-12, abs=1e-12)
+    assert running.variance == pytest.approx(values.var(), rel=1e-10)
+    assert running.skewness == pytest.approx(stats.skew(values), rel=1e-8, abs=1e-10)
+    assert running.kurtosis == pytest.approx(stats.kurtosis(values, fisher=False), rel=1e-8)
+    assert (running.min, running.max) == (values.min(), values.max())
+
+
+def test_chunked_updates_match_one_pass():
+    values = np.random.default_rng(0).gamma(2.0, size=100_003)
+    running = RunningStats()
+    for chunk in np.array_split(values, 17):
+        running.update(chunk)
+    _check(running, values)
+
+
+def test_merge_of_unequal_parts_matches_the_whole():
+    rng = np.random.default_rng(1)
+    parts = [rng.normal(loc, scale, size) for loc, scale, size in [(0, 1, 5), (50, 3, 20_000), (-7, 0.1, 1)]]
+    merged = RunningStats()
+    for part in parts:
+        merged.merge(RunningStats().update(part))
+    _check(merged, np.concatenate(parts))
+
+
+def test_merge_order_does_not_matter():
+    rng = np.random.default_rng(2)
+    a, b = RunningStats().update(rng.exponential(size=1000)), RunningStats().update(rng.normal(10, size=300))
+    ab = RunningStats().merge(a).merge(b)
+    ba = RunningStats().merge(b).merge(a)
+    for name in ("count", "mean", "m2", "m3", "m4", "min", "max"):
+        assert getattr(ab, name) == pytest.approx(getattr(ba, name), rel=1e-12)
+
+
+def test_large_offset_keeps_precision():
+    # A naive sum of squares would lose every digit of the variance at this offset
+    values = 1e9 + np.random.default_rng(3).normal(size=50_000)
+    running = RunningStats()
+    for chunk in np.array_split(values, 9):
+        running.update(chunk)
+    assert running.variance == pytest.approx(values.var(), rel=1e-6)
+
+
+def test_empty_merges_are_no_ops():
+    running = RunningStats().update([1.0, 2.0, 4.0])
+    running.merge(RunningStats()).update([])
+    _check(running, np.array([1.0, 2.0, 4.0]))
+    assert np.isnan(RunningStats().variance)
+
+
+def test_summary_does_not_depend_on_chunk_size():
+    dist_obj = dist_registry["Gamma"]
+    params = dist_obj.default_params()
+    small, _ = summarize_samples(dist_obj, params, 200_000, chunk_size=7_000, rng=np.random.default_rng(4))
+    large, _ = summarize_samples(dist_obj, params, 200_000, chunk_size=1 << 20, rng=np.random.default_rng(4))
+    assert small.count == large.count and (small.min, small.max) == (large.min, large.max)
+    assert small.mean == pytest.approx(large.mean, rel=1e-12)
+    assert small.variance == pytest.approx(large.variance, rel=1e-10)
@@ -0,0 +1,69 @@
+import json
+import os
+
+import numpy as np
+
+from distributions import dist_registry
+from distributions.closed_form import set_fast_paths
+from distributions.tables import (LatticeTables, build_table, lattice_axes, lattice_params, table_settings,
+                                 table_slug)
+
+
+def test_table_rows_are_bit_identical_to_computing_them(tmp_path):
+    build_table("Exponential", str(tmp_path), workers=1)
+    tables = LatticeTables(str(tmp_path))
+    dist_obj = dist_registry["Exponential"]
+    axes = lattice_axes(dist_obj)
+    for row in (0, 37, len(axes["scale"]) - 1):
+        params = lattice_params(dist_obj, axes, row)
+        stored = tables.generate_data("Exponential", params)
+        with np.errstate(all="ignore"):
+            computed = dist_obj.generate_data(params)
+        for stored_values, computed_values in zip(stored[:3], computed[:3]):
+            assert stored_values.dtype == np.float64
+            np.testing.assert_array_equal(stored_values, computed_values)
+
+
+def test_tables_from_another_scipy_are_skipped(tmp_path):
+    build_table("Exponential", str(tmp_path), workers=1)
+    meta_path = os.path.join(str(tmp_path), table_slug("Exponential"), "meta.json")
+    with open(meta_path) as fh:
+        meta = json.load(fh)
+    meta["scipy_version"] = "0.0.1"
+    with open(meta_path, "w") as fh:
+        json.dump(meta, fh)
+    tables = LatticeTables(str(tmp_path))
+    assert tables.generate_data("Exponential", dist_registry["Exponential"].default_params()) is None
+    assert "SciPy 0.0.1" in tables.skipped["Exponential"]
+
+
+def test_tables_follow_the_fast_path_switch(tmp_path):
+    params = dist_registry["Exponential"].default_params()
+    previous = set_fast_paths(False)
+    try:
+        build_table("Exponential", str(tmp_path), workers=1)
+        tables = LatticeTables(str(tmp_path))
+        assert tables.generate_data("Exponential", params) is not None
+        set_fast_paths(True)
+        assert tables.generate_data("Exponential", params) is None
+        assert "fast_paths=False (now True)" in tables.skipped["Exponential"]
+        # Switching back makes the table usable again
+        set_fast_paths(False)
+        assert tables.generate_data("Exponential", params) is not None
+        assert "Exponential" not in tables.skipped
+    finally:
+        set_fast_paths(previous)
+
+
+def test_tables_from_another_grid_budget_are_skipped(tmp_path):
+    build_table("Exponential", str(tmp_path), workers=1)
+    meta_path = os.path.join(str(tmp_path), table_slug("Exponential"), "meta.json")
+    with open(meta_path) as fh:
+        meta = json.load(fh)
+    assert meta["settings"] == table_settings()
+    meta["settings"]["grid_budget"] += 1
+    with open(meta_path, "w") as fh:
+        json.dump(meta, fh)
+    tables = LatticeTables(str(tmp_path))
+    assert tables.generate_data("Exponential", dist_registry["Exponential"].default_params()) is None
+    assert "grid_budget" in tables.skipped["Exponential"]
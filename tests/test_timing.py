@@ -0,0 +1,71 @@
+import re
+
+import pytest
+
+from distributions.timing import METRIC_NAME, StageTimer
+
+# One sample line of the Prometheus text exposition format: name{labels} value
+SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)\{((?:[a-zA-Z_]\w*="(?:[^"\\\n]|\\.)*",?)*)\} (\S+)$')
+LABEL = re.compile(r'([a-zA-Z_]\w*)="((?:[^"\\\n]|\\.)*)"')
+
+
+def _samples(text):
+    samples = []
+    for line in text.splitlines():
+        if line.startswith("#"):
+            continue
+        match = SAMPLE.match(line)
+        assert match, f"not an exposition sample: {line!r}"
+        name, labels, value = match.groups()
+        samples.append((name, dict(LABEL.findall(labels)), float(value)))
+    return samples
+
+
+def _timer(durations):
+    timer = StageTimer(enabled=True)
+    for name, seconds in durations:
+        timer.record(name, seconds)
+    return timer
+
+
+def test_exposition_format():
+    timer = _timer([("app.figure", s / 1000) for s in range(1, 101)] + [("dist.pdf", 0.5)])
+    text = timer.prometheus_text()
+    lines = text.splitlines()
+    assert text.endswith("\n")
+    assert lines[0].startswith(f"# HELP {METRIC_NAME} ") and lines[1] == f"# TYPE {METRIC_NAME} summary"
+
+    samples = _samples(text)
+    figure = {(name, labels.get("quantile")): value for name, labels, value in samples
+              if labels["stage"] == "app.figure"}
+    assert figure[(METRIC_NAME, "0.5")] == pytest.approx(0.0505)
+    assert figure[(METRIC_NAME, "0.99")] == pytest.approx(0.09901)
+    assert figure[(f"{METRIC_NAME}_sum", None)] == pytest.approx(5.05)
+    assert figure[(f"{METRIC_NAME}_count", None)] == 100
+    # Quantiles, sum and count per stage, stages in name order
+    assert len(samples) == 2 * 5
+    assert [labels["stage"] for _, labels, _ in samples[::5]] == ["app.figure", "dist.pdf"]
+
+
+def test_empty_timer_has_only_the_header():
+    assert StageTimer().prometheus_text().splitlines() == [
+        f"# HELP {METRIC_NAME} Wall time spent in each app and distribution stage.",
+        f"# TYPE {METRIC_NAME} summary",
+    ]
+
+
+def test_label_values_are_escaped():
+    text = _timer([('odd "stage"\\name\n', 1.0)]).prometheus_text(metric="custom_seconds")
+    samples = _samples(text)
+    assert {name for name, _, _ in samples} == {"custom_seconds", "custom_seconds_sum", "custom_seconds_count"}
+    assert samples[0][1]["stage"] == 'odd \\"stage\\"\\\\name\\n'
+
+
+def test_write_metrics_replaces_the_file(tmp_path):
+    path = tmp_path / "distviz.prom"
+    timer = _timer([("app.figure", 0.25)])
+    timer.write_metrics(str(path))
+    timer.record("app.figure", 0.75)
+    timer.write_metrics(str(path))
+    assert path.read_text() == timer.prometheus_text()
+    assert [p.name for p in tmp_path.iterdir()] == ["distviz.prom"]
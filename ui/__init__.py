@@ -0,0 +1,2 @@
+from .params import get_params, snap_to_slider
+from .sections import SectionGraph
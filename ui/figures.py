@@ -0,0 +1,168 @@
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# Roughly the plot's width in device pixels; more points than this can't be seen
+DEFAULT_PIXEL_BUDGET = 1200
+# Overlay colours of comparison members; blue and orange belong to the main PDF/PMF and CDF
+COMPARISON_COLORS = ['#2ca02c', '#d62728', '#9467bd', '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf']
+# Above this many input points (counted before downsampling) a trace is drawn with WebGL instead of SVG
+WEBGL_THRESHOLD = 5000
+
+
+def lttb_indices(x, y, threshold):
+    """Largest-Triangle-Three-Buckets: indices of threshold points that keep the visual shape."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Non-finite values (e.g. an infinite density at the support edge) can't form triangles
+    y = np.where(np.isfinite(y), y, 0.0)
+    bucket_edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, stop = bucket_edges[i], bucket_edges[i + 1]
+        next_start, next_stop = bucket_edges[i + 1], bucket_edges[i + 2] if i + 2 < len(bucket_edges) else n
+        avg_x = x[next_start:next_stop].mean()
+        avg_y = y[next_start:next_stop].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample(x, y, budget=DEFAULT_PIXEL_BUDGET):
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(x) <= budget:
+        return x, y
+    keep = lttb_indices(x.astype(float), y.astype(float), budget)
+    return x[keep], y[keep]
+
+
+def line_trace(x, y, budget=DEFAULT_PIXEL_BUDGET, **kwargs):
+    trace_type = go.Scattergl if len(x) > WEBGL_THRESHOLD else go.Scatter
+    x, y = downsample(x, y, budget)
+    return trace_type(x=x, y=y, mode="lines", **kwargs)
+
+
+def quantile_trace(levels, values, y_top, color="red"):
+    """All quantile markers as one trace: vertical segments separated by gaps, labelled at the top."""
+    xs, ys, labels = [], [], []
+    for level, value in zip(levels, values):
+        xs += [value, value, None]
+        ys += [0, y_top, None]
+        labels += ["", f"{level * 100:g}%", ""]
+    return go.Scatter(x=xs, y=ys, mode="lines+text", text=labels, textposition="top center",
+                      textfont=dict(color=color), line=dict(color=color, dash="dot", width=1),
+                      name="Quantiles", showlegend=False, hoverinfo="x")
+
+
+def comparison_trace(member, color, name=None):
+    """Overlay for one member of distributions.comparison.compare_members."""
+    name = name or f"{member['label']} {member['dist_type']}"
+    if member["dist_type"] == "PMF":
+        return go.Bar(x=member["x"], y=member["pdf"], name=name, marker_color=color, opacity=0.5)
+    return line_trace(member["x"], member["pdf"], name=name, line=dict(color=color, width=2, dash='dot'))
+
+
+def figure_size_bytes(fig):
+    # Exactly what Streamlit ships to the browser for this figure
+    return len(pio.to_json(fig, validate=False).encode("utf-8"))
+
+
+def build_distribution_figure(dist_name, x, y_pdf, y_cdf, dist_type, show_cdf=False):
+    """The main PDF/PMF (+ CDF) plot, without any session-specific overlays."""
+    fig = go.Figure()
+
+    # Add PDF/PMF trace
+    if dist_type == "PMF":
+        fig.add_trace(go.Bar(x=x, y=y_pdf, name=f"{dist_name} {dist_type}", 
+                            marker_color='#1f77b4', opacity=0.7))
+    else:
+        fig.add_trace(line_trace(x, y_pdf, name=f"{dist_name} {dist_type}", 
+                                 line=dict(color='#1f77b4', width=3)))
+
+    # Add CDF if requested
+    if show_cdf and y_cdf is not None:
+        fig.add_trace(line_trace(x, y_cdf, name=f"{dist_name} CDF", 
+                                 line=dict(color='#ff7f0e', width=2, dash='dash')))
+
+    fig.update_layout(
+        title=f"{dist_name} Distribution Visualization",
+        xaxis_title="x",
+        yaxis_title=f"{dist_type} / CDF",
+        template="plotly_white",
+        height=500,
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+    return fig
+
+
+def build_fit_figure(histogram, fits, registry, rows, top=3):
+    """Density histogram of a fitted dataset with the pdf/pmf of its top fits overlaid."""
+    fig = go.Figure()
+    width = histogram.bin_width
+    fig.add_trace(go.Bar(x=histogram.centers, y=histogram.counts / (rows * width), width=width,
+                         name="Data", marker_color='#1f77b4', opacity=0.6))
+
+    for i, fit in enumerate(fits[:top]):
+        dist_obj = registry[fit["dist_name"]]
+        color = COMPARISON_COLORS[i % len(COMPARISON_COLORS)]
+        name = f"{i + 1}. {fit['dist_name']}"
+        if dist_obj.dist_type == "PMF":
+            # Integer data get one bin per value, so the pmf lines up with the bars
+            k = np.round(histogram.centers)
+            fig.add_trace(go.Scatter(x=k, y=dist_obj.pdf(k, fit["params"]), mode="lines+markers", name=name,
+                                     line=dict(color=color, width=2)))
+        else:
+            grid = np.linspace(histogram.edges[0], histogram.edges[-1], 400)
+            with np.errstate(all="ignore"):
+                fig.add_trace(line_trace(grid, dist_obj.pdf(grid, fit["params"]), name=name,
+                                         line=dict(color=color, width=2)))
+
+    fig.update_layout(
+        title="Data vs Fitted Distributions",
+        xaxis_title="Value",
+        yaxis_title="Density",
+        template="plotly_white",
+        height=400,
+        bargap=0
+    )
+    return fig
+
+
+def build_ecdf_figure(ecdf_x, ecdf_y, x, y_cdf, dist_name):
+    """Empirical CDF from a sample sketch against the theoretical CDF."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=ecdf_x, y=ecdf_y, mode="lines", line_shape="hv", name="Empirical CDF",
+                             line=dict(color='#1f77b4', width=2)))
+    if y_cdf is not None:
+        fig.add_trace(line_trace(x, y_cdf, name=f"{dist_name} CDF", line=dict(color='#ff7f0e', width=2, dash='dash')))
+    fig.update_layout(title="Empirical vs Theoretical CDF", xaxis_title="Value", yaxis_title="CDF",
+                      template="plotly_white", height=400)
+    return fig
+
+
+def build_qq_figure(theoretical, sample, dist_name):
+    """QQ plot of sample quantiles against theoretical ones, with the identity line."""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=theoretical, y=sample, mode="markers", name="Quantiles",
+                             marker=dict(color='#1f77b4', size=5)))
+    finite = np.concatenate([theoretical[np.isfinite(theoretical)], sample[np.isfinite(sample)]])
+    if finite.size:
+        lo, hi = float(finite.min()), float(finite.max())
+        fig.add_trace(go.Scatter(x=[lo, hi], y=[lo, hi], mode="lines", name="y = x",
+                                 line=dict(color='#ff7f0e', width=1, dash='dash')))
+    fig.update_layout(title=f"QQ Plot against {dist_name}", xaxis_title="Theoretical Quantile",
+                      yaxis_title="Sample Quantile", template="plotly_white", height=400)
+    return fig
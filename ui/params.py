@@ -0,0 +1,41 @@
+def _slider(st, spec, value=None, key=None):
+    if key is not None and key in st.session_state:
+        # Set through session state (e.g. by Load Best Fit); passing a value too makes Streamlit warn
+        value = None
+    else:
+        value = spec["default"] if value is None else type(spec["default"])(value)
+    return st.slider(spec["label"], spec["min"], spec["max"], value,
+                     step=spec["step"], help=spec["help"], key=key)
+
+
+def snap_to_slider(spec, value):
+    """(value rounded to the slider's step and clipped to its range, whether it had to be clipped)"""
+    snapped = spec["min"] + round((value - spec["min"]) / spec["step"]) * spec["step"]
+    clipped = min(max(snapped, spec["min"]), spec["max"])
+    return type(spec["default"])(round(clipped, 10)), clipped != snapped
+
+
+# key prefixes the widget keys so several members can each have a set of sliders;
+# defaults overrides the param_specs defaults (e.g. get_default_comp_params())
+def get_params(st, dist_obj, key=None, defaults=None):
+    params = dict(dist_obj.fixed_params)
+    specs = list(dist_obj.param_specs.items())
+    defaults = defaults or {}
+
+    def slider(name, spec):
+        return _slider(st, spec, defaults.get(name), key=f"{key}_{name}" if key else None)
+
+    if len(specs) > 1:
+        for col, (name, spec) in zip(st.columns(len(specs)), specs):
+            with col:
+                params[name] = slider(name, spec)
+    else:
+        for name, spec in specs:
+            params[name] = slider(name, spec)
+
+    try:
+        dist_obj.validate_params(params)
+    except ValueError as e:
+        st.error(f"❌ {e}")
+        st.stop()
+    return params
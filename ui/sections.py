@@ -0,0 +1,136 @@
+"""Page sections that recompute only when their declared inputs change.
+
+    sections = SectionGraph.attach(st.session_state)
+    sections.begin_run()
+    fig = sections.run("plot", {"show_cdf": show_cdf}, build_plot, after=("curve",))
+
+Each section names its inputs and the upstream sections it reads. A run
+whose inputs and upstream versions match the last one hands back the
+stored value without calling compute; otherwise compute runs, the
+section's version moves on (so its dependents recompute too), and the
+change log records which inputs changed; reused lists the sections the
+current run handed back unchanged. Inputs are compared by value
+after freezing: lists become tuples and floats are rounded, so two
+reruns with equal slider values count as unchanged.
+
+The graph lives in session state, one per browser session, and is shared
+by the full script run and every fragment rerun.
+"""
+import time
+from collections import deque
+
+import numpy as np
+
+# Change log entries kept per session
+LOG_SIZE = 50
+# Longest input value quoted in a change log reason
+REASON_CHARS = 24
+STATE_KEY = "section_graph"
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return {key: _freeze(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (float, np.floating)):
+        # Slider floats such as 0.30000000000000004 and 0.3 are the same input
+        return round(float(value), 12)
+    if isinstance(value, np.integer):
+        # Kept exact: a 128-bit seed must not round to a neighbour
+        return int(value)
+    return value
+
+
+def _shown(value):
+    text = repr(value)
+    return text if len(text) <= REASON_CHARS else None
+
+
+def _changes(old, new, prefix=""):
+    changes = []
+    for key in sorted(old.keys() | new.keys(), key=str):
+        before, after = old.get(key), new.get(key)
+        if before == after:
+            continue
+        if isinstance(before, dict) and isinstance(after, dict):
+            # A parameter dict reports the parameters that moved
+            changes += _changes(before, after, f"{prefix}{key}.")
+            continue
+        before_text, after_text = _shown(before), _shown(after)
+        changes.append(f"{prefix}{key}: {before_text} → {after_text}" if before_text and after_text else f"{prefix}{key}")
+    return changes
+
+
+class _Section:
+    __slots__ = ("inputs", "upstream", "value", "version")
+
+    def __init__(self):
+        self.inputs = None
+        self.upstream = None
+        self.value = None
+        self.version = 0
+
+
+class SectionGraph:
+    def __init__(self, log_size=LOG_SIZE):
+        self.sections = {}
+        self.log = deque(maxlen=log_size)
+        self.run_id = 0
+        self.ran = {}
+        self.reused = []
+
+    @classmethod
+    def attach(cls, state, key=STATE_KEY):
+        """The graph kept in state (e.g. st.session_state), created on first use."""
+        if key not in state:
+            state[key] = cls()
+        return state[key]
+
+    def begin_run(self):
+        """Start a full script run; fragment reruns carry on in the run they belong to."""
+        self.run_id += 1
+        self.ran = {}
+        self.reused = []
+
+    def run(self, name, inputs, compute, after=()):
+        """compute() when inputs or an upstream section changed, else the stored value.
+
+        after names sections this one reads; one that hasn't run in this
+        script run counts as absent rather than as its last value.
+        """
+        section = self.sections.setdefault(name, _Section())
+        inputs = {key: _freeze(value) for key, value in inputs.items()}
+        upstream = {dep: self.ran.get(dep) for dep in after}
+        reason = self._reason(section, inputs, upstream)
+        start = time.perf_counter()
+        if reason is not None:
+            section.value = compute()
+            section.inputs, section.upstream = inputs, upstream
+            section.version += 1
+        self.ran[name] = section.version
+        if reason is None:
+            self.reused.append(name)
+        else:
+            self.log.append({"run": self.run_id, "section": name, "reason": reason,
+                             "ms": (time.perf_counter() - start) * 1000})
+        return section.value
+
+    def _reason(self, section, inputs, upstream):
+        if section.version == 0:
+            return "first run"
+        changes = _changes(section.inputs, inputs)
+        changes += [f"{dep} changed" for dep in sorted(upstream.keys() | section.upstream.keys())
+                    if upstream.get(dep) != section.upstream.get(dep)]
+        return ", ".join(changes) or None
+
+    def value(self, name):
+        """Last value computed for a section, or None if it never ran."""
+        section = self.sections.get(name)
+        return section.value if section is not None else None
+
+    def entries(self):
+        """Change log entries {"run", "section", "reason", "ms"}, newest first."""
+        return list(reversed(self.log))